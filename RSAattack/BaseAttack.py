@@ -1,8 +1,23 @@
+import hashlib
+import inspect
+import json
 import math
+import multiprocessing
+import os
 import random
+import statistics
+import sys
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Callable, List, Any, Dict
+from multiprocessing.connection import wait
+from typing import Callable, List, Any, Dict, Tuple
+
+# Pacote primality compartilhado, na raiz do repositório: entra na frente do sys.path para
+# que um "primality" instalado no ambiente não o oculte
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
 
 
 @dataclass
@@ -16,6 +31,149 @@ class AttackResult:
     extra: dict
 
 
+# Folga, além do prazo, antes de o harness matar o processo de um ataque que não coopera
+KILL_GRACE_SECONDS = 2.0
+
+
+class Deadline:
+    """
+    Prazo cooperativo de um ataque.
+
+    O RSABenchmark cria um Deadline por chave (`run(timeout_seconds=...)`) e o
+    passa como `deadline` aos ataques que o aceitam. Dentro do laço, o ataque
+    chama `tick()` (barato: só lê o relógio a cada `check_every` chamadas) ou
+    `expired()` (lê o relógio sempre) e, se o prazo acabou, devolve
+    `status="timeout"`. timeout_seconds=None nunca expira.
+    """
+
+    def __init__(self, timeout_seconds: float | None = None, check_every: int = 1024):
+        self.timeout_seconds = timeout_seconds
+        self.check_every = check_every
+        self.reset()
+
+    def reset(self) -> None:
+        self.start_time = time.perf_counter()
+        self.timeout_flag = False
+        self._countdown = self.check_every
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start_time
+
+    def remaining(self) -> float | None:
+        if self.timeout_seconds is None:
+            return None
+        return max(self.timeout_seconds - self.elapsed(), 0.0)
+
+    def expired(self) -> bool:
+        if not self.timeout_flag and self.timeout_seconds is not None:
+            self.timeout_flag = self.elapsed() > self.timeout_seconds
+        return self.timeout_flag
+
+    def tick(self, steps: int = 1) -> bool:
+        """Conta `steps` iterações; só consulta o relógio a cada `check_every`."""
+        self._countdown -= steps
+        if self._countdown > 0:
+            return False
+        self._countdown = self.check_every
+        return self.expired()
+
+
+class AttackCounters:
+    """
+    Contadores de trabalho de um ataque: iterações, gcds, multiplicações
+    modulares, chamadas de isqrt e tempo de parede por fase.
+
+    O RSABenchmark cria um AttackCounters por chave e o passa como `counters`
+    aos ataques que o aceitam. O laço quente conta em variáveis locais e chama
+    `add(...)` só a cada `flush_every` iterações (ou nos pontos em que já
+    consulta o prazo) e ao terminar, então o custo é uma chamada por bloco.
+    `phase(nome)` fecha a fase anterior e abre outra. O harness grava
+    `as_dict()` em extra["counters"].
+    """
+
+    FIELDS = ("iters", "gcds", "modmuls", "isqrts")
+
+    def __init__(self, flush_every: int = 1024):
+        self.flush_every = flush_every
+        self.reset()
+
+    def reset(self) -> None:
+        self.iters = 0
+        self.gcds = 0
+        self.modmuls = 0
+        self.isqrts = 0
+        self.phases: Dict[str, float] = {}
+        self._phase: str | None = None
+        self._phase_start = 0.0
+
+    def add(self, iters: int = 0, gcds: int = 0, modmuls: int = 0, isqrts: int = 0) -> None:
+        self.iters += iters
+        self.gcds += gcds
+        self.modmuls += modmuls
+        self.isqrts += isqrts
+
+    def phase(self, name: str | None) -> None:
+        """Começa a fase `name` (None só encerra a atual); o tempo de fases repetidas soma."""
+        now = time.perf_counter()
+        if self._phase is not None:
+            self.phases[self._phase] = self.phases.get(self._phase, 0.0) + now - self._phase_start
+        self._phase = name
+        self._phase_start = now
+
+    def recorded(self) -> bool:
+        return any(getattr(self, field) for field in self.FIELDS) or bool(self.phases) or self._phase is not None
+
+    def as_dict(self) -> Dict[str, Any]:
+        self.phase(None)
+        out: Dict[str, Any] = {field: getattr(self, field) for field in self.FIELDS}
+        if self.phases:
+            out["phases"] = {name: round(seconds, 6) for name, seconds in self.phases.items()}
+        return out
+
+
+class Checkpoint:
+    """
+    Estado de um ataque longo, salvo em um arquivo JSON pequeno.
+
+    O ataque chama `load(kind)` ao começar e `save(kind, **estado)` nos pontos
+    em que já verifica timeout; `due()` limita a escrita a uma a cada
+    `interval_seconds`. `kind` identifica o ataque/variante, para que um
+    estado de outro ataque nunca seja reaproveitado.
+    """
+
+    def __init__(self, path: str, interval_seconds: float = 2.0):
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self._last_save = time.perf_counter()
+
+    def load(self, kind: str) -> Dict[str, Any] | None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                state = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if state.get("kind") != kind:
+            return None
+        return state
+
+    def due(self) -> bool:
+        return time.perf_counter() - self._last_save >= self.interval_seconds
+
+    def save(self, kind: str, **state) -> None:
+        state["kind"] = kind
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(state, fh)
+        os.replace(tmp, self.path)  # escrita atômica: nunca deixa um estado pela metade
+        self._last_save = time.perf_counter()
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
 class RSABenchmark:
     """
     Classe para:
@@ -30,9 +188,43 @@ class RSABenchmark:
         key_sizes_bits=(16, 20, 24, 28, 32),
         e: int = 65537,
         seed: int | None = None,
+        keys_per_size: int = 1,
+        shared_primes: int = 0,
+        quiet: bool = False,
+        key_cache: bool = True,
+        keygen_processes: int | None = None,
+        profile: str = "balanced",
+        profile_params: Dict[str, Any] | None = None,
     ):
+        """
+        - keys_per_size: quantas chaves gerar para cada tamanho
+        - shared_primes: quantas chaves recebem, de propósito, o p de outra
+          chave do mesmo tamanho (para testar ataques de batch GCD)
+        - quiet: suprime os logs por chave (geração e resultado de cada ataque);
+          erros, interrupções e o relatório final continuam aparecendo
+        - key_cache: com seed, os primos ficam em .cache/keys (keycorpus) e
+          instâncias com os mesmos (tamanhos, seed, e, keys_per_size) os
+          carregam em vez de gerar de novo
+        - keygen_processes=N: gera as chaves em um pool de N processos
+        - profile: perfil de chave fraca (keycorpus.KEY_PROFILES), para medir
+          cada ataque no caso em que ele deve ganhar:
+            "balanced"          p e q aleatórios (padrão)
+            "close"             |p - q| < 2^gap_bits (Fermat)
+            "p_minus_1_smooth"  p - 1 B-smooth (Pollard p-1)
+            "p_plus_1_smooth"   p + 1 B-smooth (Williams p+1)
+            "small_d"           d com d_bits bits, e = d^-1 mod phi (Wiener)
+        - profile_params: parâmetros do perfil, ex.: {"gap_bits": 20}, {"B": 10_000}
+        """
         self.key_sizes_bits = key_sizes_bits
         self.base_e = e
+        self.seed = seed
+        self.keys_per_size = keys_per_size
+        self.shared_primes = shared_primes
+        self.quiet = quiet
+        self.key_cache = key_cache
+        self.keygen_processes = keygen_processes
+        self.profile = profile
+        self.profile_params = dict(profile_params or {})
 
         if seed is not None:
             random.seed(seed)
@@ -40,167 +232,399 @@ class RSABenchmark:
         self.keys: List[Dict[str, Any]] = []
         self._generate_keys()
 
+    def _log(self, *args) -> None:
+        if not self.quiet:
+            print(*args)
+
     # ------------------------------
     #  Geração de chaves pequenas
     # ------------------------------
 
-    def _is_probable_prime(self, n: int, k: int = 8) -> bool:
-        if n < 2:
-            return False
-        small_primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
-        if n in small_primes:
-            return True
-        for p in small_primes:
-            if n % p == 0:
-                return False
-
-        d = n - 1
-        r = 0
-        while d % 2 == 0:
-            d //= 2
-            r += 1
-
-        for _ in range(k):
-            a = random.randrange(2, n - 2)
-            x = pow(a, d, n)
-            if x == 1 or x == n - 1:
-                continue
-            for _ in range(r - 1):
-                x = pow(x, 2, n)
-                if x == n - 1:
-                    break
-            else:
-                return False
-        return True
+    def _is_probable_prime(self, n: int) -> bool:
+        from primality import is_prime
+        return is_prime(n)
 
     def _generate_prime(self, bits: int) -> int:
-        while True:
-            candidate = random.getrandbits(bits)
-            candidate |= (1 << (bits - 1))
-            candidate |= 1
-            if self._is_probable_prime(candidate):
-                return candidate
+        from keycorpus import random_prime
+        return random_prime(bits, random)
 
-    def _generate_keys(self):
-        print("\n🔐 Gerando chaves RSA...\n")
-        for bits in self.key_sizes_bits:
-            half = bits // 2
-            p = self._generate_prime(half)
-            q = self._generate_prime(bits - half)
-            n = p * q
-            phi = (p - 1) * (q - 1)
+    def _make_key(self, bits: int, p: int, q: int, d: int | None = None) -> Dict[str, Any]:
+        """Com `d` (perfil small_d) o expoente público é derivado dele: e = d^-1 mod phi."""
+        n = p * q
+        phi = (p - 1) * (q - 1)
 
+        if d is not None:
+            e = pow(d, -1, phi)
+        else:
             e = self.base_e
             while math.gcd(e, phi) != 1:
                 e += 2
-
             d = pow(e, -1, phi)
 
-            print(f" - Chave {bits:2} bits gerada: n = {n}")
+        key = {"bits": bits, "p": p, "q": q, "n": n, "phi": phi, "e": e, "d": d}
+        if self.profile != "balanced":
+            key["profile"] = self.profile
+        return key
 
-            self.keys.append(
-                {"bits": bits, "p": p, "q": q, "n": n, "phi": phi, "e": e, "d": d}
-            )
+    def _generate_keys(self):
+        from keycorpus import load_or_generate
+
+        print("\n🔐 Gerando chaves RSA...\n")
+        if self.profile != "balanced":
+            params = f" {self.profile_params}" if self.profile_params else ""
+            print(f"⚠ Perfil de chave fraca: {self.profile}{params}")
+        pairs, from_cache = load_or_generate(
+            self.key_sizes_bits,
+            self.keys_per_size,
+            self.seed,
+            self.base_e,
+            processes=self.keygen_processes,
+            use_cache=self.key_cache,
+            profile=self.profile,
+            profile_params=self.profile_params,
+        )
+        if from_cache:
+            print(f"♻ {len(pairs)} chaves carregadas do cache (seed={self.seed})")
+
+        for bits, p, q, d in pairs:
+            key = self._make_key(bits, p, q, d)
+
+            self._log(f" - Chave {bits:2} bits gerada: n = {key['n']}")
+
+            self.keys.append(key)
+
+        if self.shared_primes:
+            self._plant_shared_primes()
 
         print("\n✅ Todas as chaves foram geradas!\n")
 
+    def _plant_shared_primes(self) -> None:
+        """
+        Substitui o p de `shared_primes` chaves pelo p de outra chave do mesmo
+        tamanho, simulando geradores de chaves com pouca entropia.
+        """
+        by_bits: Dict[int, List[int]] = {}
+        for idx, key in enumerate(self.keys):
+            by_bits.setdefault(key["bits"], []).append(idx)
+
+        candidates = [idx for group in by_bits.values() if len(group) > 1 for idx in group]
+        random.shuffle(candidates)
+
+        planted = 0
+        donated = set()
+        for idx in candidates:
+            if planted >= self.shared_primes:
+                break
+            if idx in donated:
+                continue  # trocar o p de um doador quebraria o compartilhamento
+            key = self.keys[idx]
+            donors = [j for j in by_bits[key["bits"]] if j != idx and "shared_with" not in self.keys[j]]
+            if not donors:
+                continue
+            donor = random.choice(donors)
+            p = self.keys[donor]["p"]
+            if p == key["q"]:
+                continue
+            self.keys[idx] = self._make_key(key["bits"], p, key["q"])
+            self.keys[idx]["shared_with"] = donor
+            donated.add(donor)
+            planted += 1
+            self._log(f" - Chave #{idx} ({key['bits']} bits) agora compartilha p com a chave #{donor}")
+
     # ------------------------------
     #  Rodar ataque com logs detalhados
     # ------------------------------
 
-    def run(self, attack_func: Callable[..., Any], **attack_kwargs) -> List[AttackResult]:
-        results: List[AttackResult] = []
-
+    def run(
+        self,
+        attack_func: Callable[..., Any],
+        workers: int | None = None,
+        timeout_seconds: float | None = None,
+        hard_kill: bool = False,
+        resume: bool = False,
+        checkpoint_dir: str | None = None,
+        sink=None,
+        label: str | None = None,
+        repeats: int = 1,
+        warmup: int = 0,
+        **attack_kwargs,
+    ) -> List[AttackResult]:
+        """
+        Aplica `attack_func` a todas as chaves.
+
+        - workers=None/1: executa as chaves em sequência, no próprio processo
+        - workers=N: cada chave roda em um processo separado, com até N
+          processos simultâneos; os resultados são registrados na ordem
+          das chaves
+        - timeout_seconds: prazo por chave. Ataques que aceitam `deadline`
+          recebem um Deadline novo a cada chave; quem estoura fica com
+          extra["status"] == "timeout"
+        - hard_kill=True (sempre ativo no modo paralelo): cada chave roda em
+          um processo, que é encerrado se passar do prazo + KILL_GRACE_SECONDS
+          sem responder (ataques que não checam o prazo)
+        - checkpoint_dir / resume=True: ataques que aceitam `checkpoint`
+          salvam o estado do laço em checkpoint_dir (padrão: .cache/checkpoints),
+          um arquivo por chave (sha1 de n) e repetição; com resume=True cada chave continua do último checkpoint em vez de
+          recomeçar. O checkpoint é apagado quando a chave é quebrada.
+        - sink: destino em streaming (results_sink.JsonlSink/ParquetSink);
+          cada resultado é gravado assim que a chave termina, com o rótulo
+          `label` (padrão: nome da função de ataque)
+        - repeats=R: cada chave é atacada R vezes (um AttackResult por
+          repetição, com extra["repeat"]); junto com keys_per_size dá as
+          amostras para as estatísticas do relatório final
+        - warmup=W: W execuções descartadas antes da primeira medição de cada
+          tamanho de chave (no modo paralelo, em cada processo), para que
+          caches e imports não entrem no tempo
+        - ataques que aceitam `counters` recebem um AttackCounters novo a cada
+          chave; o que eles contarem vai para extra["counters"] e alimenta as
+          colunas de vazão (iterações/s, modmuls/s) do relatório final
+        """
         print("\n🚀 Iniciando ataques...\n")
 
+        name = getattr(attack_func, "__name__", "attack")
+        jobs = [(key, rep) for key in self.keys for rep in range(repeats)]
+
+        def on_result(result: AttackResult, kwargs: dict, rep: int) -> None:
+            if repeats > 1:
+                result.extra["repeat"] = rep
+            _finish_checkpoint(kwargs, result)
+            if sink is not None:
+                sink.write(result, label or name, name)
+
+        if resume and checkpoint_dir is None:
+            from sieve import default_cache_dir
+            checkpoint_dir = os.path.join(default_cache_dir(), "checkpoints")
+
+        def kwargs_for(key: Dict[str, Any], rep: int) -> dict:
+            kwargs = dict(attack_kwargs)
+            if timeout_seconds is not None and _accepts_kwarg(attack_func, "deadline"):
+                kwargs["deadline"] = Deadline(timeout_seconds)
+            if _accepts_kwarg(attack_func, "counters"):
+                kwargs["counters"] = AttackCounters()
+            if checkpoint_dir is not None and _accepts_kwarg(attack_func, "checkpoint"):
+                os.makedirs(checkpoint_dir, exist_ok=True)
+                # n em decimal passa do limite de 255 bytes de nome de arquivo a partir de ~800 bits;
+                # cada repetição tem o seu arquivo (no modo paralelo elas rodam ao mesmo tempo)
+                digest = hashlib.sha1(str(key["n"]).encode()).hexdigest()
+                checkpoint = Checkpoint(os.path.join(checkpoint_dir, f"{name}_{digest}_r{rep}.json"))
+                if not resume:
+                    checkpoint.clear()
+                kwargs["checkpoint"] = checkpoint
+            return kwargs
+
+        if (workers is not None and workers > 1) or (hard_kill and timeout_seconds is not None):
+            results = self._run_parallel(attack_func, jobs, workers or 1, kwargs_for, on_result, timeout_seconds, warmup)
+        else:
+            results = self._run_sequential(attack_func, jobs, kwargs_for, on_result, warmup)
+
+        if sink is not None:
+            sink.flush()
+
+        print("\n🏁 Fim dos ataques (normal ou interrompido)!\n")
+        return results
+
+    def run_corpus(
+        self,
+        corpus_attack: Callable[..., Any],
+        sink=None,
+        label: str | None = None,
+        **attack_kwargs,
+    ) -> List[AttackResult]:
+        """
+        Aplica um ataque de corpus (que recebe TODOS os módulos de uma vez,
+        ex.: batch GCD) e devolve um AttackResult por chave, na ordem das chaves.
+
+        `corpus_attack(moduli, **kwargs)` deve devolver {n: (p, q, extra)} só
+        para os módulos que conseguiu fatorar. `sink`/`label` como em `run`.
+        """
+        print("\n🚀 Iniciando ataque de corpus...\n")
+
+        moduli = [key["n"] for key in self.keys]
+        start = time.perf_counter_ns()
+        found = corpus_attack(moduli, **attack_kwargs)
+        elapsed = (time.perf_counter_ns() - start) / 1e9
+        per_key = elapsed / len(moduli) if moduli else 0.0
+
+        results: List[AttackResult] = []
         for key in self.keys:
-            n, e, bits = key["n"], key["e"], key["bits"]
-
-            print(f"\n==========================================")
-            print(f"🔎 Rodando teste com chave de {bits} bits")
-            print(f"   n = {n}")
-            print(f"==========================================\n")
-
-            start = time.perf_counter()
-            extra: dict = {}
-            p = q = None
-
-            # Resetar o timeout_flag se foi fornecido
-            if "timeout_flag" in attack_kwargs:
-                attack_kwargs["timeout_flag"].start_time = time.perf_counter()
-                attack_kwargs["timeout_flag"].timeout_flag = False
-
-            try:
-                out = attack_func(n, e, **attack_kwargs)
-            except KeyboardInterrupt:
-                elapsed = time.perf_counter() - start
-                print("⏹ Execução interrompida pelo usuário (Ctrl+C) durante este ataque.\n")
-
-                # registra essa chave como interrompida
-                results.append(
-                    AttackResult(
-                        bits,
-                        n,
-                        False,
-                        None,
-                        None,
-                        elapsed,
-                        {"interrupted": True},
-                    )
-                )
+            n = key["n"]
+            p, q, extra = parse_attack_output(found.get(n))
+            extra["corpus_seconds"] = elapsed
+            success = p is not None and q is not None and p * q == n
+            results.append(
+                AttackResult(key["bits"], n, success, p if success else None, q if success else None, per_key, extra)
+            )
+            if sink is not None:
+                name = getattr(corpus_attack, "__name__", "corpus_attack")
+                sink.write(results[-1], label or name, name)
+
+        if sink is not None:
+            sink.flush()
+
+        broken = sum(1 for r in results if r.success)
+        print(f"✔ {broken} de {len(results)} módulos fatorados")
+        print(f"⏱ Tempo total do corpus: {elapsed:.6f} segundos")
+        print("\n🏁 Fim do ataque de corpus!\n")
+        return results
+
+    def _run_sequential(
+        self,
+        attack_func: Callable[..., Any],
+        jobs: List[tuple],
+        kwargs_for: Callable[[dict, int], dict],
+        on_result: Callable[[AttackResult, dict, int], None],
+        warmup: int = 0,
+    ) -> List[AttackResult]:
+        results: List[AttackResult] = []
+        warmed: set = set()
+
+        for key, rep in jobs:
+            attack_kwargs = kwargs_for(key, rep)
+            if warmup and key["bits"] not in warmed:
+                warmed.add(key["bits"])
+                if not _warm_up(attack_func, key["n"], key["e"], attack_kwargs, warmup):
+                    print("⏹ Execução interrompida pelo usuário (Ctrl+C) durante o aquecimento.\n")
+                    break
+
+            self._print_key_header(key, rep)
+            status, payload, elapsed = _execute_attack(attack_func, key["n"], key["e"], attack_kwargs)
+            results.append(self._record_result(key, status, payload, elapsed))
+            on_result(results[-1], attack_kwargs, rep)
 
-                print("⚠ Interrupção detectada. Gerando relatório parcial com os resultados até agora...\n")
+            if status == "interrupted":
                 break  # sai do loop de chaves e retorna resultados parciais
 
-            except Exception as ex:
-                elapsed = time.perf_counter() - start
-                print(f"❌ ERRO no ataque: {ex}\n")
-                results.append(
-                    AttackResult(bits, n, False, None, None, elapsed, {"error": str(ex)})
-                )
-                continue
+        return results
 
-            elapsed = time.perf_counter() - start
-
-            # trata saída
-            if isinstance(out, tuple):
-                p, q = out[0], out[1]
-                if len(out) > 2:
-                    third = out[2]
-                    if isinstance(third, dict):
-                        extra.update(third)
-                    else:
-                        extra["rest"] = third
-            elif isinstance(out, dict):
-                p = out.get("p")
-                q = out.get("q")
-                extra = {k: v for k, v in out.items() if k not in ("p", "q")}
+    def _run_parallel(
+        self,
+        attack_func: Callable[..., Any],
+        jobs: List[tuple],
+        workers: int,
+        kwargs_for: Callable[[dict, int], dict],
+        on_result: Callable[[AttackResult, dict, int], None],
+        timeout_seconds: float | None = None,
+        warmup: int = 0,
+    ) -> List[AttackResult]:
+        ctx = multiprocessing.get_context()
+        pending = deque(enumerate(jobs))
+        running: Dict[Any, tuple] = {}  # conexão -> (índice, processo, início)
+        outcomes: Dict[int, tuple] = {}
+        job_kwargs = [kwargs_for(key, rep) for key, rep in jobs]
+        results: List[AttackResult] = []
+        next_idx = 0
+
+        print(f"⚙ Modo paralelo: {workers} processos para {len(jobs)} execuções\n")
+
+        try:
+            while pending or running:
+                # Preenche os slots livres com novas chaves
+                while pending and len(running) < workers:
+                    idx, (key, _) = pending.popleft()
+                    recv_conn, send_conn = ctx.Pipe(duplex=False)
+                    proc = ctx.Process(
+                        target=_attack_worker,
+                        args=(send_conn, attack_func, key["n"], key["e"], job_kwargs[idx], warmup),
+                    )
+                    proc.start()
+                    send_conn.close()
+                    running[recv_conn] = (idx, proc, time.perf_counter())
+
+                # o processo também faz os aquecimentos, cada um com o mesmo prazo
+                kill_after = None
+                wait_timeout = None
+                if timeout_seconds is not None:
+                    kill_after = (timeout_seconds + KILL_GRACE_SECONDS) * (warmup + 1)
+                    kill_at = min(started for _, _, started in running.values()) + kill_after
+                    wait_timeout = max(kill_at - time.perf_counter(), 0.0)
+
+                for conn in wait(list(running), timeout=wait_timeout):
+                    idx, proc, _ = running.pop(conn)
+                    outcomes[idx] = _receive_outcome(conn, proc)
+
+                # Prazo + folga estourado sem resposta: o ataque não coopera, mata o processo
+                if kill_after is not None:
+                    now = time.perf_counter()
+                    for conn, (idx, proc, started) in list(running.items()):
+                        if now - started >= kill_after:
+                            proc.terminate()
+                            proc.join()
+                            conn.close()
+                            del running[conn]
+                            outcomes[idx] = ("timeout", None, now - started)
+
+                # Registra, na ordem das chaves, tudo o que já terminou
+                while next_idx in outcomes:
+                    key, rep = jobs[next_idx]
+                    self._print_key_header(key, rep)
+                    results.append(self._record_result(key, *outcomes.pop(next_idx)))
+                    on_result(results[-1], job_kwargs[next_idx], rep)
+                    next_idx += 1
+
+        except KeyboardInterrupt:
+            # Ctrl+C: encerra os processos em andamento e marca as chaves como interrompidas
+            for conn, (idx, proc, started) in running.items():
+                proc.terminate()
+                proc.join()
+                conn.close()
+                outcomes[idx] = ("interrupted", None, time.perf_counter() - started)
+
+            for idx in sorted(outcomes):
+                key, rep = jobs[idx]
+                self._print_key_header(key, rep)
+                results.append(self._record_result(key, *outcomes[idx]))
+                on_result(results[-1], job_kwargs[idx], rep)
 
-            success = p is not None and q is not None and p * q == n
+        return results
 
-            if success:
-                print("✔ Sucesso! Fatores encontrados:")
-                print(f"   p = {p}")
-                print(f"   q = {q}")
+    def _print_key_header(self, key: Dict[str, Any], rep: int = 0) -> None:
+        self._log(f"\n==========================================")
+        self._log(f"🔎 Rodando teste com chave de {key['bits']} bits" + (f" (repetição {rep + 1})" if rep else ""))
+        self._log(f"   n = {key['n']}")
+        self._log(f"==========================================\n")
+
+    def _record_result(self, key: Dict[str, Any], status: str, payload: Any, elapsed: float) -> AttackResult:
+        n, bits = key["n"], key["bits"]
+
+        if status == "interrupted":
+            print("⏹ Execução interrompida pelo usuário (Ctrl+C) durante este ataque.\n")
+            print("⚠ Interrupção detectada. Gerando relatório parcial com os resultados até agora...\n")
+            # registra essa chave como interrompida
+            return AttackResult(bits, n, False, None, None, elapsed, {"interrupted": True})
+
+        if status == "error":
+            print(f"❌ ERRO no ataque: {payload}\n")
+            return AttackResult(bits, n, False, None, None, elapsed, {"error": payload})
+
+        p, q, extra = parse_attack_output(payload)
+        success = p is not None and q is not None and p * q == n
+
+        if status == "timeout" and not success:
+            extra["status"] = "timeout"
+            if payload is None:
+                extra["killed"] = True
+                self._log("⏰ Prazo estourado: o processo do ataque foi encerrado pelo harness.")
             else:
-                print("❌ Falha: ataque não encontrou p e q.")
+                self._log("⏰ Prazo estourado.")
 
-            print(f"⏱ Tempo total: {elapsed:.6f} segundos")
-            print(f"📊 Extra: {extra}")
-            print()
+        if success:
+            self._log("✔ Sucesso! Fatores encontrados:")
+            self._log(f"   p = {p}")
+            self._log(f"   q = {q}")
+        else:
+            self._log("❌ Falha: ataque não encontrou p e q.")
 
-            results.append(
-                AttackResult(bits, n, success, p if success else None, q if success else None, elapsed, extra)
-            )
+        self._log(f"⏱ Tempo total: {elapsed:.6f} segundos")
+        self._log(f"📊 Extra: {extra}")
+        self._log()
 
-        print("\n🏁 Fim dos ataques (normal ou interrompido)!\n")
-        return results
+        return AttackResult(bits, n, success, p if success else None, q if success else None, elapsed, extra)
 
     # ------------------------------
     #  Relatório final (agora método)
     # ------------------------------
 
-    def print_final_report(self, results: List[AttackResult]) -> None:
+    def print_final_report(self, results: List[AttackResult], confidence: float = 0.95) -> None:
         print("\n================ RELATÓRIO FINAL ================\n")
 
         total = len(results)
@@ -218,31 +642,245 @@ class RSABenchmark:
         for r in results:
             stats.setdefault(r.key_bits, []).append(r)
 
-        print("Resumo por tamanho de chave:\n")
-        print(f"{'Bits':4} {'#Total':6} {'#OK':4} {'Sucesso%':9} {'t_med (s)':10} {'steps_med':10}")
-        print("-" * 60)
+        ci_label = f"IC{confidence * 100:.0f}% mediana"
+
+        print("Tempo por tamanho de chave (s):\n")
+        print(
+            f"{'Bits':4} {'#Total':6} {'#OK':4} {'Sucesso%':9} {'média':10} {'mediana':10} "
+            f"{'p90':10} {'desvio':10} {ci_label:23}"
+        )
+        print("-" * 95)
 
         for bits, group in sorted(stats.items()):
             total_b = len(group)
             ok_b = sum(1 for r in group if r.success)
             rate_b = (ok_b / total_b * 100) if total_b > 0 else 0.0
-            avg_time = sum(r.elapsed_seconds for r in group) / total_b if total_b > 0 else 0.0
-
-            steps_list = []
-            for r in group:
-                steps = r.extra.get("steps")
-                if isinstance(steps, (int, float)):
-                    steps_list.append(steps)
-            avg_steps = sum(steps_list) / len(steps_list) if steps_list else 0.0
+            t = sample_stats([r.elapsed_seconds for r in group], confidence)
 
             print(
                 f"{bits:4} "
                 f"{total_b:6} "
                 f"{ok_b:4} "
                 f"{rate_b:9.2f} "
-                f"{avg_time:10.6f} "
-                f"{avg_steps:10.2f}"
+                f"{t['mean']:10.6f} "
+                f"{t['median']:10.6f} "
+                f"{t['p90']:10.6f} "
+                f"{t['std']:10.6f} "
+                f"[{t['ci_low']:.6f}, {t['ci_high']:.6f}]"
+            )
+
+        print("\nPassos por tamanho de chave (steps/iters):\n")
+        print(f"{'Bits':4} {'#Amostras':9} {'mediana':12} {'p90':12} {'desvio':12} {ci_label:27}")
+        print("-" * 95)
+
+        for bits, group in sorted(stats.items()):
+            steps_list = [steps for steps in map(_steps_of, group) if steps is not None]
+            if not steps_list:
+                continue
+            st = sample_stats(steps_list, confidence)
+            print(
+                f"{bits:4} "
+                f"{st['n']:9} "
+                f"{st['median']:12.1f} "
+                f"{st['p90']:12.1f} "
+                f"{st['std']:12.1f} "
+                f"[{st['ci_low']:.1f}, {st['ci_high']:.1f}]"
+            )
+
+        print("\nVazão por tamanho de chave (mediana das amostras):\n")
+        print(f"{'Bits':4} {'#Amostras':9} {'iters/s':14} {'modmuls/s':14}")
+        print("-" * 95)
+
+        for bits, group in sorted(stats.items()):
+            rates = [throughput_of(r) for r in group]
+            iters_rates = [t["iters_per_s"] for t in rates if t["iters_per_s"] is not None]
+            modmul_rates = [t["modmuls_per_s"] for t in rates if t["modmuls_per_s"] is not None]
+            if not iters_rates:
+                continue
+            modmul_col = f"{statistics.median(modmul_rates):14.1f}" if modmul_rates else f"{'-':>14}"
+            print(
+                f"{bits:4} "
+                f"{len(iters_rates):9} "
+                f"{statistics.median(iters_rates):14.1f} "
+                f"{modmul_col}"
             )
 
         print("\n=================================================\n")
 
+
+def _steps_of(result: AttackResult) -> float | None:
+    """
+    Contagem de trabalho do ataque: as iterações de extra["counters"] ou,
+    sem contadores, "steps" (trial division) ou "iters" (Pollard, Fermat...).
+    """
+    counted = result.extra.get("counters")
+    if isinstance(counted, dict) and counted.get("iters"):
+        return counted["iters"]
+    steps = result.extra.get("steps", result.extra.get("iters"))
+    return steps if isinstance(steps, (int, float)) and not isinstance(steps, bool) else None
+
+
+def throughput_of(result: AttackResult) -> Dict[str, float | None]:
+    """
+    Vazão normalizada de um resultado: iterações/s e modmuls/s (None quando o
+    ataque não contou ou o tempo é zero), para comparar ataques cuja
+    definição de "passo" é diferente.
+    """
+    counted = result.extra.get("counters")
+    counted = counted if isinstance(counted, dict) else {}
+    elapsed = result.elapsed_seconds
+    iters = _steps_of(result)
+    modmuls = counted.get("modmuls") or None
+    return {
+        "iters_per_s": iters / elapsed if iters and elapsed > 0 else None,
+        "modmuls_per_s": modmuls / elapsed if modmuls and elapsed > 0 else None,
+    }
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Percentil com interpolação linear (q em [0, 1]) de uma lista já ordenada."""
+    pos = (len(sorted_values) - 1) * q
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def sample_stats(values: List[float], confidence: float = 0.95, n_boot: int = 1000, seed: int = 0) -> Dict[str, float]:
+    """
+    Estatísticas de uma amostra (tempos ou passos de várias chaves/repetições).
+
+    Devolve n, mean, median, p90, std e o intervalo de confiança bootstrap
+    (percentil, `n_boot` reamostragens) da mediana em ci_low/ci_high. Usa um
+    gerador próprio para não mexer no estado de `random` (geração de chaves).
+    """
+    if not values:
+        nan = float("nan")
+        return {"n": 0, "mean": nan, "median": nan, "p90": nan, "std": nan, "ci_low": nan, "ci_high": nan}
+
+    xs = sorted(values)
+    n = len(xs)
+    median = statistics.median(xs)
+
+    if n > 1:
+        rng = random.Random(seed)
+        boot = sorted(statistics.median(rng.choices(xs, k=n)) for _ in range(n_boot))
+        alpha = (1 - confidence) / 2
+        ci_low, ci_high = _percentile(boot, alpha), _percentile(boot, 1 - alpha)
+    else:
+        ci_low = ci_high = median  # uma amostra só: sem intervalo
+
+    return {
+        "n": n,
+        "mean": statistics.fmean(xs),
+        "median": median,
+        "p90": _percentile(xs, 0.90),
+        "std": statistics.stdev(xs) if n > 1 else 0.0,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+    }
+
+
+def parse_attack_output(out: Any) -> Tuple[int | None, int | None, dict]:
+    """
+    Normaliza a saída de uma função de ataque para (p, q, extra).
+
+    Aceita tupla (p, q) / (p, q, extra), dict com "p" e "q" ou None.
+    """
+    p = q = None
+    extra: dict = {}
+
+    if isinstance(out, tuple):
+        p, q = out[0], out[1]
+        if len(out) > 2:
+            third = out[2]
+            if isinstance(third, dict):
+                extra.update(third)
+            else:
+                extra["rest"] = third
+    elif isinstance(out, dict):
+        p = out.get("p")
+        q = out.get("q")
+        extra = {k: v for k, v in out.items() if k not in ("p", "q")}
+
+    return p, q, extra
+
+
+def _accepts_kwarg(func: Callable[..., Any], name: str) -> bool:
+    """True se `func` aceita o argumento nomeado `name` (explícito ou via **kwargs)."""
+    try:
+        params = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+    return name in params or any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values())
+
+
+def _finish_checkpoint(attack_kwargs: dict, result: AttackResult) -> None:
+    """Chave quebrada: o checkpoint não serve mais."""
+    checkpoint = attack_kwargs.get("checkpoint")
+    if checkpoint is not None and result.success:
+        checkpoint.clear()
+
+
+def _execute_attack(attack_func: Callable[..., Any], n: int, e: int, attack_kwargs: dict) -> Tuple[str, Any, float]:
+    """
+    Executa um único ataque e devolve (status, payload, elapsed).
+
+    status é "ok" (payload = saída do ataque), "timeout" (o ataque devolveu,
+    mas o prazo já tinha acabado), "error" (payload = mensagem) ou
+    "interrupted" (Ctrl+C durante o ataque).
+    """
+    # O prazo conta a partir do início desta chave
+    deadlines = [attack_kwargs[k] for k in ("deadline", "timeout_flag") if attack_kwargs.get(k) is not None]
+    for deadline in deadlines:
+        deadline.reset()
+    counters = attack_kwargs.get("counters")
+    if counters is not None:
+        counters.reset()
+
+    # perf_counter_ns: inteiro, sem perda de resolução em medições longas
+    start = time.perf_counter_ns()
+    try:
+        out = attack_func(n, e, **attack_kwargs)
+    except KeyboardInterrupt:
+        return ("interrupted", None, (time.perf_counter_ns() - start) / 1e9)
+    except Exception as ex:
+        return ("error", str(ex), (time.perf_counter_ns() - start) / 1e9)
+
+    elapsed = (time.perf_counter_ns() - start) / 1e9
+    if counters is not None and counters.recorded():
+        p, q, extra = parse_attack_output(out)
+        extra["counters"] = counters.as_dict()
+        out = (p, q, extra)
+    if any(deadline.expired() for deadline in deadlines):
+        return ("timeout", out, elapsed)
+    return ("ok", out, elapsed)
+
+
+def _warm_up(attack_func: Callable[..., Any], n: int, e: int, attack_kwargs: dict, times: int) -> bool:
+    """Execuções descartadas (sem checkpoint) antes de medir. False se houve Ctrl+C."""
+    kwargs = {k: v for k, v in attack_kwargs.items() if k != "checkpoint"}
+    for _ in range(times):
+        status, _, _ = _execute_attack(attack_func, n, e, kwargs)
+        if status == "interrupted":
+            return False
+    return True
+
+
+def _attack_worker(conn, attack_func: Callable[..., Any], n: int, e: int, attack_kwargs: dict, warmup: int = 0) -> None:
+    """Ponto de entrada dos processos do modo paralelo."""
+    try:
+        if warmup and not _warm_up(attack_func, n, e, attack_kwargs, warmup):
+            return
+        conn.send(_execute_attack(attack_func, n, e, attack_kwargs))
+    finally:
+        conn.close()
+
+
+def _receive_outcome(conn, proc) -> Tuple[str, Any, float]:
+    try:
+        outcome = conn.recv()
+    except EOFError:
+        outcome = ("error", f"processo do ataque terminou sem resultado (exitcode={proc.exitcode})", 0.0)
+    conn.close()
+    proc.join()
+    return outcome
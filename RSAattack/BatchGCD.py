@@ -0,0 +1,128 @@
+from BaseAttack import RSABenchmark
+from typing import Dict, Iterable, List, Tuple
+import math
+import time
+
+
+def product_tree(moduli: List[int]) -> List[List[int]]:
+    """
+    Árvore de produtos: níveis[0] são os módulos, níveis[-1] == [produto de todos].
+    """
+    levels = [list(moduli)]
+    while len(levels[-1]) > 1:
+        prev = levels[-1]
+        levels.append([prev[i] * prev[i + 1] if i + 1 < len(prev) else prev[i]
+                       for i in range(0, len(prev), 2)])
+    return levels
+
+
+def remainder_tree(levels: List[List[int]]) -> List[int]:
+    """
+    Árvore de restos: desce a árvore de produtos calculando P mod x^2 em cada
+    nó; nas folhas devolve P mod n_i^2 para cada módulo n_i.
+    """
+    rems = levels[-1]
+    for level in reversed(levels[:-1]):
+        rems = [rems[i // 2] % (x * x) for i, x in enumerate(level)]
+    return rems
+
+
+def batch_gcd(moduli: List[int]) -> List[int]:
+    """
+    Batch GCD de Bernstein: para cada n_i, gcd(n_i, prod_{j != i} n_j),
+    em tempo quase linear no tamanho total do corpus.
+    """
+    if len(moduli) < 2:
+        return [1] * len(moduli)
+    levels = product_tree(moduli)
+    rems = remainder_tree(levels)
+    return [math.gcd(r // n, n) for r, n in zip(rems, moduli)]
+
+
+def load_moduli(path: str) -> List[int]:
+    """Lê um módulo por linha (decimal ou hexadecimal com 0x); ignora linhas vazias e #."""
+    moduli = []
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            moduli.append(int(line, 0))
+    return moduli
+
+
+def batch_gcd_attack(moduli: Iterable[int] | str, **kwargs) -> Dict[int, Tuple[int, int, dict]]:
+    """
+    Ataque de corpus (RSABenchmark.run_corpus): encontra todos os módulos que
+    compartilham um primo com outro módulo do corpus.
+
+    - `moduli` é uma lista de módulos ou o caminho de um arquivo (um por linha)
+    - Devolve {n: (p, q, extra)} para os módulos fatorados
+    - Quando o gcd é o próprio n (os dois primos aparecem em outras chaves),
+      resolve com gcds par a par só entre os módulos vulneráveis
+    """
+    if isinstance(moduli, str):
+        moduli = load_moduli(moduli)
+    moduli = list(moduli)
+
+    start = time.perf_counter()
+    unique = sorted(set(moduli))
+    gcds = batch_gcd(unique)
+    tree_seconds = time.perf_counter() - start
+
+    found: Dict[int, Tuple[int, int, dict]] = {}
+    vulnerable = [n for n, g in zip(unique, gcds) if g != 1]
+    pairwise_gcds = 0
+
+    for n, g in zip(unique, gcds):
+        if g == 1:
+            continue
+        if g == n:
+            # n divide o produto dos outros: procura um parceiro entre os vulneráveis
+            g = 1
+            for m in vulnerable:
+                if m == n:
+                    continue
+                pairwise_gcds += 1
+                d = math.gcd(n, m)
+                if 1 < d < n:
+                    g = d
+                    break
+            if g == 1:
+                continue
+        p, q = min(g, n // g), max(g, n // g)
+        found[n] = (p, q, {
+            "status": "factor_found",
+            "method": "batch_gcd",
+            "shared_factor": g,
+        })
+
+    duplicates = len(moduli) - len(unique)
+    for info in found.values():
+        info[2].update({
+            "corpus_size": len(moduli),
+            "vulnerable": len(found),
+            "duplicates": duplicates,
+            "tree_seconds": round(tree_seconds, 6),
+            "pairwise_gcds": pairwise_gcds,
+        })
+    return found
+
+
+if __name__ == "__main__":
+    bench = RSABenchmark(
+        key_sizes_bits=(256, 512, 1024),
+        keys_per_size=200,
+        shared_primes=30,
+        seed=42,
+    )
+
+    results = bench.run_corpus(batch_gcd_attack)
+
+    print(f"{'Bits':4} {'Sucesso':8} Fator compartilhado")
+    print("-" * 60)
+    for r in results:
+        if r.success:
+            print(f"{r.key_bits:4} {str(r.success):8} {r.extra.get('shared_factor')}")
+
+    bench.print_final_report(results)
@@ -1,44 +1,90 @@
 import math
+import statistics
 from typing import Tuple, Dict, Any
+import numpy as np
 import pandas as pd
+from BaseAttack import Deadline, sample_stats, throughput_of
+from results_sink import JsonlSink, read_results
+from sieve import iter_primes
 from datetime import datetime
-import time
 
 
-class TimeoutFlag:
+class TimeoutFlag(Deadline):
+    """Compatibilidade: o antigo TimeoutFlag agora é um Deadline (padrão de 10 s)."""
+
     def __init__(self, timeout_seconds=10):
-        self.timeout_seconds = timeout_seconds
-        self.start_time = time.perf_counter()
-        self.timeout_flag = False
+        super().__init__(timeout_seconds)
+
+
+def _save_checkpoint(checkpoint, kind: str, force: bool = False, **state) -> None:
+    """Salva o estado do laço se houver checkpoint e já for hora (ou se force=True)."""
+    if checkpoint is not None and (force or checkpoint.due()):
+        checkpoint.save(kind, **state)
 
 
-def trial_division_basic(n: int, e: int, timeout_flag=None, **kwargs) -> Tuple[int | None, int | None, Dict[str, Any]]:
+def trial_division_basic(n: int, e: int, timeout_flag=None, deadline=None, checkpoint=None, **kwargs) -> Tuple[int | None, int | None, Dict[str, Any]]:
+    deadline = deadline or timeout_flag  # TimeoutFlag antigo continua valendo
     limit = math.isqrt(n)
     steps = 0
+    start_d = 3
 
     if n % 2 == 0:
         return (2, n // 2, {"steps": 1, "method": "basic", "found_at": 2})
 
-    for d in range(3, limit + 1, 2):
-        steps += 1
-        if steps % 100 == 0 and timeout_flag:
-            elapsed = time.perf_counter() - timeout_flag.start_time
-            if elapsed > timeout_flag.timeout_seconds:
-                timeout_flag.timeout_flag = True
-                return (None, None, {"steps": steps, "method": "basic", "limit": limit, "status": "timeout"})
-        
-        if n % d == 0:
-            return (d, n // d, {"steps": steps, "method": "basic", "found_at": d, "limit": limit})
+    state = checkpoint.load("basic") if checkpoint else None
+    if state:
+        start_d, steps = state["d"], state["steps"]
+
+    d = start_d
+    try:
+        for d in range(start_d, limit + 1, 2):
+            steps += 1
+            if steps % 100 == 0:
+                _save_checkpoint(checkpoint, "basic", d=d, steps=steps - 1)
+                if deadline and deadline.expired():
+                    _save_checkpoint(checkpoint, "basic", force=True, d=d, steps=steps - 1)
+                    return (None, None, {"steps": steps, "method": "basic", "limit": limit, "status": "timeout"})
+
+            if n % d == 0:
+                return (d, n // d, {"steps": steps, "method": "basic", "found_at": d, "limit": limit, "resumed": bool(state)})
+    except KeyboardInterrupt:
+        _save_checkpoint(checkpoint, "basic", force=True, d=d, steps=steps - 1)
+        raise
 
     return (None, None, {"steps": steps, "method": "basic", "limit": limit, "status": "prime"})
 
 
-def trial_division_with_primes(n: int, e: int, primes: list = None, timeout_flag=None, **kwargs) -> Tuple[int | None, int | None, Dict[str, Any]]:
+def trial_division_with_primes(n: int, e: int, primes: list = None, timeout_flag=None, deadline=None, checkpoint=None, **kwargs) -> Tuple[int | None, int | None, Dict[str, Any]]:
+    deadline = deadline or timeout_flag  # TimeoutFlag antigo continua valendo
+    limit = math.isqrt(n)
+
     if primes is None:
-        primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97]
-    
+        # Só primos, gerados pelo crivo segmentado (com cache em disco)
+        steps = 0
+        start_p = 2
+        state = checkpoint.load("with_primes") if checkpoint else None
+        if state:
+            start_p, steps = state["p"], state["steps"]
+
+        p = start_p
+        try:
+            for p in iter_primes(limit, start=start_p):
+                steps += 1
+                if steps % 100 == 0:
+                    _save_checkpoint(checkpoint, "with_primes", p=p, steps=steps - 1)
+                    if deadline and deadline.expired():
+                        _save_checkpoint(checkpoint, "with_primes", force=True, p=p, steps=steps - 1)
+                        return (None, None, {"steps": steps, "method": "with_primes", "limit": limit, "status": "timeout", "prime_source": "segmented_sieve"})
+
+                if n % p == 0:
+                    return (p, n // p, {"steps": steps, "method": "with_primes", "found_at": p, "used_prime_list": True, "primes_tested": steps, "prime_source": "segmented_sieve", "resumed": bool(state)})
+        except KeyboardInterrupt:
+            _save_checkpoint(checkpoint, "with_primes", force=True, p=p, steps=steps - 1)
+            raise
+
+        return (None, None, {"steps": steps, "method": "with_primes", "limit": limit, "status": "prime", "prime_source": "segmented_sieve"})
+
     steps = 0
-    limit = math.isqrt(n)
 
     for p in primes:
         steps += 1
@@ -52,11 +98,8 @@ def trial_division_with_primes(n: int, e: int, primes: list = None, timeout_flag
     while d <= limit:
         steps += 1
         composite_steps += 1
-        if composite_steps % 100 == 0 and timeout_flag:
-            elapsed = time.perf_counter() - timeout_flag.start_time
-            if elapsed > timeout_flag.timeout_seconds:
-                timeout_flag.timeout_flag = True
-                return (None, None, {"steps": steps, "method": "with_primes", "limit": limit, "status": "timeout"})
+        if composite_steps % 100 == 0 and deadline and deadline.expired():
+            return (None, None, {"steps": steps, "method": "with_primes", "limit": limit, "status": "timeout"})
         
         if n % d == 0:
             return (d, n // d, {"steps": steps, "method": "with_primes", "found_at": d, "used_prime_list": True, "primes_tested": len([p for p in primes if p <= limit]), "composite_tested": composite_steps})
@@ -65,7 +108,8 @@ def trial_division_with_primes(n: int, e: int, primes: list = None, timeout_flag
     return (None, None, {"steps": steps, "method": "with_primes", "limit": limit, "status": "prime"})
 
 
-def trial_division_wheel(n: int, e: int, timeout_flag=None, **kwargs) -> Tuple[int | None, int | None, Dict[str, Any]]:
+def trial_division_wheel(n: int, e: int, timeout_flag=None, deadline=None, checkpoint=None, **kwargs) -> Tuple[int | None, int | None, Dict[str, Any]]:
+    deadline = deadline or timeout_flag  # TimeoutFlag antigo continua valendo
     for p in [2, 3, 5]:
         if n % p == 0:
             return (p, n // p, {"steps": 1, "method": "wheel", "found_at": p, "wheel_optimized": True})
@@ -76,24 +120,33 @@ def trial_division_wheel(n: int, e: int, timeout_flag=None, **kwargs) -> Tuple[i
     i = 0
     limit = math.isqrt(n)
 
-    while d <= limit:
-        steps += 1
-        
-        if steps % 100 == 0 and timeout_flag:
-            elapsed = time.perf_counter() - timeout_flag.start_time
-            if elapsed > timeout_flag.timeout_seconds:
-                timeout_flag.timeout_flag = True
-                return (None, None, {"steps": steps, "method": "wheel", "limit": limit, "status": "timeout"})
-        
-        if n % d == 0:
-            return (d, n // d, {"steps": steps, "method": "wheel", "found_at": d, "wheel_optimized": True, "pattern_cycles": steps // len(increments)})
-        d += increments[i]
-        i = (i + 1) % len(increments)
+    state = checkpoint.load("wheel") if checkpoint else None
+    if state:
+        d, steps, i = state["d"], state["steps"], state["i"]
+
+    try:
+        while d <= limit:
+            steps += 1
+
+            if steps % 100 == 0:
+                _save_checkpoint(checkpoint, "wheel", d=d, steps=steps - 1, i=i)
+                if deadline and deadline.expired():
+                    _save_checkpoint(checkpoint, "wheel", force=True, d=d, steps=steps - 1, i=i)
+                    return (None, None, {"steps": steps, "method": "wheel", "limit": limit, "status": "timeout"})
+
+            if n % d == 0:
+                return (d, n // d, {"steps": steps, "method": "wheel", "found_at": d, "wheel_optimized": True, "pattern_cycles": steps // len(increments), "resumed": bool(state)})
+            d += increments[i]
+            i = (i + 1) % len(increments)
+    except KeyboardInterrupt:
+        _save_checkpoint(checkpoint, "wheel", force=True, d=d, steps=steps - 1, i=i)
+        raise
 
     return (None, None, {"steps": steps, "method": "wheel", "limit": limit, "status": "prime"})
 
 
-def trial_division_factorization(n: int, e: int, timeout_flag=None, **kwargs) -> Tuple[int | None, int | None, Dict[str, Any]]:
+def trial_division_factorization(n: int, e: int, timeout_flag=None, deadline=None, checkpoint=None, **kwargs) -> Tuple[int | None, int | None, Dict[str, Any]]:
+    deadline = deadline or timeout_flag  # TimeoutFlag antigo continua valendo
     factors = []
     original_n = n
     steps = 0
@@ -108,21 +161,29 @@ def trial_division_factorization(n: int, e: int, timeout_flag=None, **kwargs) ->
     d = 3
     limit = math.isqrt(n)
 
-    while d <= limit:
-        steps += 1
-        
-        if steps % 100 == 0 and timeout_flag:
-            elapsed = time.perf_counter() - timeout_flag.start_time
-            if elapsed > timeout_flag.timeout_seconds:
-                timeout_flag.timeout_flag = True
-                return (None, None, {"steps": steps, "method": "full_factorization", "status": "timeout"})
-        
-        factor_count = 0
-        while n % d == 0:
-            factors.append(d)
-            n //= d
-            factor_count += 1
-        d += 2
+    state = checkpoint.load("full_factorization") if checkpoint else None
+    if state:
+        d, steps, n, factors = state["d"], state["steps"], state["n"], state["factors"]
+
+    try:
+        while d <= limit:
+            steps += 1
+
+            if steps % 100 == 0:
+                _save_checkpoint(checkpoint, "full_factorization", d=d, steps=steps - 1, n=n, factors=factors)
+                if deadline and deadline.expired():
+                    _save_checkpoint(checkpoint, "full_factorization", force=True, d=d, steps=steps - 1, n=n, factors=factors)
+                    return (None, None, {"steps": steps, "method": "full_factorization", "status": "timeout"})
+
+            factor_count = 0
+            while n % d == 0:
+                factors.append(d)
+                n //= d
+                factor_count += 1
+            d += 2
+    except KeyboardInterrupt:
+        _save_checkpoint(checkpoint, "full_factorization", force=True, d=d, steps=steps - 1, n=n, factors=factors)
+        raise
 
     if n > 1:
         factors.append(n)
@@ -140,41 +201,168 @@ def trial_division_factorization(n: int, e: int, timeout_flag=None, **kwargs) ->
     return (None, None, {"steps": steps, "method": "full_factorization", "status": "prime"})
 
 
-def trial_division_progress(n: int, e: int, timeout_flag=None, **kwargs) -> Tuple[int | None, int | None, Dict[str, Any]]:
+def trial_division_progress(n: int, e: int, timeout_flag=None, deadline=None, checkpoint=None, **kwargs) -> Tuple[int | None, int | None, Dict[str, Any]]:
+    deadline = deadline or timeout_flag  # TimeoutFlag antigo continua valendo
     progress_interval = kwargs.get("progress_interval", 100)
     limit = math.isqrt(n)
     steps = 0
+    start_d = 3
     progress_logs = []
 
     if n % 2 == 0:
         return (2, n // 2, {"steps": 1, "method": "with_progress", "found_at": 2})
 
-    for d in range(3, limit + 1, 2):
-        steps += 1
+    state = checkpoint.load("with_progress") if checkpoint else None
+    if state:
+        start_d, steps = state["d"], state["steps"]
 
-        if steps % progress_interval == 0:
-            percent = (d / limit) * 100
-            print(f"   [Trial Division] {percent:.1f}% ({d}/{limit}) testados...")
-            progress_logs.append({"step": steps, "divisor": d, "percent": percent})
-            
-            if timeout_flag:
-                elapsed = time.perf_counter() - timeout_flag.start_time
-                if elapsed > timeout_flag.timeout_seconds:
-                    timeout_flag.timeout_flag = True
+    d = start_d
+    try:
+        for d in range(start_d, limit + 1, 2):
+            steps += 1
+
+            if steps % progress_interval == 0:
+                percent = (d / limit) * 100
+                print(f"   [Trial Division] {percent:.1f}% ({d}/{limit}) testados...")
+                progress_logs.append({"step": steps, "divisor": d, "percent": percent})
+                _save_checkpoint(checkpoint, "with_progress", d=d, steps=steps - 1)
+
+                if deadline and deadline.expired():
+                    _save_checkpoint(checkpoint, "with_progress", force=True, d=d, steps=steps - 1)
                     return (None, None, {"steps": steps, "method": "with_progress", "limit": limit, "status": "timeout"})
 
-        if n % d == 0:
-            return (d, n // d, {
-                "steps": steps, 
-                "method": "with_progress",
-                "found_at": d,
-                "progress_checkpoints": len(progress_logs),
-                "last_checkpoint": progress_logs[-1] if progress_logs else None
-            })
+            if n % d == 0:
+                return (d, n // d, {
+                    "steps": steps, 
+                    "method": "with_progress",
+                    "found_at": d,
+                    "progress_checkpoints": len(progress_logs),
+                    "last_checkpoint": progress_logs[-1] if progress_logs else None,
+                    "resumed": bool(state),
+                })
+    except KeyboardInterrupt:
+        _save_checkpoint(checkpoint, "with_progress", force=True, d=d, steps=steps - 1)
+        raise
 
     return (None, None, {"steps": steps, "method": "with_progress", "limit": limit, "status": "prime", "progress_checkpoints": len(progress_logs)})
 
 
+# Resíduos mod 30 coprimos com 2, 3 e 5 (roda de 30)
+WHEEL30_OFFSETS = np.array([1, 7, 11, 13, 17, 19, 23, 29], dtype=np.uint64)
+
+
+def _wheel_block(k_start: int, k_count: int) -> np.ndarray:
+    """Candidatos 30*k + r, para k em [k_start, k_start + k_count), em ordem crescente."""
+    ks = np.arange(k_start, k_start + k_count, dtype=np.uint64) * np.uint64(30)
+    return (ks[:, None] + WHEEL30_OFFSETS[None, :]).ravel()
+
+
+def _limbs32(n: int) -> list:
+    """n em limbs de 32 bits, do mais significativo para o menos significativo."""
+    limbs = []
+    while n:
+        limbs.append(n & 0xFFFFFFFF)
+        n >>= 32
+    return [np.uint64(x) for x in reversed(limbs)]
+
+
+def trial_division_batch(n: int, e: int, timeout_flag=None, block_size: int = 1 << 16, deadline=None, checkpoint=None, **kwargs) -> Tuple[int | None, int | None, Dict[str, Any]]:
+    """
+    Trial division vetorizado com NumPy.
+
+    - Candidatos da roda de 30 gerados em blocos de ~block_size divisores (uint64)
+    - n < 2^63: testa n % bloco == 0 em uma única operação
+    - n maior: resto calculado limb a limb (32 bits), válido para divisores < 2^32
+    """
+    deadline = deadline or timeout_flag  # TimeoutFlag antigo continua valendo
+    for p in [2, 3, 5]:
+        if n % p == 0:
+            return (p, n // p, {"steps": 1, "method": "batch_numpy", "found_at": p})
+
+    limit = math.isqrt(n)
+    engine = "uint64" if n < (1 << 63) else "multi_limb"
+    # além de 2^32 o resto limb a limb estouraria uint64
+    vector_limit = limit if engine == "uint64" else min(limit, (1 << 32) - 1)
+
+    n64 = np.uint64(n) if engine == "uint64" else None
+    limbs = _limbs32(n) if engine == "multi_limb" else None
+    shift = np.uint64(32)
+
+    rows = max(1, block_size // len(WHEEL30_OFFSETS))
+    k = 0
+    steps = 0
+    blocks = 0
+
+    state = checkpoint.load("batch_numpy") if checkpoint else None
+    if state:
+        k, steps, blocks = state["k"], state["steps"], state["blocks"]
+
+    while 30 * k + 1 <= vector_limit:
+        # salvo na fronteira do bloco: retomar repete no máximo um bloco
+        _save_checkpoint(checkpoint, "batch_numpy", k=k, steps=steps, blocks=blocks)
+        cands = _wheel_block(k, rows)
+        k += rows
+        if k == rows:
+            cands = cands[1:]  # descarta o 1
+        if int(cands[-1]) > vector_limit:
+            cands = cands[: np.searchsorted(cands, np.uint64(vector_limit), side="right")]
+        if cands.size == 0:
+            break
+
+        if engine == "uint64":
+            rem = n64 % cands
+        else:
+            rem = np.zeros_like(cands)
+            for limb in limbs:
+                rem = ((rem << shift) | limb) % cands
+
+        hits = np.flatnonzero(rem == 0)
+        blocks += 1
+        if hits.size:
+            d = int(cands[hits[0]])
+            steps += int(hits[0]) + 1
+            return (d, n // d, {"steps": steps, "method": "batch_numpy", "found_at": d, "limit": limit, "blocks": blocks, "engine": engine})
+        steps += int(cands.size)
+
+        if deadline and deadline.expired():
+            _save_checkpoint(checkpoint, "batch_numpy", force=True, k=k, steps=steps, blocks=blocks)
+            return (None, None, {"steps": steps, "method": "batch_numpy", "limit": limit, "status": "timeout", "blocks": blocks, "engine": engine})
+
+    # Divisores acima de 2^32 (só para n enorme): laço escalar na roda. O último bloco
+    # vetorizado foi cortado em vector_limit, então recomeça na linha da roda que contém
+    # vector_limit (repete no máximo 8 candidatos já testados)
+    k = min(k, vector_limit // 30)
+    d = 30 * k + 1
+    increments = [6, 4, 2, 4, 2, 4, 6, 2]  # 1 -> 7 -> 11 -> ... -> 29 -> 31
+    i = 0
+    while d <= limit:
+        if d > 1:
+            steps += 1
+            if steps % 100 == 0 and deadline and deadline.expired():
+                return (None, None, {"steps": steps, "method": "batch_numpy", "limit": limit, "status": "timeout", "blocks": blocks, "engine": engine})
+            if n % d == 0:
+                return (d, n // d, {"steps": steps, "method": "batch_numpy", "found_at": d, "limit": limit, "blocks": blocks, "engine": engine})
+        d += increments[i]
+        i = (i + 1) % len(increments)
+
+    return (None, None, {"steps": steps, "method": "batch_numpy", "limit": limit, "status": "prime", "blocks": blocks, "engine": engine})
+
+
+def _autosize_columns(sheet, df) -> None:
+    """Largura de cada coluna pelo maior texto (cabeçalho incluído), calculada no DataFrame."""
+    from openpyxl.utils import get_column_letter
+
+    for idx, column in enumerate(df.columns, start=1):
+        lengths = df[column].astype(str).str.len()
+        max_length = max(len(str(column)), int(lengths.max()) if len(lengths) else 0)
+        sheet.column_dimensions[get_column_letter(idx)].width = min(max_length + 2, 60)
+
+
+def _rate_cell(rate):
+    """Vazão arredondada para a planilha, "N/A" quando o ataque não contou."""
+    return round(rate, 1) if rate is not None else "N/A"
+
+
 def export_all_results_to_excel(all_results_dict, filename=None):
     if filename is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -192,6 +380,8 @@ def export_all_results_to_excel(all_results_dict, filename=None):
                 "Q": r.q if r.q else "N/A",
                 "Tempo (s)": round(r.elapsed_seconds, 6),
                 "Steps": r.extra.get("steps", "N/A"),
+                "Iterações/s": _rate_cell(throughput_of(r)["iters_per_s"]),
+                "Modmuls/s": _rate_cell(throughput_of(r)["modmuls_per_s"]),
                 "Divisor Encontrado": r.extra.get("found_at", "N/A"),
                 "Limite √N": r.extra.get("limit", "N/A"),
                 "Status": r.extra.get("status", "factored"),
@@ -212,6 +402,24 @@ def export_all_results_to_excel(all_results_dict, filename=None):
             
             if "progress_checkpoints" in r.extra:
                 row["Checkpoints Progresso"] = r.extra.get("progress_checkpoints", "N/A")
+
+            if "engine" in r.extra:
+                row["Motor Vetorizado"] = r.extra.get("engine", "N/A")
+                row["Blocos"] = r.extra.get("blocks", "N/A")
+
+            if isinstance(r.extra.get("counters"), dict):
+                counted = r.extra["counters"]
+                row["Iterações"] = counted.get("iters", "N/A")
+                row["GCDs"] = counted.get("gcds", "N/A")
+                row["Modmuls"] = counted.get("modmuls", "N/A")
+                row["isqrt"] = counted.get("isqrts", "N/A")
+                if "phases" in counted:
+                    row["Tempo por Fase (s)"] = str(counted["phases"])
+
+            if "stage" in r.extra:
+                row["Estágio"] = r.extra.get("stage", "N/A")
+                row["B1"] = r.extra.get("B1", "N/A")
+                row["B2"] = r.extra.get("B2", "N/A")
             
             detailed_data.append(row)
     
@@ -233,6 +441,11 @@ def export_all_results_to_excel(all_results_dict, filename=None):
             avg_steps = sum(steps_list) / len(steps_list) if steps_list else 0.0
             min_steps = min(steps_list) if steps_list else 0
             max_steps = max(steps_list) if steps_list else 0
+            t = sample_stats([r.elapsed_seconds for r in group])
+            st = sample_stats(steps_list) if steps_list else None
+            rates = [throughput_of(r) for r in group]
+            iters_rates = [x["iters_per_s"] for x in rates if x["iters_per_s"] is not None]
+            modmul_rates = [x["modmuls_per_s"] for x in rates if x["modmuls_per_s"] is not None]
             
             comparison_data.append({
                 "Método": method_name,
@@ -241,9 +454,17 @@ def export_all_results_to_excel(all_results_dict, filename=None):
                 "Sucessos": ok_b,
                 "Taxa Sucesso (%)": round(rate_b, 2),
                 "Tempo Médio (s)": round(avg_time, 6),
+                "Tempo Mediana (s)": round(t["median"], 6),
+                "Tempo p90 (s)": round(t["p90"], 6),
+                "Tempo Desvio (s)": round(t["std"], 6),
+                "IC95 Tempo Mediana (s)": f"[{t['ci_low']:.6f}, {t['ci_high']:.6f}]",
                 "Steps Médio": round(avg_steps, 2),
+                "Steps Mediana": round(st["median"], 2) if st else "N/A",
+                "IC95 Steps Mediana": f"[{st['ci_low']:.1f}, {st['ci_high']:.1f}]" if st else "N/A",
                 "Steps Mínimo": min_steps,
                 "Steps Máximo": max_steps,
+                "Iterações/s Mediana": _rate_cell(statistics.median(iters_rates) if iters_rates else None),
+                "Modmuls/s Mediana": _rate_cell(statistics.median(modmul_rates) if modmul_rates else None),
             })
     
     df_comparison = pd.DataFrame(comparison_data)
@@ -280,7 +501,7 @@ def export_all_results_to_excel(all_results_dict, filename=None):
         "Valor": sum(len(r) for r in all_results_dict.values())
     }, {
         "Item": "Descrição",
-        "Valor": "Análise comparativa de 5 variantes do algoritmo Trial Division para fatoração RSA"
+        "Valor": f"Análise comparativa de {len(all_results_dict)} variantes do algoritmo Trial Division para fatoração RSA"
     }, {
         "Item": "Métodos",
         "Valor": ", ".join(all_results_dict.keys())
@@ -288,26 +509,17 @@ def export_all_results_to_excel(all_results_dict, filename=None):
     
     df_info = pd.DataFrame(info_data)
         
+    sheets = [
+        ('📋 Informações', df_info),
+        ('📊 Resumo Geral', df_summary),
+        ('📈 Comparação por Bits', df_comparison),
+        ('📝 Resultados Detalhados', df_detailed),
+    ]
+
     with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-        df_info.to_excel(writer, sheet_name='📋 Informações', index=False)
-        df_summary.to_excel(writer, sheet_name='📊 Resumo Geral', index=False)
-        df_comparison.to_excel(writer, sheet_name='📈 Comparação por Bits', index=False)
-        df_detailed.to_excel(writer, sheet_name='📝 Resultados Detalhados', index=False)
-        
-        workbook = writer.book
-        
-        for sheet in workbook.worksheets:
-            for column in sheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 60)
-                sheet.column_dimensions[column_letter].width = adjusted_width
+        for sheet_name, df in sheets:
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+            _autosize_columns(writer.sheets[sheet_name], df)
     
     print(f"\n" + "="*70)
     print(f"📊 ANÁLISE COMPLETA EXPORTADA COM SUCESSO!")
@@ -321,6 +533,11 @@ def export_all_results_to_excel(all_results_dict, filename=None):
     return filename
 
 
+def export_results_file_to_excel(results_path, filename=None):
+    """Gera a planilha offline a partir do JSONL/Parquet gravado por RSABenchmark.run(sink=...)."""
+    return export_all_results_to_excel(read_results(results_path), filename)
+
+
 if __name__ == "__main__":
     from BaseAttack import RSABenchmark
 
@@ -333,29 +550,37 @@ if __name__ == "__main__":
     key_sizes = (16, 32, 64, 128, 256, 512, 1024, 2048)
     timeout_seconds = 10
 
-    bench1 = RSABenchmark(key_sizes_bits=key_sizes, seed=42)
+    # cada resultado vai para o JSONL assim que a chave termina; a planilha sai do arquivo
+    results_path = f"trial_division_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    sink = JsonlSink(results_path)
+
+    # as mesmas chaves para todas as variantes: gera (ou carrega do cache) uma vez só
+    bench = RSABenchmark(key_sizes_bits=key_sizes, seed=42)
+
     print("\n========== TESTE 1: TRIAL DIVISION BÁSICO ==========")
-    all_results["1. Básico"] = bench1.run(trial_division_basic, timeout_flag=TimeoutFlag(timeout_seconds))
-    bench1.print_final_report(all_results["1. Básico"])
+    all_results["1. Básico"] = bench.run(trial_division_basic, timeout_seconds=timeout_seconds, sink=sink, label="1. Básico")
+    bench.print_final_report(all_results["1. Básico"])
 
-    bench2 = RSABenchmark(key_sizes_bits=key_sizes, seed=42)
     print("\n========== TESTE 2: TRIAL DIVISION COM PRIMOS ==========")
-    all_results["2. Com Primos"] = bench2.run(trial_division_with_primes, timeout_flag=TimeoutFlag(timeout_seconds))
-    bench2.print_final_report(all_results["2. Com Primos"])
+    all_results["2. Com Primos"] = bench.run(trial_division_with_primes, timeout_seconds=timeout_seconds, sink=sink, label="2. Com Primos")
+    bench.print_final_report(all_results["2. Com Primos"])
 
-    bench3 = RSABenchmark(key_sizes_bits=key_sizes, seed=42)
     print("\n========== TESTE 3: TRIAL DIVISION WHEEL ==========")
-    all_results["3. Wheel Optimization"] = bench3.run(trial_division_wheel, timeout_flag=TimeoutFlag(timeout_seconds))
-    bench3.print_final_report(all_results["3. Wheel Optimization"])
+    all_results["3. Wheel Optimization"] = bench.run(trial_division_wheel, timeout_seconds=timeout_seconds, sink=sink, label="3. Wheel Optimization")
+    bench.print_final_report(all_results["3. Wheel Optimization"])
 
-    bench4 = RSABenchmark(key_sizes_bits=key_sizes, seed=42)
     print("\n========== TESTE 4: TRIAL DIVISION FATORAÇÃO COMPLETA ==========")
-    all_results["4. Fatoração Completa"] = bench4.run(trial_division_factorization, timeout_flag=TimeoutFlag(timeout_seconds))
-    bench4.print_final_report(all_results["4. Fatoração Completa"])
+    all_results["4. Fatoração Completa"] = bench.run(trial_division_factorization, timeout_seconds=timeout_seconds, sink=sink, label="4. Fatoração Completa")
+    bench.print_final_report(all_results["4. Fatoração Completa"])
 
-    bench5 = RSABenchmark(key_sizes_bits=key_sizes, seed=42)
     print("\n========== TESTE 5: TRIAL DIVISION COM PROGRESSO ==========")
-    all_results["5. Com Progresso"] = bench5.run(trial_division_progress, timeout_flag=TimeoutFlag(timeout_seconds), progress_interval=50)
-    bench5.print_final_report(all_results["5. Com Progresso"])
+    all_results["5. Com Progresso"] = bench.run(trial_division_progress, timeout_seconds=timeout_seconds, sink=sink, label="5. Com Progresso", progress_interval=50)
+    bench.print_final_report(all_results["5. Com Progresso"])
+
+    print("\n========== TESTE 6: TRIAL DIVISION VETORIZADO (NUMPY) ==========")
+    all_results["6. Vetorizado (NumPy)"] = bench.run(trial_division_batch, timeout_seconds=timeout_seconds, sink=sink, label="6. Vetorizado (NumPy)")
+    bench.print_final_report(all_results["6. Vetorizado (NumPy)"])
 
-    export_all_results_to_excel(all_results)
\ No newline at end of file
+    sink.close()
+    print(f"📁 Resultados gravados em: {results_path}")
+    export_results_file_to_excel(results_path)
\ No newline at end of file
@@ -0,0 +1,514 @@
+from BaseAttack import RSABenchmark
+from montgomery import MontgomeryLanes, lanes_supported
+from sieve import prime_gaps, prime_power_chunks, primes_between
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from functools import lru_cache
+from typing import Dict, Iterable, Tuple
+import math
+import multiprocessing
+import random
+import numpy as np
+
+# Tamanho (em bits) de cada bloco do multiplicador do estágio 1
+STAGE1_CHUNK_BITS = 512
+
+# Evento de parada compartilhado com os processos do pool (definido no initializer)
+_stop_event = None
+
+
+class _FactorFound(Exception):
+    """Uma inversão modular falhou durante o setup da curva: o gcd é um fator."""
+
+    def __init__(self, d: int):
+        super().__init__(d)
+        self.d = d
+
+
+# ------------------------------
+#  Aritmética na curva de Montgomery (coordenadas X:Z)
+# ------------------------------
+
+def _xdbl(X, Z, a24, n):
+    """2P em coordenadas projetivas X:Z (By^2 = x^3 + Ax^2 + x, a24 = (A+2)/4)."""
+    s = (X + Z) * (X + Z) % n
+    d = (X - Z) * (X - Z) % n
+    t = s - d
+    return s * d % n, t * (d + a24 * t) % n
+
+
+def _xadd(XP, ZP, XQ, ZQ, Xd, Zd, n):
+    """P + Q conhecendo a diferença P - Q = (Xd:Zd)."""
+    u = (XP - ZP) * (XQ + ZQ)
+    v = (XP + ZP) * (XQ - ZQ)
+    s = u + v
+    t = u - v
+    return Zd * s * s % n, Xd * t * t % n
+
+
+def _ladder(k, X, Z, a24, n):
+    """k * P pela escada de Montgomery (sem inversões)."""
+    if k == 1:
+        return X, Z
+    X0, Z0 = X, Z
+    X1, Z1 = _xdbl(X, Z, a24, n)
+    for bit in bin(k)[3:]:
+        if bit == "1":
+            X0, Z0 = _xadd(X1, Z1, X0, Z0, X, Z, n)
+            X1, Z1 = _xdbl(X1, Z1, a24, n)
+        else:
+            X1, Z1 = _xadd(X0, Z0, X1, Z1, X, Z, n)
+            X0, Z0 = _xdbl(X0, Z0, a24, n)
+    return X0, Z0
+
+
+def _suyama_curve(sigma: int, n: int):
+    """
+    Parametrização de Suyama: devolve (X, Z, a24) de um ponto em uma curva
+    com ordem divisível por 12. É a única inversão modular por curva.
+    """
+    u = (sigma * sigma - 5) % n
+    v = 4 * sigma % n
+    X = pow(u, 3, n)
+    Z = pow(v, 3, n)
+    num = pow(v - u, 3, n) * (3 * u + v) % n
+    den = 16 * X * v % n
+    d = math.gcd(den, n)
+    if d != 1:
+        raise _FactorFound(d)
+    a24 = num * pow(den, -1, n) % n
+    return X, Z, a24
+
+
+def _hasse_bound(n: int) -> int:
+    """
+    Maior ordem possível de E(F_p) para o menor primo p de n (p <= sqrt(n),
+    #E <= p + 1 + 2·sqrt(p)): B1 e B2 acima disso só gastam tempo e, em n
+    pequeno, deixam as duas ordens lisas ao mesmo tempo (gcd == n).
+    """
+    r = math.isqrt(n)
+    return r + 2 * math.isqrt(r) + 2
+
+
+def _stage1_backtrack(n: int, chunks: tuple, starts: list, a24: int) -> int:
+    """
+    O estágio 1 zerou Z módulo os dois primos (gcd == n). Refaz os blocos a
+    partir dos pontos salvos até o primeiro gcd != 1 e, nesse bloco, um primo
+    por vez; devolve o primeiro gcd não trivial (n se os dois primos caem
+    no mesmo primo do multiplicador).
+    """
+    for (k, parts), (X, Z) in zip(chunks, starts):
+        d = math.gcd(_ladder(k, X, Z, a24, n)[1], n)
+        if d == 1:
+            continue
+        if d != n:
+            return d
+        for pk in parts:
+            p = next((f for f in range(2, math.isqrt(pk) + 1) if pk % f == 0), pk)
+            while pk > 1:
+                X, Z = _ladder(p, X, Z, a24, n)
+                pk //= p
+                d = math.gcd(Z, n)
+                if d != 1:
+                    return d
+        return n
+    return n
+
+
+@lru_cache(maxsize=4)
+def _stage2_plan(B1: int, B2: int, D: int) -> tuple:
+    """
+    Agrupa os primos q em (B1, B2] por passo gigante: q = m*D ± j, 0 < j < D/2.
+    Devolve (m_inicial, [(m, [j, ...]), ...]).
+    """
+    q, gaps = prime_gaps(B1, B2)
+    if not q:
+        return (0, [])
+    plan = []
+    current_m = None
+    js = []
+    for gap in gaps + b"\x00":
+        m = (q + D // 2) // D
+        if m != current_m:
+            if js:
+                plan.append((current_m, js))
+            current_m = m
+            js = []
+        js.append(abs(q - m * D))
+        q += gap
+    plan.append((current_m, js))
+    return (plan[0][0], plan)
+
+
+def _stopped() -> bool:
+    return _stop_event is not None and _stop_event.is_set()
+
+
+def _ecm_one_curve(n: int, sigma: int, B1: int, B2: int):
+    """
+    Roda uma curva. Devolve (fator ou None, estágio alcançado).
+    """
+    try:
+        X, Z, a24 = _suyama_curve(sigma, n)
+    except _FactorFound as ff:
+        return (ff.d if ff.d != n else None, 0)
+
+    # ---------------- Estágio 1 ----------------
+    chunks = prime_power_chunks(B1, STAGE1_CHUNK_BITS)
+    starts = []  # ponto antes de cada bloco, para o backtracking
+    for k, _ in chunks:
+        starts.append((X, Z))
+        X, Z = _ladder(k, X, Z, a24, n)
+        if _stopped():
+            return (None, 1)
+
+    d = math.gcd(Z, n)
+    if d == n:
+        d = _stage1_backtrack(n, chunks, starts, a24)
+    if 1 < d < n:
+        return (d, 1)
+    if d == n or B2 <= B1:
+        return (None, 1)
+
+    # ---------------- Estágio 2 (baby-step / giant-step) ----------------
+    D = 2310 if B2 - B1 > 2310 * 64 else 210
+
+    # O plano só cobre q > D/2 (m >= 1): os primos de (B1, D/2] entram direto em Q,
+    # como a dobra dos primos que dividem D no p-1
+    folded = primes_between(B1, min(D // 2, B2))
+    for q in folded:
+        X, Z = _ladder(q, X, Z, a24, n)
+    if folded:
+        d = math.gcd(Z, n)
+        if 1 < d < n:
+            return (d, 2)
+        if d == n:
+            return (None, 2)
+
+    m0, plan = _stage2_plan(max(B1, D // 2), B2, D)
+    if not plan:
+        return (None, 2 if folded else 1)
+
+    # Passos pequenos: j*Q para j ímpar < D/2, via (j+2)Q = jQ + 2Q (diferença (j-2)Q)
+    X2, Z2 = _xdbl(X, Z, a24, n)
+    baby = {1: (X, Z)}
+    prev = (X, Z)
+    cur = _xadd(X2, Z2, X, Z, X, Z, n)  # 3Q
+    baby[3] = cur
+    for j in range(5, D // 2, 2):
+        nxt = _xadd(cur[0], cur[1], X2, Z2, prev[0], prev[1], n)
+        prev, cur = cur, nxt
+        baby[j] = cur
+
+    # Passos gigantes: G_m = m*D*Q
+    XD, ZD = _ladder(D, X, Z, a24, n)
+    G_prev = _ladder(m0 * D, X, Z, a24, n)
+    G = _ladder((m0 + 1) * D, X, Z, a24, n)
+    m_cur = m0
+
+    acc = 1
+    for m, js in plan:
+        while m_cur < m:
+            nxt = _xadd(G[0], G[1], XD, ZD, G_prev[0], G_prev[1], n)
+            G_prev, G = G, nxt
+            m_cur += 1
+        XG, ZG = G_prev  # G_prev == m_cur * D * Q
+        for j in js:
+            Xj, Zj = baby[j]
+            acc = acc * (XG * Zj - Xj * ZG) % n
+        if _stopped():
+            return (None, 2)
+
+    d = math.gcd(acc, n)
+    if 1 < d < n:
+        return (d, 2)
+    return (None, 2)
+
+
+def _ecm_task(n: int, sigmas: list, B1: int, B2: int):
+    """Tarefa do pool: roda um lote de curvas, para na primeira que fatorar."""
+    tried = 0
+    stage = 0
+    for sigma in sigmas:
+        if _stopped():
+            break
+        d, stage = _ecm_one_curve(n, sigma, B1, B2)
+        tried += 1
+        if d is not None:
+            return (d, sigma, stage, tried)
+    return (None, None, stage, tried)
+
+
+def _init_worker(stop_event) -> None:
+    global _stop_event
+    _stop_event = stop_event
+
+
+def ecm_attack(
+    n: int,
+    e: int,
+    B1: int = 50_000,
+    B2: int | None = None,
+    curves: int = 200,
+    processes: int | None = None,
+    curves_per_task: int = 2,
+    seed: int | None = None,
+    progress_interval: int = 10,
+    deadline=None,
+    counters=None,
+):
+    """
+    Fatoração por curvas elípticas de Lenstra (ECM), compatível com a interface do RSABenchmark.
+
+    - Curvas de Montgomery em coordenadas X:Z (sem inversões no laço principal)
+    - Parametrização de Suyama (sigma aleatório por curva)
+    - Estágio 1 até B1 e estágio 2 (baby-step/giant-step) até B2 (padrão 100 * B1),
+      os dois limitados pela maior ordem de curva possível para o menor primo de n
+    - gcd == n no fim do estágio 1 (n pequeno): refaz o estágio bloco a bloco
+      e primo a primo a partir dos pontos salvos, como o backtracking do p-1
+    - processes=N: curvas distribuídas em um pool de N processos
+    - deadline: checado entre lotes de curvas; estourado devolve status="timeout"
+    - counters: AttackCounters; uma iteração por curva concluída
+    """
+    if n % 2 == 0:
+        return (2, n // 2, {"status": "factor_found", "curves": 0, "B1": B1, "B2": B2, "stage": 0})
+    if n % 3 == 0:
+        return (3, n // 3, {"status": "factor_found", "curves": 0, "B1": B1, "B2": B2, "stage": 0})
+
+    if B2 is None:
+        B2 = 100 * B1
+    B1, B2 = min(B1, _hasse_bound(n)), min(B2, _hasse_bound(n))
+
+    rng = random.Random(seed)
+    sigmas = [rng.randrange(6, n - 1) if n > 7 else 6 for _ in range(curves)]
+    batches = [sigmas[i : i + curves_per_task] for i in range(0, curves, curves_per_task)]
+
+    tried = 0
+    stage_reached = 0
+    found = None
+
+    def finish(status):
+        if counters is not None:
+            counters.add(iters=tried)
+        extra = {
+            "status": status,
+            "curves": tried,
+            "B1": B1,
+            "B2": B2,
+            "stage": stage_reached,
+        }
+        if found is not None:
+            d, sigma = found
+            extra["sigma"] = sigma
+            return (d, n // d, extra)
+        return (None, None, extra)
+
+    if processes is None or processes <= 1:
+        for batch in batches:
+            d, sigma, stage, count = _ecm_task(n, batch, B1, B2)
+            tried += count
+            stage_reached = max(stage_reached, stage)
+            if progress_interval and tried % progress_interval == 0:
+                print(f"   [ECM] curvas={tried}/{curves}, B1={B1}, B2={B2}")
+            if d is not None:
+                found = (d, sigma)
+                stage_reached = stage
+                return finish("factor_found")
+            if deadline is not None and deadline.expired():
+                return finish("timeout")
+        return finish("no_factor")
+
+    ctx = multiprocessing.get_context()
+    stop_event = ctx.Event()
+    executor = ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(stop_event,),
+    )
+    timed_out = False
+    try:
+        pending = {executor.submit(_ecm_task, n, batch, B1, B2) for batch in batches}
+        while pending and found is None:
+            remaining = deadline.remaining() if deadline is not None else None
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                timed_out = True
+                break
+            for fut in done:
+                d, sigma, stage, count = fut.result()
+                tried += count
+                stage_reached = max(stage_reached, stage)
+                if progress_interval and tried % progress_interval == 0:
+                    print(f"   [ECM] curvas={tried}/{curves}, B1={B1}, B2={B2}")
+                if d is not None and found is None:
+                    found = (d, sigma)
+                    stage_reached = stage
+    finally:
+        # Sinaliza as curvas em andamento e descarta as que ainda não começaram
+        stop_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    if found is not None:
+        return finish("factor_found")
+    return finish("timeout" if timed_out else "no_factor")
+
+
+# ------------------------------
+#  ECM em lote: uma curva por módulo em cada lane (MontgomeryLanes)
+# ------------------------------
+
+def _xdbl_lanes(ctx, X, Z, a24):
+    """_xdbl em todas as lanes (resíduos em forma de Montgomery)."""
+    s = ctx.sqr(ctx.add(X, Z))
+    d = ctx.sqr(ctx.sub(X, Z))
+    t = ctx.sub(s, d)
+    return ctx.mul(s, d), ctx.mul(t, ctx.add(d, ctx.mul(a24, t)))
+
+
+def _xadd_lanes(ctx, XP, ZP, XQ, ZQ, Xd, Zd):
+    """_xadd em todas as lanes."""
+    u = ctx.mul(ctx.sub(XP, ZP), ctx.add(XQ, ZQ))
+    v = ctx.mul(ctx.add(XP, ZP), ctx.sub(XQ, ZQ))
+    s = ctx.add(u, v)
+    t = ctx.sub(u, v)
+    return ctx.mul(Zd, ctx.sqr(s)), ctx.mul(Xd, ctx.sqr(t))
+
+
+def _ladder_lanes(ctx, k, X, Z, a24):
+    """k * P em todas as lanes; o mesmo k para todas, então os bits do laço são comuns."""
+    if k == 1:
+        return X, Z
+    X0, Z0 = X, Z
+    X1, Z1 = _xdbl_lanes(ctx, X, Z, a24)
+    for bit in bin(k)[3:]:
+        if bit == "1":
+            X0, Z0 = _xadd_lanes(ctx, X1, Z1, X0, Z0, X, Z)
+            X1, Z1 = _xdbl_lanes(ctx, X1, Z1, a24)
+        else:
+            X1, Z1 = _xadd_lanes(ctx, X0, Z0, X1, Z1, X, Z)
+            X0, Z0 = _xdbl_lanes(ctx, X0, Z0, a24)
+    return X0, Z0
+
+
+def _ecm_lanes_round(batch: list, sigmas: list, B1: int):
+    """
+    Estágio 1 de uma curva por módulo de `batch`, todas em lockstep.
+    Devolve ({n: (fator, sigma)}, engine).
+    """
+    found = {}
+    lanes_n, X0, Z0, A24, lane_sigma = [], [], [], [], []
+    for n, sigma in zip(batch, sigmas):
+        try:
+            X, Z, a24 = _suyama_curve(sigma, n)
+        except _FactorFound as ff:
+            if ff.d != n:
+                found[n] = (ff.d, sigma)
+            continue
+        lanes_n.append(n)
+        X0.append(X)
+        Z0.append(Z)
+        A24.append(a24)
+        lane_sigma.append(sigma)
+    if not lanes_n:
+        return found, None
+
+    ctx = MontgomeryLanes(lanes_n)
+    X, Z, a24 = ctx.to_mont(X0), ctx.to_mont(Z0), ctx.to_mont(A24)
+    for k, _ in prime_power_chunks(B1, STAGE1_CHUNK_BITS):
+        X, Z = _ladder_lanes(ctx, k, X, Z, a24)
+
+    g = np.gcd(ctx.from_mont(Z), ctx.n)
+    for idx in np.flatnonzero((g > 1) & (g < ctx.n)):
+        found[lanes_n[idx]] = (int(g[idx]), lane_sigma[idx])
+    return found, ctx.engine
+
+
+def ecm_corpus_attack(
+    moduli: Iterable[int],
+    B1: int = 2_000,
+    curves: int = 100,
+    lanes: int = 1024,
+    seed: int | None = None,
+    progress_interval: int = 0,
+) -> Dict[int, Tuple[int, int, dict]]:
+    """
+    ECM em lote para muitos módulos pequenos (ataque de corpus, RSABenchmark.run_corpus).
+
+    - A cada rodada, cada módulo ainda não fatorado ganha curvas novas
+      (sigma aleatório); as curvas andam em lotes de `lanes`, uma por lane, e
+      fazem o estágio 1 juntas em MontgomeryLanes (n < 2^32 em 1 limb,
+      n < 2^64 em 2 limbs). Quando sobram poucos módulos, cada um ganha
+      várias curvas por rodada, para não rodar lotes quase vazios
+    - Só o estágio 1 (até B1): com milhares de lanes a vazão por curva é bem
+      maior que a do ecm_attack com inteiros Python
+    - curves: máximo de curvas por módulo
+    - Módulos >= 2^64 ficam de fora (use ecm_attack)
+    - Devolve {n: (p, q, extra)} para os módulos fatorados
+    """
+    rng = random.Random(seed)
+    found: Dict[int, Tuple[int, int, dict]] = {}
+
+    def record(n, d, sigma, tried, engine):
+        p, q = min(d, n // d), max(d, n // d)
+        found[n] = (p, q, {"status": "factor_found", "method": "ecm_lanes", "sigma": sigma,
+                           "curves": tried, "B1": B1, "engine": engine})
+
+    todo = []
+    for n in sorted(set(moduli)):  # em ordem: lotes com módulos do mesmo tamanho (mesma engine)
+        if n % 2 == 0 or n % 3 == 0:
+            if n > 3:
+                record(n, 2 if n % 2 == 0 else 3, None, 0, "trivial")
+        elif n > 7 and lanes_supported(n):
+            todo.append(n)
+
+    tried = dict.fromkeys(todo, 0)
+    rounds = 0
+    while True:
+        active = [n for n in todo if n not in found and tried[n] < curves]
+        if not active:
+            break
+        # poucos módulos restantes: várias curvas por módulo na mesma rodada,
+        # para que as lanes continuem cheias
+        per_mod = max(1, lanes // len(active))
+        work = [n for n in active for _ in range(min(per_mod, curves - tried[n]))]
+        for start in range(0, len(work), lanes):
+            batch = work[start : start + lanes]
+            sigmas = [rng.randrange(6, n - 1) for n in batch]
+            hits, engine = _ecm_lanes_round(batch, sigmas, B1)
+            for n, (d, sigma) in hits.items():
+                if n not in found:
+                    record(n, d, sigma, tried[n] + min(per_mod, curves - tried[n]), engine)
+        for n in work:
+            tried[n] += 1
+        rounds += 1
+        if progress_interval and rounds % progress_interval == 0:
+            print(f"   [ECM/lanes] rodadas={rounds}, fatorados={len(found)}/{len(todo)}")
+
+    return found
+
+
+if __name__ == "__main__":
+    bench = RSABenchmark(
+        key_sizes_bits=(64, 80, 96, 112, 128),
+        seed=42,
+    )
+
+    results = bench.run(
+        ecm_attack,
+        B1=50_000,
+        B2=5_000_000,
+        curves=400,
+        processes=multiprocessing.cpu_count(),
+    )
+
+    print(f"{'Bits':4} {'Sucesso':8} {'Tempo (s)':10} Extra")
+    print("-" * 60)
+    for r in results:
+        print(
+            f"{r.key_bits:4} "
+            f"{str(r.success):8} "
+            f"{r.elapsed_seconds:10.6f} "
+            f"{r.extra}"
+        )
+
+    bench.print_final_report(results)
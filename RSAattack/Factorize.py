@@ -0,0 +1,205 @@
+import math
+from collections import OrderedDict
+from typing import Dict
+
+from BaseAttack import RSABenchmark
+from intmath import iroot
+from primality import is_prime
+from sieve import primes_up_to
+
+# Fatores até este limite saem por divisão (um gcd com o produto dos primos) antes de qualquer split
+SMALL_FACTOR_BOUND = 1 << 12
+# Até aqui o split é o rho de Brent (mais rápido que SQUFOF e Hart nessa faixa); acima, ECM curto + SIQS
+RHO_SPLIT_BITS = 64
+
+# ECM curto antes do SIQS, por tamanho do cofator: (bits máx., B1, curvas). Tira fatores de até
+# ~30-45 bits de cofatores desbalanceados gastando uma fração do tempo do SIQS no mesmo tamanho
+SPLIT_ECM_LEVELS = (
+    (128, 1_000, 8),
+    (192, 2_000, 16),
+    (None, 11_000, 32),
+)
+# Rodadas do SIQS (seed novo a cada uma) antes de desistir de um cofator
+SPLIT_SIQS_TRIES = 3
+
+# Entradas do cache padrão: passando disso sai o cofator usado há mais tempo
+FACTOR_CACHE_SIZE = 4096
+
+
+class FactorCache(OrderedDict):
+    """Cache {cofator: fatoração} com no máximo `maxsize` entradas (LRU)."""
+
+    def __init__(self, maxsize: int = FACTOR_CACHE_SIZE):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+# Cache padrão: vale para o processo todo
+FACTOR_CACHE = FactorCache()
+
+_small_primes = primes_up_to(SMALL_FACTOR_BOUND)
+_small_product = math.prod(_small_primes)
+
+
+def _merge(into: Dict[int, int], factors: Dict[int, int], times: int = 1) -> None:
+    for p, k in factors.items():
+        into[p] = into.get(p, 0) + k * times
+
+
+def _perfect_power(n: int) -> tuple:
+    """(r, k) com n = r^k para o menor primo k possível, ou (n, 1)."""
+    for k in primes_up_to(n.bit_length()):
+        r = iroot(n, k)
+        if r ** k == n:
+            return r, k
+    return n, 1
+
+
+def _split(n: int, deadline) -> int:
+    """Divisor não trivial de n composto, ímpar, sem fatores pequenos e que não é potência."""
+    if n.bit_length() <= RHO_SPLIT_BITS:
+        from Pollard_Rho import pollard_rho_attack
+        while True:  # c novo a cada rodada
+            p, _, extra = pollard_rho_attack(n, 0, variant="brent", progress_interval=1 << 62, deadline=deadline)
+            if p is not None:
+                return p
+            if extra["status"] == "timeout":
+                raise TimeoutError(f"prazo estourado ao separar {n}")
+
+    from ECM import ecm_attack
+    B1, curves = next((B1, c) for bits, B1, c in SPLIT_ECM_LEVELS if bits is None or n.bit_length() <= bits)
+    p, _, extra = ecm_attack(n, 0, B1=B1, curves=curves, progress_interval=0, deadline=deadline)
+    if p is not None:
+        return p
+    if extra["status"] == "timeout":
+        raise TimeoutError(f"prazo estourado ao separar {n}")
+
+    # cofator balanceado (ou com fatores acima do alcance do ECM curto): crivo quadrático
+    from QuadraticSieve import siqs_attack
+    for seed in range(SPLIT_SIQS_TRIES):
+        p, _, extra = siqs_attack(n, 0, seed=seed, progress_interval=0, deadline=deadline)
+        if p is not None:
+            return p
+        if extra["status"] == "timeout":
+            raise TimeoutError(f"prazo estourado ao separar {n}")
+    raise RuntimeError(f"nenhum método separou o cofator {n} ({extra['status']})")
+
+
+def _factor(n: int, deadline, cache: Dict[int, Dict[int, int]]) -> Dict[int, int]:
+    if n == 1:
+        return {}
+    cached = cache.get(n)
+    if cached is not None:
+        return cached
+
+    factors: Dict[int, int] = {}
+    m = n
+    g = math.gcd(m, _small_product)
+    if g > 1:
+        for p in _small_primes:
+            if g % p == 0:
+                while m % p == 0:
+                    m //= p
+                    factors[p] = factors.get(p, 0) + 1
+
+    if m > 1:
+        rest = cache.get(m)
+        if rest is None:
+            if m < SMALL_FACTOR_BOUND * SMALL_FACTOR_BOUND or is_prime(m):
+                rest = {m: 1}
+            else:
+                rest = {}
+                root, k = _perfect_power(m)
+                if k > 1:
+                    _merge(rest, _factor(root, deadline, cache), k)
+                else:
+                    d = _split(m, deadline)
+                    _merge(rest, _factor(d, deadline, cache))
+                    _merge(rest, _factor(m // d, deadline, cache))
+            cache[m] = rest
+        _merge(factors, rest)
+
+    cache[n] = factors
+    return factors
+
+
+def factorize(n: int, deadline=None, cache: Dict[int, Dict[int, int]] | None = None) -> Dict[int, int]:
+    """
+    Fatoração completa de n: {primo: expoente}, em ordem crescente.
+
+    - Fatores <= SMALL_FACTOR_BOUND saem por divisão; o cofator é testado com
+      Baillie-PSW (primality.is_prime), e potências perfeitas viram a raiz
+      com o expoente multiplicado
+    - Cofatores compostos são separados pelo método mais rápido para o
+      tamanho (rho de Brent até RHO_SPLIT_BITS bits; acima, um ECM curto de
+      SPLIT_ECM_LEVELS e depois o SIQS) e as duas partes são fatoradas
+      recursivamente
+    - cache: {cofator: fatoração} (padrão: FACTOR_CACHE, um FactorCache com
+      FACTOR_CACHE_SIZE entradas). Todo cofator visitado entra no cache, então
+      módulos repetidos, ou que dividem um primo com outro já fatorado, saem
+      sem novo split
+    - deadline: prazo cooperativo repassado aos métodos; estourado levanta
+      TimeoutError
+    """
+    if n < 1:
+        raise ValueError("n deve ser >= 1")
+    cache = FACTOR_CACHE if cache is None else cache
+    return dict(sorted(_factor(n, deadline, cache).items()))
+
+
+def factorize_attack(n: int, e: int, deadline=None, cache: Dict[int, Dict[int, int]] | None = None):
+    """
+    factorize compatível com a interface do RSABenchmark: p é o menor primo e
+    q = n // p; extra["factors"] traz [[primo, expoente], ...].
+    """
+    if n < 4:
+        return (None, None, {"status": "invalid_input", "method": "factorize"})
+    try:
+        factors = factorize(n, deadline, cache)
+    except TimeoutError:
+        return (None, None, {"status": "timeout", "method": "factorize"})
+
+    if list(factors.values()) == [1]:
+        return (None, None, {"status": "prime", "method": "factorize"})
+    p = min(factors)
+    return (p, n // p, {
+        "status": "factor_found",
+        "method": "factorize",
+        "factors": [[prime, k] for prime, k in factors.items()],
+        "total_factors": sum(factors.values()),
+    })
+
+
+if __name__ == "__main__":
+    bench = RSABenchmark(
+        key_sizes_bits=(32, 48, 64, 96, 128),
+        keys_per_size=3,
+        seed=42,
+    )
+
+    # repeats=2: a segunda passada de cada chave sai do cache
+    results = bench.run(factorize_attack, timeout_seconds=60, repeats=2)
+
+    print(f"{'Bits':4} {'Sucesso':8} {'Tempo (s)':10} Fatores")
+    print("-" * 60)
+    for r in results:
+        print(
+            f"{r.key_bits:4} "
+            f"{str(r.success):8} "
+            f"{r.elapsed_seconds:10.6f} "
+            f"{r.extra.get('factors')}"
+        )
+
+    bench.print_final_report(results)
@@ -0,0 +1,367 @@
+import importlib
+import math
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from BaseAttack import Deadline, RSABenchmark, parse_attack_output
+from intmath import pow_modmuls
+from sieve import primes_up_to
+
+# Estágio 1: divisão pelos primos até este limite (um gcd com o produto deles)
+TRIAL_BOUND = 1 << 16
+
+# Estágio 2: Fermat só pega p e q muito próximos; poucos milissegundos bastam
+FERMAT_SECONDS = 0.005
+
+# Estágio 3: fração do orçamento para o p-1 e B1 sem orçamento
+P_MINUS_1_SHARE = 0.2
+P_MINUS_1_B1 = 20_000
+# Custo do p-1 com B2 = 100·B1, em multiplicações modulares por unidade de B1
+# (os dois estágios, com gcds e o resto do laço; medido de 128 a 1024 bits)
+P_MINUS_1_MODMULS_PER_B1 = 60
+# Peneira dos primos do estágio 2, em segundos por unidade de B2 (medido; em cache depois da primeira vez)
+P_MINUS_1_SIEVE_SECONDS = 1.1e-7
+
+# Estágio 4: até aqui o rho (fatores de até ~RHO_MAX_BITS/2 bits), acima o ECM
+RHO_MAX_BITS = 80
+RHO_FIRST_ITERS = 1 << 16
+# (B1, curvas) por nível, como na tabela do GMP-ECM (fatores de 15, 20, 25, 30, 35 dígitos)
+ECM_SCHEDULE = ((2_000, 25), (11_000, 90), (50_000, 300), (250_000, 700), (1_000_000, 1800))
+
+# Estágios com orçamento aprendido, na ordem do pipeline
+LEARNED_STAGES = ("fermat", "p_minus_1")
+# Nome do ataque nos arquivos de resultados -> estágio do planejador
+ATTACK_STAGES = {
+    "fermat_factor": "fermat",
+    "pollard_p_minus_1_attack": "p_minus_1",
+    "pollard_rho_attack": "rho",
+    "ecm_attack": "ecm",
+}
+# Amostras mínimas de um estágio (por tamanho de chave) para aprender o orçamento
+MIN_SAMPLES = 5
+
+_trial_products: Dict[int, Tuple[int, list]] = {}
+
+
+def _trial_factor(n: int, bound: int) -> int:
+    """Menor primo <= bound que divide n, ou 0; um gcd com o produto dos primos descarta o caso comum."""
+    if bound not in _trial_products:
+        primes = primes_up_to(bound)
+        _trial_products[bound] = (math.prod(primes), primes)
+    product, primes = _trial_products[bound]
+    g = math.gcd(n, product)
+    if g == 1:
+        return 0
+    for p in primes:
+        if g % p == 0:
+            return p if p < n else 0
+    return 0
+
+
+def _modmul_seconds(n: int) -> float:
+    """Custo medido de uma multiplicação modular em n (pow com expoente de 512 bits)."""
+    exponent = (1 << 512) - 1
+    start = time.perf_counter()
+    pow(3, exponent, n)
+    return (time.perf_counter() - start) / pow_modmuls(exponent)
+
+
+def p_minus_1_bound(n: int, seconds: float | None) -> int:
+    """
+    B1 do p-1 que cabe em `seconds` (com B2 = 100·B1), pelo custo medido da
+    modmul em n mais a peneira do estágio 2. Arredonda para baixo para 2^k ou
+    1.5·2^k: chaves parecidas repetem o B1 e reaproveitam a peneira em cache.
+    """
+    if seconds is None:
+        return P_MINUS_1_B1
+    per_b1 = P_MINUS_1_MODMULS_PER_B1 * _modmul_seconds(n) + 100 * P_MINUS_1_SIEVE_SECONDS
+    B1 = max(int(seconds / per_b1), 128)
+    top = 1 << (B1.bit_length() - 1)
+    return top * 3 // 2 if B1 >= top * 3 // 2 else top
+
+
+# ------------------------------
+#  Orçamentos aprendidos
+# ------------------------------
+
+def _stage_samples(paths: Iterable[str]) -> Dict[int, Dict[str, List[Tuple[float, bool]]]]:
+    """
+    {bits: {estágio: [(segundos, sucesso), ...]}} a partir de arquivos de
+    resultados (results_sink). Linhas de ataques avulsos (ATTACK_STAGES) contam
+    como uma amostra do estágio; linhas do próprio planned_attack contam cada
+    estágio que rodou.
+    """
+    from results_sink import iter_rows
+
+    samples: Dict[int, Dict[str, List[Tuple[float, bool]]]] = {}
+    for path in paths:
+        for row in iter_rows(path):
+            extra = row.get("extra") or {}
+            if isinstance(extra, str):
+                continue
+            by_stage = samples.setdefault(row["key_bits"], {})
+            if row.get("attack") == "planned_attack":
+                for stage in extra.get("stages", []):
+                    by_stage.setdefault(stage["stage"], []).append(
+                        (stage["seconds"], stage["status"] == "factor_found")
+                    )
+            elif row.get("attack") in ATTACK_STAGES:
+                by_stage.setdefault(ATTACK_STAGES[row["attack"]], []).append(
+                    (row["elapsed_seconds"], bool(row["success"]))
+                )
+    return samples
+
+
+def _expected_cost(stages: List[List[Tuple[float, bool]]], budgets: List[float], tail: float) -> float:
+    """
+    Tempo esperado até fatorar com os estágios em sequência, cada um cortado no
+    seu orçamento, tratando os estágios como independentes; quem passa por
+    todos paga `tail` (o custo médio do último estágio).
+    """
+    alive = 1.0
+    cost = 0.0
+    for rows, budget in zip(stages, budgets):
+        if budget <= 0:
+            continue
+        cost += alive * sum(min(seconds, budget) for seconds, _ in rows) / len(rows)
+        alive *= 1.0 - sum(1 for seconds, ok in rows if ok and seconds <= budget) / len(rows)
+    return cost + alive * tail
+
+
+def learn_stage_budgets(paths: Iterable[str] | str) -> Dict[int, Dict[str, float]]:
+    """
+    Orçamentos por estágio aprendidos de benchmarks anteriores (JSONL/Parquet).
+
+    Para cada tamanho de chave, escolhe o tempo de cada estágio de
+    LEARNED_STAGES (0 = pula o estágio) entre os tempos de sucesso observados,
+    por descida coordenada, minimizando o tempo esperado até fatorar sobre as
+    chaves do histórico. O último estágio (rho/ECM) não tem corte: entra com o
+    seu tempo médio. Estágios com menos de MIN_SAMPLES amostras ficam de fora
+    (o planejador usa o padrão).
+
+    Devolve {bits: {estágio: segundos}}, o formato de `stage_budgets`.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    learned: Dict[int, Dict[str, float]] = {}
+    for bits, by_stage in _stage_samples(paths).items():
+        names = [s for s in LEARNED_STAGES if len(by_stage.get(s, ())) >= MIN_SAMPLES]
+        if not names:
+            continue
+        stages = [by_stage[s] for s in names]
+        tail_rows = by_stage.get("rho", []) + by_stage.get("ecm", [])
+        if tail_rows:
+            tail = sum(seconds for seconds, _ in tail_rows) / len(tail_rows)
+        else:
+            tail = max(seconds for rows in stages for seconds, _ in rows)
+        candidates = [[0.0] + sorted({seconds for seconds, ok in rows if ok}) for rows in stages]
+
+        budgets = [c[-1] for c in candidates]
+        best = _expected_cost(stages, budgets, tail)
+        improved = True
+        while improved:
+            improved = False
+            for i, options in enumerate(candidates):
+                for option in options:
+                    trial = budgets[:i] + [option] + budgets[i + 1:]
+                    cost = _expected_cost(stages, trial, tail)
+                    if cost < best - 1e-12:
+                        best, budgets, improved = cost, trial, True
+        learned[bits] = dict(zip(names, budgets))
+        learned[bits]["expected_seconds"] = best
+    return learned
+
+
+def _budgets_for(bits: int, stage_budgets: Dict[int, Dict[str, float]] | None) -> Dict[str, float]:
+    """Orçamentos aprendidos do tamanho de chave mais próximo (vazio sem histórico)."""
+    if not stage_budgets:
+        return {}
+    nearest = min(stage_budgets, key=lambda b: (abs(int(b) - bits), int(b)))
+    return stage_budgets[nearest]
+
+
+# ------------------------------
+#  Ataque planejado
+# ------------------------------
+
+def planned_attack(
+    n: int,
+    e: int,
+    budget_seconds: float | None = None,
+    stage_budgets: Dict[int, Dict[str, float]] | None = None,
+    trial_bound: int = TRIAL_BOUND,
+    deadline=None,
+    counters=None,
+):
+    """
+    Planejador de ataques, compatível com a interface do RSABenchmark: escolhe
+    e encadeia os métodos pelo tamanho de n e pelo tempo que sobra.
+
+    1. divisão pelos primos <= trial_bound (um gcd com o produto deles)
+    2. Fermat por FERMAT_SECONDS (p e q próximos)
+    3. p-1 com B1 dimensionado para P_MINUS_1_SHARE do orçamento, pelo custo
+       medido da multiplicação modular em n
+    4. até RHO_MAX_BITS bits, rho de Brent com max_iter dobrando (c novo a
+       cada rodada); acima, ECM subindo os níveis de ECM_SCHEDULE
+    - budget_seconds: orçamento total (com `deadline`, vale o que acabar
+      primeiro); sem nenhum dos dois o último estágio roda até fatorar
+    - stage_budgets: orçamentos de learn_stage_budgets; substituem os padrões
+      dos estágios 2 e 3 (0 pula o estágio)
+    - counters: repassado aos estágios
+    - extra["stages"]: um registro por estágio (tempo, status e parâmetros);
+      extra["method"] é o estágio que fatorou
+    """
+    start = time.perf_counter()
+    total = budget_seconds
+    if deadline is not None and deadline.remaining() is not None:
+        total = deadline.remaining() if total is None else min(total, deadline.remaining())
+    learned = _budgets_for(n.bit_length(), stage_budgets)
+    stages: List[Dict[str, Any]] = []
+
+    def remaining() -> float | None:
+        if total is None:
+            return None
+        return max(total - (time.perf_counter() - start), 0.0)
+
+    def share(seconds: float | None) -> float | None:
+        left = remaining()
+        if seconds is None:
+            return left
+        return seconds if left is None else min(seconds, left)
+
+    def finish(p, q, status, method=None):
+        extra = {
+            "status": status,
+            "method": method,
+            "stages": stages,
+            "budget_seconds": total,
+        }
+        if learned:
+            extra["learned_budgets"] = learned
+        return (p, q, extra)
+
+    def run_stage(name: str, attack, seconds: float | None, **kwargs):
+        """Roda um estágio com prazo próprio; devolve (p, q) se fatorou."""
+        t0 = time.perf_counter()
+        stage_deadline = Deadline(seconds)
+        p, q, info = parse_attack_output(attack(n, e, deadline=stage_deadline, counters=counters, **kwargs))
+        ok = p is not None and q is not None and p * q == n and 1 < p < n
+        stages.append({
+            "stage": name,
+            "seconds": time.perf_counter() - t0,
+            "budget": seconds,
+            "status": "factor_found" if ok else info.get("status", "no_factor"),
+            **{k: v for k, v in kwargs.items() if k != "progress_interval"},
+        })
+        return (min(p, q), max(p, q)) if ok else None
+
+    if n < 4:
+        return finish(None, None, "invalid_input")
+
+    from primality import is_prime
+    if is_prime(n):
+        return finish(None, None, "prime")
+
+    # 1. divisão por tentativa
+    t0 = time.perf_counter()
+    d = _trial_factor(n, trial_bound)
+    stages.append({
+        "stage": "trial_division",
+        "seconds": time.perf_counter() - t0,
+        "budget": None,
+        "status": "factor_found" if d else "no_factor",
+        "bound": trial_bound,
+    })
+    if d:
+        return finish(d, n // d, "factor_found", "trial_division")
+
+    # 2. Fermat
+    from fermat import fermat_factor
+    seconds = learned.get("fermat", FERMAT_SECONDS)
+    if seconds > 0:
+        found = run_stage("fermat", fermat_factor, share(seconds))
+        if found:
+            return finish(*found, "factor_found", "fermat")
+
+    # 3. p-1
+    pollard_p_minus_1 = importlib.import_module("pollard-p-1")
+    seconds = learned.get("p_minus_1")
+    if seconds is None and total is not None:
+        seconds = P_MINUS_1_SHARE * total
+    if seconds is None or seconds > 0:
+        seconds = share(seconds)
+        found = run_stage(
+            "p_minus_1",
+            pollard_p_minus_1.pollard_p_minus_1_attack,
+            seconds,
+            B1=p_minus_1_bound(n, seconds),
+            progress_interval=0,
+        )
+        if found:
+            return finish(*found, "factor_found", "p_minus_1")
+
+    # 4. rho ou ECM, com limites crescentes
+    if n.bit_length() <= RHO_MAX_BITS:
+        from Pollard_Rho import pollard_rho_attack
+        max_iter = RHO_FIRST_ITERS
+        while remaining() is None or remaining() > 0:
+            found = run_stage(
+                "rho",
+                pollard_rho_attack,
+                remaining(),
+                variant="brent",
+                max_iter=max_iter,
+                progress_interval=1 << 62,
+            )
+            if found:
+                return finish(*found, "factor_found", "rho")
+            max_iter *= 2
+    else:
+        from ECM import ecm_attack
+        for B1, curves in ECM_SCHEDULE:
+            if remaining() is not None and remaining() <= 0:
+                break
+            found = run_stage("ecm", ecm_attack, remaining(), B1=B1, curves=curves, progress_interval=0)
+            if found:
+                return finish(*found, "factor_found", "ecm")
+        else:
+            return finish(None, None, "no_factor")
+
+    return finish(None, None, "timeout")
+
+
+if __name__ == "__main__":
+    import os
+    from results_sink import open_sink
+
+    # histórico de execuções anteriores (deste exemplo ou de benchmarks avulsos)
+    history = "planner_results.jsonl"
+    budgets = learn_stage_budgets(history) if os.path.exists(history) else None
+
+    bench = RSABenchmark(
+        key_sizes_bits=(32, 48, 64, 96, 128),
+        keys_per_size=3,
+        seed=42,
+    )
+
+    with open_sink(history) as sink:
+        results = bench.run(
+            planned_attack,
+            budget_seconds=30,
+            stage_budgets=budgets,
+            sink=sink,
+        )
+
+    print(f"{'Bits':4} {'Sucesso':8} {'Tempo (s)':10} {'Método':16} Estágios")
+    print("-" * 90)
+    for r in results:
+        stages = [(s["stage"], round(s["seconds"], 4), s["status"]) for s in r.extra.get("stages", [])]
+        print(
+            f"{r.key_bits:4} "
+            f"{str(r.success):8} "
+            f"{r.elapsed_seconds:10.6f} "
+            f"{str(r.extra.get('method')):16} "
+            f"{stages}"
+        )
+
+    bench.print_final_report(results)
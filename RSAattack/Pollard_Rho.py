@@ -1,6 +1,10 @@
 from BaseAttack import RSABenchmark
+from collections import deque
+from montgomery import MontgomeryLanes, lanes_supported
+from typing import Dict, Iterable, List, Tuple
 import math
 import random
+import numpy as np
 
 
 def pollard_rho_attack(
@@ -10,14 +14,30 @@ def pollard_rho_attack(
     x_start: int = 2,
     max_iter: int = 10_000_000,
     progress_interval: int = 1000,
+    variant: str = "floyd",
+    batch: int = 128,
+    lanes: int = 64,
+    deadline=None,
+    checkpoint=None,
+    counters=None,
 ):
     """
     Implementação do Pollard Rho (ρ), compatível com a interface do RSABenchmark.
 
-    - Usa tartaruga e lebre (Floyd cycle finding)
+    - variant="floyd": tartaruga e lebre (Floyd cycle finding), um gcd por iteração
+    - variant="brent": ciclo de Brent com produto acumulado de |x - y| e
+      um gcd a cada `batch` passos
+    - variant="lanes": `lanes` valores de c ao mesmo tempo em lanes NumPy
+      (Brent em MontgomeryLanes, gcd a cada `batch` passos), para n < 2^64;
+      n maior cai no "brent"
     - Função padrão: f(x) = x^2 + c (mod n)
     - c é aleatório se não fornecido
     - Log de progresso igual ao Pollard p-1
+    - checkpoint (RSABenchmark.run com checkpoint_dir/resume): salva x, y, c e
+      iters periodicamente e retoma de onde parou
+    - deadline: prazo cooperativo; estourado devolve status="timeout"
+    - counters: AttackCounters; iters, gcds e modmuls (3 quadrados por
+      iteração no Floyd) a cada counters.flush_every iterações
     """
 
     # Evita casos triviais
@@ -36,6 +56,13 @@ def pollard_rho_attack(
     else:
         c = c_start
 
+    if variant == "lanes" and lanes_supported(n) and n > 8:
+        return _pollard_rho_lanes_single(n, c, x_start, max_iter, lanes, batch, deadline, counters)
+    if variant in ("brent", "lanes"):
+        return _pollard_rho_brent(n, c, x_start, max_iter, progress_interval, batch, deadline, checkpoint, counters)
+    if variant != "floyd":
+        raise ValueError(f"variante desconhecida: {variant!r} (use 'floyd', 'brent' ou 'lanes')")
+
     # Tartaruga e lebre
     x = x_start
     y = x_start
@@ -43,11 +70,32 @@ def pollard_rho_attack(
     # Contador de iterações
     iters = 0
 
-    # Função iteradora f(x)
+    state = checkpoint.load("rho/floyd") if checkpoint else None
+    if state:
+        x, y, c, iters = state["x"], state["y"], state["c"], state["iters"]
+    flushed = iters
+    flush_every = counters.flush_every if counters is not None else 0
+
+    def finish(p, q, status):
+        if counters is not None:
+            done = iters - flushed
+            counters.add(iters=done, gcds=done, modmuls=3 * done)
+        return (p, q, {
+            "status": status,
+            "iters": iters,
+            "x_final": x,
+            "y_final": y,
+            "c": c,
+        })
+
+    # Função iteradora f(x) (lê c a cada chamada: o restart troca c)
     def f(z: int) -> int:
         return (z * z + c) % n
 
     while iters < max_iter:
+        if checkpoint is not None and iters % 1000 == 0 and checkpoint.due():
+            checkpoint.save("rho/floyd", x=x, y=y, c=c, iters=iters)
+
         # Tartaruga: 1 passo
         x = f(x)
 
@@ -63,17 +111,16 @@ def pollard_rho_attack(
         if iters % progress_interval == 0:
             print(f"   [Pollard Rho] iters={iters}, gcd(x-y, n)={d}, c={c}")
 
+        if flush_every and iters - flushed >= flush_every:
+            counters.add(iters=flush_every, gcds=flush_every, modmuls=3 * flush_every)
+            flushed = iters
+
+        if deadline is not None and d == 1 and deadline.tick():
+            return finish(None, None, "timeout")
+
         # caso encontrou fator não trivial
         if 1 < d < n:
-            p = d
-            q = n // d
-            return (p, q, {
-                "status": "factor_found",
-                "iters": iters,
-                "x_final": x,
-                "y_final": y,
-                "c": c,
-            })
+            return finish(d, n // d, "factor_found")
 
         # caso ciclo ruim: restart automático
         if d == n:
@@ -83,13 +130,407 @@ def pollard_rho_attack(
             y = x_start
 
     # Chegou no limite sem fatorar
-    return (None, None, {
-        "status": "max_iter_reached",
-        "iters": iters,
-        "x_final": x,
-        "y_final": y,
-        "c": c,
-    })
+    return finish(None, None, "max_iter_reached")
+
+
+def _pollard_rho_brent(
+    n: int,
+    c: int,
+    x_start: int,
+    max_iter: int,
+    progress_interval: int,
+    batch: int,
+    deadline=None,
+    checkpoint=None,
+    counters=None,
+):
+    """
+    Pollard Rho com detecção de ciclo de Brent.
+
+    - y anda r passos por rodada (r dobra a cada rodada), x fica parado
+    - |x - y| é multiplicado em q (mod n) e o gcd só é feito a cada `batch` passos
+    - se o gcd colapsa para n, refaz o último bloco passo a passo a partir de ys
+    - iters conta avaliações de f; cada gcd evitado aparece em gcd_calls_saved
+    - checkpoint: o estado é salvo na fronteira dos blocos de `batch` passos
+    - counters: recebe o trabalho de cada bloco (1 modmul por passo de y,
+      mais 1 por |x - y| acumulado)
+    """
+    iters = 0
+    gcd_calls = 0
+    restarts = 0
+
+    state = checkpoint.load("rho/brent") if checkpoint else None
+    if state:
+        iters, gcd_calls, restarts, c = state["iters"], state["gcd_calls"], state["restarts"], state["c"]
+    next_log = (iters // progress_interval + 1) * progress_interval
+    flushed = (iters, gcd_calls)  # já contados em checkpoints anteriores
+    modmuls = 0
+
+    def finish(p, q, status, x, y):
+        if counters is not None:
+            counters.add(iters=iters - flushed[0], gcds=gcd_calls - flushed[1], modmuls=modmuls)
+        return (p, q, {
+            "status": status,
+            "variant": "brent",
+            "iters": iters,
+            "gcd_calls": gcd_calls,
+            "gcd_calls_saved": max(iters - gcd_calls, 0),
+            "batch": batch,
+            "restarts": restarts,
+            "x_final": x,
+            "y_final": y,
+            "c": c,
+        })
+
+    while True:
+        y = x_start
+        x = y
+        ys = y
+        r = 1
+        q = 1
+        d = 1
+        k = 0
+
+        if state:
+            # retoma no meio de uma rodada: x já foi fixado e y já avançou r passos
+            x, y, r, k, q = state["x"], state["y"], state["r"], state["k"], state["q"]
+
+        while d == 1:
+            if not state:
+                x = y
+                for _ in range(r):
+                    y = (y * y + c) % n
+                iters += r
+                modmuls += r
+                k = 0
+            state = None
+
+            while k < r and d == 1:
+                if checkpoint is not None and checkpoint.due():
+                    checkpoint.save("rho/brent", x=x, y=y, r=r, k=k, q=q, c=c,
+                                    iters=iters, gcd_calls=gcd_calls, restarts=restarts)
+                ys = y
+                steps = min(batch, r - k)
+                for _ in range(steps):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                iters += steps
+                modmuls += 2 * steps
+                d = math.gcd(q, n)
+                gcd_calls += 1
+                k += steps
+
+                if iters >= next_log:
+                    print(f"   [Pollard Rho/Brent] iters={iters}, gcd_calls={gcd_calls}, r={r}, c={c}")
+                    next_log += progress_interval
+
+                if d == 1 and deadline is not None and deadline.expired():
+                    return finish(None, None, "timeout", x, y)
+
+            if iters >= max_iter and d == 1:
+                return finish(None, None, "max_iter_reached", x, y)
+
+            r *= 2
+
+        if d == n:
+            # Backtracking: o produto acumulado zerou; refaz o bloco um passo por vez
+            while True:
+                ys = (ys * ys + c) % n
+                iters += 1
+                modmuls += 1
+                d = math.gcd(abs(x - ys), n)
+                gcd_calls += 1
+                if d > 1:
+                    break
+
+        if 1 < d < n:
+            return finish(d, n // d, "factor_found", x, ys)
+
+        # Ciclo ruim mesmo passo a passo: restart com outro c (prática comum)
+        if iters >= max_iter:
+            return finish(None, None, "max_iter_reached", x, y)
+        restarts += 1
+        c = random.randrange(1, n - 1)
+
+
+# -------------------- Rho em lanes (NumPy) -----------------------
+
+def _rho_replay(n: int, c: int, x: int, y: int, steps: int) -> int:
+    """Refaz `steps` passos a partir de (x, y) com um gcd por passo (o acumulado colapsou para 0 mod n)."""
+    for _ in range(steps):
+        y = (y * y + c) % n
+        d = math.gcd(x - y, n)
+        if d != 1:
+            return d
+    return n
+
+
+def _rho_scalar(n: int, c: int, x: int, y: int, cnt: int, r: int, steps: int, batch: int, deadline=None) -> Tuple[int, int]:
+    """
+    Continua uma lane com inteiros Python, no mesmo Brent em blocos do motor
+    vetorizado. Devolve (gcd, passos dados); gcd 1 = estourou `steps` ou o prazo.
+    """
+    done = 0
+    while done < steps:
+        y_block = y
+        acc = 1
+        for _ in range(batch):
+            y = (y * y + c) % n
+            acc = acc * (x - y) % n
+        done += batch
+        d = math.gcd(acc, n)
+        if d == n:
+            d = _rho_replay(n, c, x, y_block, batch)
+        if d != 1:
+            return d, done
+        cnt += batch
+        if cnt >= r:
+            x, cnt, r = y, 0, 2 * r
+        if deadline is not None and deadline.expired():
+            break
+    return 1, done
+
+
+def _rho_lanes(
+    work: List[Tuple[int, int]],
+    lanes: int,
+    batch: int,
+    max_iter: int,
+    x_start: int,
+    rng,
+    restarts: int,
+    deadline=None,
+    tail: int = 8,
+) -> Tuple[Dict[int, Tuple[int, int, dict]], dict]:
+    """
+    Motor do rho em lanes: cada lane é um par (n, c) em MontgomeryLanes; todos
+    os n de `work` devem caber na mesma engine.
+
+    - Brent em blocos: a cada passo y <- y^2 + c e acc <- acc·(x - y) em todas
+      as lanes; x só muda na fronteira dos blocos de `batch` passos (quando a
+      lane completa r passos, x <- y e r dobra; r e o contador são por lane)
+    - fim de bloco: gcd(acc, n) vetorizado. 1 < g < n fatora; g == n refaz
+      o bloco da lane com inteiros Python
+    - lane que fatora, estoura max_iter ou falha aposenta; as vagas são
+      preenchidas de uma vez com os próximos (n, c) da fila. Um n fatorado
+      aposenta todas as suas lanes; falhas ganham outro c, até `restarts` vezes
+    - fila vazia: com menos da metade das lanes ativas compacta; com até
+      `tail` lanes termina cada uma com inteiros Python (o custo fixo das
+      chamadas NumPy não compensa para poucas lanes)
+    """
+    queue = deque(work)
+    found: Dict[int, Tuple[int, int, dict]] = {}
+    failures: Dict[int, int] = {}
+    stats = {"lane_steps": 0, "gcd_rounds": 0, "replays": 0, "lanes_used": 0}
+
+    def take(m: int) -> list:
+        jobs = []
+        while queue and len(jobs) < m:
+            n, c = queue.popleft()
+            if n not in found:
+                jobs.append((n, c))
+        return jobs
+
+    def fail(n: int) -> None:
+        failures[n] = failures.get(n, 0) + 1
+        if failures[n] <= restarts:
+            queue.append((n, rng.randrange(1, n - 2)))
+
+    def record(n: int, d: int, c: int, steps: int) -> None:
+        found[n] = (min(d, n // d), max(d, n // d), {
+            "status": "factor_found",
+            "method": "rho_lanes",
+            "c": c,
+            "iters": steps,
+            "engine": ctx.engine,
+        })
+
+    jobs = take(lanes)
+    if not jobs:
+        return found, stats
+    k = len(jobs)
+    ctx = MontgomeryLanes([n for n, _ in jobs])
+    C = np.zeros(k, dtype=np.uint64)       # c na forma da engine
+    c_plain = np.zeros(k, dtype=np.uint64)
+    X = np.zeros(k, dtype=np.uint64)
+    Y = np.zeros(k, dtype=np.uint64)
+    acc = np.zeros(k, dtype=np.uint64)
+    cnt = np.zeros(k, dtype=np.int64)
+    r = np.zeros(k, dtype=np.int64)
+    iters = np.zeros(k, dtype=np.int64)
+    active = np.zeros(k, dtype=bool)
+
+    def start(idx: np.ndarray, jobs: list) -> None:
+        ctx.replace(idx, [n for n, _ in jobs])
+        c_plain[idx] = [c for _, c in jobs]
+        C[idx] = ctx.to_mont(c_plain[idx], idx)
+        X[idx] = Y[idx] = ctx.to_mont([x_start % n for n, _ in jobs], idx)
+        acc[idx] = ctx.one[idx]
+        cnt[idx], r[idx], iters[idx] = 0, batch, 0
+        active[idx] = True
+        stats["lanes_used"] += len(jobs)
+
+    start(np.arange(k), jobs)
+
+    while True:
+        free = np.flatnonzero(~active)
+        if len(free) and queue:
+            jobs = take(len(free))
+            if jobs:
+                start(free[: len(jobs)], jobs)
+        live = np.flatnonzero(active)
+        if not len(live):
+            break
+
+        if not queue and len(live) <= tail:
+            for lane in live:
+                n, c = int(ctx.n[lane]), int(c_plain[lane])
+                active[lane] = False
+                if n in found:
+                    continue
+                x0, y0 = (int(v) for v in ctx.from_mont(np.array([X[lane], Y[lane]]), np.array([lane, lane])))
+                d, steps = _rho_scalar(n, c, x0, y0, int(cnt[lane]), int(r[lane]),
+                                       max_iter - int(iters[lane]), batch, deadline)
+                stats["lane_steps"] += steps
+                if 1 < d < n:
+                    record(n, d, c, int(iters[lane]) + steps)
+                elif deadline is None or not deadline.expired():
+                    fail(n)
+            if deadline is not None and deadline.expired():
+                stats["timeout"] = True
+                break
+            continue
+
+        if not queue and len(live) < k // 2:
+            ctx = MontgomeryLanes([int(v) for v in ctx.n[live]])
+            C, c_plain, X, Y, acc = C[live], c_plain[live], X[live], Y[live], acc[live]
+            cnt, r, iters, active = cnt[live], r[live], iters[live], active[live]
+            k = len(live)
+
+        X_block, Y_block = X, Y
+        for _ in range(batch):
+            Y = ctx.sqr_add(Y, C)
+            acc = ctx.mul(acc, ctx.sub(X, Y))
+        iters += batch
+        stats["lane_steps"] += batch * int(active.sum())
+        stats["gcd_rounds"] += 1
+
+        g = np.gcd(acc, ctx.n)
+        cnt += batch
+        hit = cnt >= r
+        X = np.where(hit, Y, X)
+        r = np.where(hit, 2 * r, r)
+        cnt[hit] = 0
+
+        newly = []
+        for lane in np.flatnonzero(active & ((g > 1) | (iters >= max_iter))):
+            n, c = int(ctx.n[lane]), int(c_plain[lane])
+            d = int(g[lane])
+            if d == n:
+                # o acumulado zerou: refaz o bloco passo a passo com inteiros Python
+                stats["replays"] += 1
+                x0, y0 = (int(v) for v in ctx.from_mont(np.array([X_block[lane], Y_block[lane]]), np.array([lane, lane])))
+                d = _rho_replay(n, c, x0, y0, batch)
+            active[lane] = False
+            if n in found:
+                continue
+            if 1 < d < n:
+                record(n, d, c, int(iters[lane]))
+                newly.append(n)
+            else:
+                fail(n)
+
+        if newly:
+            # outras lanes do mesmo n (c_per_modulus > 1) não têm mais o que fazer
+            active &= ~np.isin(ctx.n, np.array(newly, dtype=np.uint64))
+
+        if deadline is not None and deadline.expired():
+            stats["timeout"] = True
+            break
+
+    return found, stats
+
+
+def _pollard_rho_lanes_single(n: int, c: int, x_start: int, max_iter: int, lanes: int, batch: int, deadline=None, counters=None):
+    """Um n, `lanes` valores de c em paralelo (o primeiro é o c recebido)."""
+    work = [(n, c)] + [(n, random.randrange(1, n - 2)) for _ in range(lanes - 1)]
+    found, stats = _rho_lanes(work, lanes, batch, max_iter, x_start, random, restarts=lanes, deadline=deadline)
+    if counters is not None:
+        counters.add(iters=stats["lane_steps"], gcds=stats["gcd_rounds"] * lanes, modmuls=2 * stats["lane_steps"])
+
+    extra = {
+        "variant": "lanes",
+        "iters": stats["lane_steps"],
+        "lanes": lanes,
+        "lanes_used": stats["lanes_used"],
+        "gcd_rounds": stats["gcd_rounds"],
+        "replays": stats["replays"],
+    }
+    if n in found:
+        p, q, info = found[n]
+        return (p, q, {"status": "factor_found", **extra, "c": info["c"], "engine": info["engine"]})
+    return (None, None, {"status": "timeout" if stats.get("timeout") else "max_iter_reached", **extra})
+
+
+def pollard_rho_corpus_attack(
+    moduli: Iterable[int],
+    lanes: int = 4096,
+    batch: int = 64,
+    c_per_modulus: int = 1,
+    max_iter: int = 100_000,
+    restarts: int = 4,
+    x_start: int = 2,
+    seed: int | None = None,
+    min_wide_lanes: int = 768,
+) -> Dict[int, Tuple[int, int, dict]]:
+    """
+    Pollard rho em lote para muitos módulos pequenos (ataque de corpus,
+    RSABenchmark.run_corpus), para cofatoração em massa.
+
+    - Cada lane é um par (n, c) no ciclo de Brent, em MontgomeryLanes
+      (n < 2^32 em 1 limb, n < 2^64 em 2 limbs); gcd vetorizado a cada
+      `batch` passos
+    - Lanes que terminam são aposentadas e a vaga vai para o próximo módulo
+    - c_per_modulus: quantos c diferentes rodam ao mesmo tempo para cada n
+    - max_iter: passos por lane antes de desistir daquele c; cada n ganha
+      até `restarts` c novos depois de falhas
+    - min_wide_lanes: a engine u64 só compensa com muitas lanes; com menos
+      trabalho que isso os módulos >= 2^32 rodam no Brent escalar
+    - Módulos >= 2^64 ficam de fora (use pollard_rho_attack)
+    - Devolve {n: (p, q, extra)} para os módulos fatorados
+    """
+    rng = random.Random(seed)
+    found: Dict[int, Tuple[int, int, dict]] = {}
+    small, large = [], []
+    for n in sorted(set(moduli)):
+        if n % 2 == 0:
+            if n > 2:
+                found[n] = (2, n // 2, {"status": "factor_found", "method": "rho_lanes", "iters": 0})
+        elif n > 8 and lanes_supported(n):
+            (small if n < 1 << 32 else large).append(n)
+
+    # uma fila por engine: lanes de 1 limb não recebem módulos de 64 bits
+    if len(large) * c_per_modulus < min_wide_lanes:
+        for n in large:
+            for attempt in range(restarts + 1):
+                c = rng.randrange(1, n - 2)
+                d, steps = _rho_scalar(n, c, x_start, x_start, 0, batch, max_iter, batch)
+                if 1 < d < n:
+                    found[n] = (min(d, n // d), max(d, n // d), {
+                        "status": "factor_found", "method": "rho_scalar", "c": c, "iters": steps,
+                    })
+                    break
+        large = []
+
+    for group in (small, large):
+        if not group:
+            continue
+        work = [(n, rng.randrange(1, n - 2)) for n in group for _ in range(c_per_modulus)]
+        group_found, stats = _rho_lanes(work, lanes, batch, max_iter, x_start, rng, restarts)
+        for info in group_found.values():
+            info[2].update({"lanes": stats["lanes_used"], "gcd_rounds": stats["gcd_rounds"], "replays": stats["replays"]})
+        found.update(group_found)
+    return found
 
 
 # -------------------- EXEMPLO RSABenchmark -----------------------
@@ -106,6 +547,8 @@ if __name__ == "__main__":
         c_start=None,          # deixa c aleatório por rodada
         max_iter=10_000_000,
         progress_interval=2000,
+        variant="brent",       # "floyd" para o algoritmo original
+        batch=128,
     )
 
     print(f"{'Bits':4} {'Sucesso':8} {'Tempo (s)':10} Extra")
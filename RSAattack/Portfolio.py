@@ -0,0 +1,200 @@
+import importlib
+import multiprocessing
+import signal
+import threading
+import time
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict
+
+from BaseAttack import RSABenchmark, parse_attack_output
+
+
+def default_portfolio() -> Dict[str, Callable[..., Any]]:
+    """
+    Conjunto padrão de ataques da corrida: Pollard Rho, Pollard p-1,
+    Fermat e Trial Division (wheel).
+    """
+    from Pollard_Rho import pollard_rho_attack
+    from fermat import fermat_factor
+    from DivisaoPorTentativa import trial_division_wheel
+
+    pollard_p_minus_1 = importlib.import_module("pollard-p-1")
+
+    return {
+        "pollard_rho": pollard_rho_attack,
+        "pollard_p_minus_1": pollard_p_minus_1.pollard_p_minus_1_attack,
+        "fermat": fermat_factor,
+        "trial_division_wheel": trial_division_wheel,
+    }
+
+
+def _raise_on_sigterm(signum, frame):
+    raise SystemExit(128 + signum)
+
+
+def _portfolio_worker(conn, attack_func: Callable[..., Any], n: int, e: int, kwargs: dict) -> None:
+    # o tratador de SIGTERM da corrida vem junto no fork: aqui o terminate() volta a só matar
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    start = time.perf_counter()
+    try:
+        out = attack_func(n, e, **kwargs)
+        outcome = ("ok", out, time.perf_counter() - start)
+    except KeyboardInterrupt:
+        outcome = ("interrupted", None, time.perf_counter() - start)
+    except Exception as ex:
+        outcome = ("error", str(ex), time.perf_counter() - start)
+
+    try:
+        conn.send(outcome)
+    finally:
+        conn.close()
+
+
+def portfolio_attack(
+    n: int,
+    e: int,
+    attacks: Dict[str, Callable[..., Any]] | None = None,
+    attack_kwargs: Dict[str, dict] | None = None,
+    timeout_seconds: float | None = None,
+    deadline=None,
+):
+    """
+    Corrida de ataques (portfolio), compatível com a interface do RSABenchmark.
+
+    - Inicia cada ataque de `attacks` em um processo próprio, todos sobre o mesmo n
+    - O primeiro (p, q) com p * q == n vence; os outros processos são encerrados
+    - `attack_kwargs[nome]` são os kwargs repassados ao ataque `nome`
+    - `timeout_seconds` limita o tempo total da corrida (com `deadline`, vale
+      o que acabar primeiro)
+    - Registra o vencedor e quanto tempo cada método rodou
+    - SIGTERM (o harness mata o processo do portfolio com terminate()) vira
+      SystemExit enquanto a corrida roda, então os processos filhos são
+      encerrados antes de o portfolio sair, em vez de ficarem órfãos
+    """
+    if attacks is None:
+        attacks = default_portfolio()
+    attack_kwargs = attack_kwargs or {}
+    if deadline is not None and deadline.remaining() is not None:
+        budget = deadline.remaining()
+        timeout_seconds = budget if timeout_seconds is None else min(timeout_seconds, budget)
+
+    ctx = multiprocessing.get_context()
+    running: Dict[Any, tuple] = {}  # conexão -> (nome, processo, início)
+    method_times: Dict[str, float] = {}
+    method_status: Dict[str, str] = {}
+    winner = None
+    p = q = None
+    winner_extra: dict = {}
+
+    race_start = time.perf_counter()
+
+    # signal.signal só vale na thread principal; fora dela fica o comportamento padrão
+    handle_sigterm = threading.current_thread() is threading.main_thread()
+    if handle_sigterm:
+        previous_sigterm = signal.signal(signal.SIGTERM, _raise_on_sigterm)
+
+    try:
+        for name, attack_func in attacks.items():
+            recv_conn, send_conn = ctx.Pipe(duplex=False)
+            proc = ctx.Process(
+                target=_portfolio_worker,
+                args=(send_conn, attack_func, n, e, attack_kwargs.get(name, {})),
+            )
+            proc.start()
+            running[recv_conn] = (name, proc, time.perf_counter())
+            send_conn.close()
+
+        while running and winner is None:
+            remaining = None
+            if timeout_seconds is not None:
+                remaining = timeout_seconds - (time.perf_counter() - race_start)
+                if remaining <= 0:
+                    break
+
+            for conn in wait(list(running), timeout=remaining):
+                name, proc, _ = running.pop(conn)
+                try:
+                    status, payload, elapsed = conn.recv()
+                except EOFError:
+                    status, payload, elapsed = ("error", f"exitcode={proc.exitcode}", 0.0)
+                conn.close()
+                proc.join()
+
+                method_times[name] = elapsed
+                if status != "ok":
+                    method_status[name] = status
+                    continue
+
+                cand_p, cand_q, extra = parse_attack_output(payload)
+                if cand_p is not None and cand_q is not None and cand_p * cand_q == n and 1 < cand_p < n:
+                    if winner is None:
+                        winner = name
+                        p, q, winner_extra = cand_p, cand_q, extra
+                        method_status[name] = "won"
+                    else:
+                        method_status[name] = "factor_found"
+                else:
+                    method_status[name] = "failed"
+    finally:
+        # Cancela os ataques que ainda estão rodando (um segundo SIGTERM não interrompe a limpeza)
+        if handle_sigterm:
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        cancel_status = "cancelled" if winner is not None else "timeout"
+        for conn, (name, proc, started) in running.items():
+            proc.terminate()
+            proc.join()
+            conn.close()
+            method_times[name] = time.perf_counter() - started
+            method_status[name] = cancel_status
+        if handle_sigterm:
+            # None: o tratador anterior não foi instalado pelo Python
+            signal.signal(signal.SIGTERM, signal.SIG_DFL if previous_sigterm is None else previous_sigterm)
+
+    if winner is not None:
+        status = "factor_found"
+    elif "timeout" in method_status.values():
+        status = "timeout"
+    else:
+        status = "no_factor"
+
+    extra = {
+        "status": status,
+        "winner": winner,
+        "method_times": method_times,
+        "method_status": method_status,
+        "race_seconds": time.perf_counter() - race_start,
+    }
+    if winner is not None:
+        extra["winner_extra"] = winner_extra
+
+    return (p, q, extra)
+
+
+if __name__ == "__main__":
+    bench = RSABenchmark(
+        key_sizes_bits=(32, 48, 64, 80, 96),
+        seed=42,
+    )
+
+    results = bench.run(
+        portfolio_attack,
+        attack_kwargs={
+            "pollard_rho": {"progress_interval": 10_000_000},
+            "pollard_p_minus_1": {"progress_interval": 10_000_000},
+        },
+        timeout_seconds=60,
+    )
+
+    print(f"{'Bits':4} {'Sucesso':8} {'Tempo (s)':10} {'Vencedor':22} Tempos por método")
+    print("-" * 90)
+    for r in results:
+        times = {k: round(v, 4) for k, v in r.extra.get("method_times", {}).items()}
+        print(
+            f"{r.key_bits:4} "
+            f"{str(r.success):8} "
+            f"{r.elapsed_seconds:10.6f} "
+            f"{str(r.extra.get('winner')):22} "
+            f"{times}"
+        )
+
+    bench.print_final_report(results)
@@ -0,0 +1,515 @@
+from BaseAttack import RSABenchmark
+from sieve import primes_up_to
+import math
+import random
+import time
+
+import numpy as np
+
+# Parâmetros por tamanho de n (bits): (tamanho da base de fatores, M, multiplicador do primo grande)
+# O intervalo de peneira de cada polinômio é x em [-M, M).
+SIQS_PARAMS = [
+    (64, 80, 8192, 30),
+    (80, 120, 8192, 30),
+    (100, 200, 16384, 40),
+    (120, 300, 32768, 40),
+    (140, 500, 65536, 50),
+    (160, 1000, 65536, 60),
+    (180, 1600, 65536, 70),
+    (200, 2400, 98304, 80),
+    (220, 3400, 131072, 90),
+    (240, 4600, 131072, 100),
+    (260, 6000, 196608, 110),
+    (280, 8000, 196608, 120),
+    (300, 10000, 262144, 128),
+]
+
+# Primos abaixo deste valor não entram na peneira (custam caro e contribuem pouco);
+# a perda de log é compensada no limiar.
+SMALL_PRIME_SKIP = 30
+
+# Relações extras além do número de colunas da matriz
+EXTRA_RELATIONS = 30
+
+
+def _params_for(bits: int):
+    for max_bits, fb_size, M, lp_mult in SIQS_PARAMS:
+        if bits <= max_bits:
+            return fb_size, M, lp_mult
+    return SIQS_PARAMS[-1][1:]
+
+
+def _sqrt_mod_prime(a: int, p: int) -> int:
+    """Raiz quadrada modular (Tonelli-Shanks). Assume que a é resíduo quadrático mod p."""
+    a %= p
+    if p == 2 or a == 0:
+        return a
+    if p % 4 == 3:
+        return pow(a, (p + 1) // 4, p)
+
+    q, s = p - 1, 0
+    while q % 2 == 0:
+        q //= 2
+        s += 1
+    z = 2
+    while pow(z, (p - 1) // 2, p) != p - 1:
+        z += 1
+
+    m, c, t, r = s, pow(z, q, p), pow(a, q, p), pow(a, (q + 1) // 2, p)
+    while t != 1:
+        i, t2 = 0, t
+        while t2 != 1:
+            t2 = t2 * t2 % p
+            i += 1
+        b = pow(c, 1 << (m - i - 1), p)
+        m, c, t, r = i, b * b % p, t * b * b % p, r * b % p
+    return r
+
+
+# ------------------------------
+#  Base de fatores
+# ------------------------------
+
+class FactorBase:
+    """
+    Primos p (com 2) tais que n é resíduo quadrático mod p, com as raízes
+    sqrt(n) mod p e os logaritmos usados na peneira, em arrays NumPy.
+    """
+
+    def __init__(self, n: int, size: int):
+        primes = [2]
+        roots = [n % 2]
+        bound = max(64, int(size * math.log(size + 2) * 3))
+        while len(primes) < size:
+            for p in primes_up_to(bound):
+                if p <= primes[-1]:
+                    continue
+                if pow(n % p, (p - 1) // 2, p) == 1:
+                    primes.append(p)
+                    roots.append(_sqrt_mod_prime(n, p))
+                    if len(primes) == size:
+                        break
+            bound *= 2
+
+        self.primes = primes
+        self.p = np.array(primes, dtype=np.int64)
+        self.t = np.array(roots, dtype=np.int64)
+        self.logp = np.round(np.log2(self.p)).astype(np.int16)
+        self.pmax = primes[-1]
+        # índice do primeiro primo peneirado
+        self.sieve_start = next(i for i, p in enumerate(primes) if p >= SMALL_PRIME_SKIP or i == len(primes) - 1)
+
+    def __len__(self) -> int:
+        return len(self.primes)
+
+
+# ------------------------------
+#  Geração de polinômios (self-initializing)
+# ------------------------------
+
+class _PolyFamily:
+    """
+    Um coeficiente A = q_1 ... q_s (primos da base) e as 2^(s-1) escolhas de b
+    com b^2 == n (mod A), percorridas em código de Gray.
+    """
+
+    def __init__(self, n: int, fb: FactorBase, A: int, q_idx: list):
+        self.n = n
+        self.A = A
+        self.q_idx = q_idx
+        self.s = len(q_idx)
+
+        P = fb.primes
+        Bs = []
+        for j in q_idx:
+            q = P[j]
+            a_q = A // q
+            gamma = fb.t[j].item() * pow(a_q % q, -1, q) % q
+            if gamma > q // 2:
+                gamma = q - gamma
+            Bs.append(a_q * gamma)
+        self.Bs = Bs
+        self.b = sum(Bs)
+
+        # A^-1 mod p e 2*B_l*A^-1 mod p para todos os primos que não dividem A
+        ainv = np.zeros(len(P), dtype=np.int64)
+        for i, p in enumerate(P):
+            if A % p:
+                ainv[i] = pow(A % p, -1, p)
+        self.valid = ainv != 0
+        self.ainv = ainv
+        self.bainv2 = [
+            (2 * np.array([B % p for p in P], dtype=np.int64) * ainv) % fb.p
+            for B in Bs
+        ]
+
+        b_mod = np.array([self.b % p for p in P], dtype=np.int64)
+        self.soln1 = (ainv * (fb.t - b_mod)) % fb.p
+        self.soln2 = (ainv * (-fb.t - b_mod)) % fb.p
+        self.index = 0
+
+    def __len__(self) -> int:
+        return 1 << (self.s - 1)
+
+    def advance(self, fb: FactorBase) -> None:
+        """Passa para o próximo b (código de Gray) e atualiza as raízes em O(1) por primo."""
+        self.index += 1
+        i = self.index
+        v = (i & -i).bit_length()  # 2^v divide exatamente 2i
+        e = -1 if (-(-i // (1 << v))) % 2 else 1  # (-1)^ceil(i / 2^v)
+        self.b += 2 * e * self.Bs[v - 1]
+        delta = self.bainv2[v - 1]
+        self.soln1 = (self.soln1 - e * delta) % fb.p
+        self.soln2 = (self.soln2 - e * delta) % fb.p
+
+    @property
+    def c(self) -> int:
+        return (self.b * self.b - self.n) // self.A
+
+
+def _choose_A(n: int, fb: FactorBase, M: int, used: set, rng: random.Random):
+    """
+    Escolhe A ~ sqrt(2n)/M como produto de s primos da base: s-1 primos
+    sorteados perto de target^(1/s) e o último ajustado para aproximar o alvo.
+    """
+    target = math.isqrt(2 * n) // M
+    log_target = math.log(max(target, 2))
+
+    P = fb.primes
+    lo = max(fb.sieve_start, len(P) // 8, 2)
+    # menor s que deixa target^(1/s) abaixo do primo no 3/4 da base
+    s = max(1, math.ceil(log_target / math.log(P[len(P) * 3 // 4])))
+    if s == 1:
+        # alvo pequeno: um único primo da base próximo de target
+        candidates = [j for j in range(1, len(P)) if (j,) not in used]
+        j = min(candidates, key=lambda j: abs(P[j] - target))
+        used.add((j,))
+        return P[j], [j]
+
+    # janela de índices em torno do primo ideal target^(1/s)
+    ideal = math.exp(log_target / s)
+    center = min(range(lo, len(P)), key=lambda j: abs(P[j] - ideal))
+    width = max(4 * s, 20)
+    window = range(max(lo, center - width), min(len(P), center + width + 1))
+
+    best_key = None
+    best_err = None
+    for _ in range(200):
+        chosen = rng.sample(window, s - 1)
+        partial = 1
+        for j in chosen:
+            partial *= P[j]
+        want = target / partial
+        last = min(
+            (j for j in range(lo, len(P)) if j not in chosen),
+            key=lambda j: abs(P[j] - want),
+        )
+        key = tuple(sorted(chosen + [last]))
+        if key in used:
+            continue
+        err = abs(math.log(partial * P[last]) - log_target)
+        if best_err is None or err < best_err:
+            best_key, best_err = key, err
+        if err < 0.7:  # dentro de um fator ~2 do alvo
+            break
+
+    if best_key is None:
+        raise RuntimeError("não foi possível gerar um novo coeficiente A")
+    used.add(best_key)
+    A = 1
+    for j in best_key:
+        A *= P[j]
+    return A, list(best_key)
+
+
+# ------------------------------
+#  Álgebra linear em GF(2)
+# ------------------------------
+
+def _remove_singletons(relations: list, ncols: int) -> list:
+    """
+    Eliminação estruturada: descarta relações que contêm um primo com expoente
+    ímpar em só uma relação (nunca pode entrar em uma dependência), repetidamente.
+    """
+    rels = relations
+    while True:
+        counts = [0] * ncols
+        for _, vec, _ in rels:
+            for col, exp in vec.items():
+                if exp & 1:
+                    counts[col] += 1
+        kept = [r for r in rels if all(counts[col] != 1 or not exp & 1 for col, exp in r[1].items())]
+        if len(kept) == len(rels):
+            return kept
+        rels = kept
+
+
+def _gf2_dependencies(relations: list, ncols: int) -> list:
+    """
+    Eliminação gaussiana em GF(2) com linhas empacotadas em bits (int do Python).
+    Devolve máscaras de bits, cada uma indicando um subconjunto de relações cuja
+    soma dos vetores de expoentes é par.
+    """
+    rows = []
+    for _, vec, _ in relations:
+        bits = 0
+        for col, exp in vec.items():
+            if exp & 1:
+                bits |= 1 << col
+        rows.append(bits)
+    history = [1 << i for i in range(len(rows))]
+    pivoted = [False] * len(rows)
+
+    for col in range(ncols):
+        mask = 1 << col
+        pivot = -1
+        for r in range(len(rows)):
+            if not pivoted[r] and rows[r] & mask:
+                pivot = r
+                break
+        if pivot < 0:
+            continue
+        pivoted[pivot] = True
+        prow, phist = rows[pivot], history[pivot]
+        for r in range(len(rows)):
+            if r != pivot and rows[r] & mask:
+                rows[r] ^= prow
+                history[r] ^= phist
+
+    return [history[r] for r in range(len(rows)) if not pivoted[r] and rows[r] == 0]
+
+
+def _try_dependency(n: int, relations: list, dep: int, fb: FactorBase):
+    X = 1
+    exps: dict = {}
+    extra = 1
+    i = 0
+    while dep:
+        if dep & 1:
+            Y, vec, large = relations[i]
+            X = X * Y % n
+            extra = extra * large % n
+            for col, e in vec.items():
+                exps[col] = exps.get(col, 0) + e
+        dep >>= 1
+        i += 1
+
+    Yr = extra
+    for col, e in exps.items():
+        if col == 0:
+            continue  # sinal: expoente par, (-1)^e = 1
+        Yr = Yr * pow(fb.primes[col - 1], e // 2, n) % n
+
+    d = math.gcd(X - Yr, n)
+    return d if 1 < d < n else None
+
+
+# ------------------------------
+#  Ataque
+# ------------------------------
+
+def siqs_attack(
+    n: int,
+    e: int,
+    fb_size: int | None = None,
+    M: int | None = None,
+    lp_mult: int | None = None,
+    threshold_fudge: float = 12.0,
+    seed: int | None = None,
+    progress_interval: int = 200,
+    deadline=None,
+):
+    """
+    Crivo quadrático auto-inicializável (SIQS), compatível com a interface do RSABenchmark.
+
+    - Base de fatores com raízes sqrt(n) mod p (Tonelli-Shanks)
+    - Polinômios (Ax + b)^2 - n com A = q_1...q_s e 2^(s-1) valores de b por A
+    - Peneira de logaritmos em um array NumPy int16 por polinômio
+    - Variação de primo grande (relações parciais combinadas pelo primo grande)
+    - Eliminação estruturada + gaussiana em GF(2) com linhas empacotadas em bits
+    - deadline: checado a cada polinômio; estourado devolve status="timeout"
+    """
+    start = time.perf_counter()
+    bits = n.bit_length()
+    rng = random.Random(seed)
+
+    def finish(p, q, status, **info):
+        extra = {"status": status, "method": "siqs"}
+        extra.update(info)
+        extra["total_seconds"] = round(time.perf_counter() - start, 6)
+        return (p, q, extra)
+
+    r = math.isqrt(n)
+    if r * r == n:
+        return finish(r, r, "factor_found", perfect_square=True)
+
+    default_fb, default_M, default_lp = _params_for(bits)
+    fb_size = fb_size or default_fb
+    M = M or default_M
+    lp_mult = lp_mult or default_lp
+
+    fb = FactorBase(n, fb_size)
+    for p in primes_up_to(fb.pmax):
+        if n % p == 0 and p < n:
+            return finish(p, n // p, "factor_found", found_by="trial_division")
+
+    ncols = len(fb) + 1  # coluna 0 = sinal
+    needed = ncols + EXTRA_RELATIONS
+    large_bound = min(fb.pmax * lp_mult, fb.pmax * fb.pmax)
+
+    # limiar: log2 de |Q(x)| típico menos a folga do primo grande e dos primos pequenos pulados
+    log_q = math.log2(M) + bits / 2 - 0.5
+    threshold = int(log_q - math.log2(large_bound) - threshold_fudge)
+
+    relations: list = []  # (Y, {coluna: expoente}, fator extra da raiz)
+    partials: dict = {}   # primo grande -> (Y, vec)
+    used_A: set = set()
+    polys = 0
+    partial_combined = 0
+    candidates_checked = 0
+
+    P = fb.primes
+    two_M = 2 * M
+    logp = fb.logp.tolist()
+    sieve = np.zeros(two_M, dtype=np.int16)
+
+    # primos maiores que 2M acertam no máximo uma posição por raiz: tratados em bloco
+    big_start = next((i for i in range(fb.sieve_start, len(fb)) if P[i] >= two_M), len(fb))
+    log_big = fb.logp[big_start:]
+
+    while len(relations) < needed:
+        A, q_idx = _choose_A(n, fb, M, used_A, rng)
+        family = _PolyFamily(n, fb, A, q_idx)
+        q_set = set(q_idx)
+        # primos médios peneirados fatia a fatia (os fatores de A ficam de fora)
+        mid_idx = [i for i in range(fb.sieve_start, big_start) if i not in q_set]
+
+        for k in range(len(family)):
+            if k:
+                family.advance(fb)
+            polys += 1
+            b = family.b
+            c = family.c
+
+            s1 = (family.soln1 + M) % fb.p
+            s2 = (family.soln2 + M) % fb.p
+
+            sieve.fill(0)
+            r1s = s1.tolist()
+            r2s = s2.tolist()
+            for i in mid_idx:
+                p = P[i]
+                lg = logp[i]
+                r1 = r1s[i]
+                r2 = r2s[i]
+                sieve[r1::p] += lg
+                if r2 != r1:
+                    sieve[r2::p] += lg
+
+            if big_start < len(fb):
+                valid_big = family.valid[big_start:]
+                for roots in (s1[big_start:], s2[big_start:]):
+                    hit = valid_big & (roots < two_M)
+                    np.add.at(sieve, roots[hit], log_big[hit])
+
+            for idx in np.nonzero(sieve >= threshold)[0]:
+                candidates_checked += 1
+                x = int(idx) - M
+                Q = (A * x + 2 * b) * x + c
+                vec: dict = {}
+                if Q < 0:
+                    vec[0] = 1
+                    Q = -Q
+                if Q == 0:
+                    continue
+
+                # primos que dividem Q(x): raiz coincide com x mod p
+                mask = (((idx - s1) % fb.p) == 0) | (((idx - s2) % fb.p) == 0)
+                mask[0] = True
+                for j in q_idx:
+                    mask[j] = True
+                for j in np.nonzero(mask)[0]:
+                    j = int(j)
+                    p = P[j]
+                    exp = 0
+                    while Q % p == 0:
+                        Q //= p
+                        exp += 1
+                    if j in q_set:
+                        exp += 1  # fator de A em A * Q(x)
+                    if exp:
+                        vec[j + 1] = exp
+
+                Y = (A * x + b) % n
+                if Q == 1:
+                    relations.append((Y, vec, 1))
+                elif Q < large_bound:
+                    if Q in partials:
+                        Y2, vec2 = partials.pop(Q)
+                        merged = dict(vec)
+                        for col, ex in vec2.items():
+                            merged[col] = merged.get(col, 0) + ex
+                        relations.append((Y * Y2 % n, merged, Q))
+                        partial_combined += 1
+                    else:
+                        partials[Q] = (Y, vec)
+
+            if progress_interval and polys % progress_interval == 0:
+                print(
+                    f"   [SIQS] polinômios={polys}, relações={len(relations)}/{needed}, "
+                    f"parciais={len(partials)}, combinadas={partial_combined}"
+                )
+
+            if len(relations) >= needed:
+                break
+
+            if deadline is not None and deadline.expired():
+                return finish(None, None, "timeout", polynomials=polys, relations=len(relations),
+                              partial_combined=partial_combined)
+
+    sieve_seconds = time.perf_counter() - start
+
+    rels = _remove_singletons(relations, ncols)
+    deps = _gf2_dependencies(rels, ncols)
+
+    info = dict(
+        fb_size=len(fb),
+        M=M,
+        polynomials=polys,
+        relations=len(relations),
+        partial_combined=partial_combined,
+        candidates=candidates_checked,
+        dependencies=len(deps),
+        sieve_seconds=round(sieve_seconds, 6),
+    )
+
+    for dep in deps:
+        d = _try_dependency(n, rels, dep, fb)
+        if d:
+            return finish(d, n // d, "factor_found", **info)
+
+    return finish(None, None, "no_factor", **info)
+
+
+if __name__ == "__main__":
+    bench = RSABenchmark(
+        key_sizes_bits=(64, 96, 128, 160, 200),
+        seed=42,
+    )
+
+    results = bench.run(
+        siqs_attack,
+        progress_interval=500,
+    )
+
+    print(f"{'Bits':4} {'Sucesso':8} {'Tempo (s)':10} Extra")
+    print("-" * 60)
+    for r in results:
+        print(
+            f"{r.key_bits:4} "
+            f"{str(r.success):8} "
+            f"{r.elapsed_seconds:10.6f} "
+            f"{r.extra}"
+        )
+
+    bench.print_final_report(results)
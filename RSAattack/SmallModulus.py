@@ -0,0 +1,298 @@
+from BaseAttack import RSABenchmark
+from intmath import QR_MOD_64, QR_MOD_45045, icbrt, square_root
+from sieve import primes_up_to
+from array import array
+from typing import Dict
+import math
+
+# Multiplicador do Hart: com 480 = 2^5·3·5, s^2 - 480·i·n é quadrado com mais frequência
+HART_MULTIPLIER = 480
+
+# Multiplicadores do SQUFOF (Gower & Wagstaff): produtos livres de quadrados de 3, 5, 7 e 11
+SQUFOF_MULTIPLIERS = (
+    1, 3, 5, 7, 11, 3 * 5, 3 * 7, 3 * 11, 5 * 7, 5 * 11, 7 * 11,
+    3 * 5 * 7, 3 * 5 * 11, 3 * 7 * 11, 5 * 7 * 11, 3 * 5 * 7 * 11,
+)
+
+
+# Até 64 bits, sqrt(k·n) em float erra bem menos que 1: dá para trocar o isqrt
+# por uma multiplicação com sqrt(k) tabelado
+FLOAT_SAFE_BITS = 64
+
+_sqrt_tables: Dict[int, array] = {}
+
+
+def _sqrt_table(c: int, size: int) -> array:
+    """
+    Tabela t[i] = sqrt(c·i), compartilhada entre chamadas e estendida (dobrando)
+    até ter pelo menos `size` entradas.
+    """
+    table = _sqrt_tables.get(c)
+    if table is None:
+        table = _sqrt_tables[c] = array("d", [0.0])
+    if len(table) < size:
+        start = len(table)
+        table.extend(math.sqrt(c * i) for i in range(start, max(size, 2 * start)))
+    return table
+
+
+def _found(n: int, d: int, method: str, iters: int, **info):
+    p, q = min(d, n // d), max(d, n // d)
+    return (p, q, {"status": "factor_found", "method": method, "iters": iters, **info})
+
+
+def _trivial_factor(n: int) -> int:
+    """Fator de n par ou quadrado perfeito (casos em que os métodos abaixo falham), senão 0."""
+    if n % 2 == 0:
+        return 2
+    r = square_root(n)
+    return r if r > 1 else 0
+
+
+def _trial_division(n: int, limit: int) -> int:
+    """Menor primo <= limit que divide n, ou 0."""
+    for p in primes_up_to(limit):
+        if n % p == 0:
+            return p
+    return 0
+
+
+def hart_olf_attack(
+    n: int,
+    e: int,
+    multiplier: int = HART_MULTIPLIER,
+    max_iter: int | None = None,
+    deadline=None,
+):
+    """
+    One Line Factoring de Hart, compatível com a interface do RSABenchmark.
+
+    - Para i = 1, 2, ...: s = ceil(sqrt(M·i·n)) e m = s^2 - M·i·n; quando m = t^2,
+      gcd(s - t, n) é um fator
+    - n de até 64 bits: s vem de sqrt(M·i) tabelado vezes sqrt(n) em float
+      (um s uma unidade acima ainda dá uma congruência válida)
+    - max_iter padrão: n^(1/3). O OLF é heurístico: com o multiplicador fixo
+      ele pode não achar fator nenhum nesse limite (p e q muito próximos,
+      p.ex. n = 1000763 · 1001587), então ao fim do laço roda o Lehman, que
+      com a sua divisão por tentativa até n^(1/3) sempre fatora n composto;
+      extra["fallback"] == "lehman" e extra["hart_iters"] marcam esse caso
+    - deadline: prazo cooperativo (vale também para o Lehman); estourado
+      devolve status="timeout"
+    """
+    d = _trivial_factor(n)
+    if d:
+        return _found(n, d, "trivial", 0)
+
+    cbrt = icbrt(n) + 1
+    max_iter = max_iter or cbrt
+    use_float = n.bit_length() <= FLOAT_SAFE_BITS
+    sqrt_n = math.sqrt(n)
+    table = _sqrt_table(multiplier, 1024)
+    step = multiplier * n
+    ikn = 0
+
+    for i in range(1, max_iter + 1):
+        ikn += step
+        if use_float:
+            if i >= len(table):
+                table = _sqrt_table(multiplier, i + 1)
+            s = int(table[i] * sqrt_n) + 1
+            m = s * s - ikn
+            if m < 0:
+                s += 1
+                m = s * s - ikn
+        else:
+            s = math.isqrt(ikn) + 1
+            m = s * s - ikn
+        # com M = 480, m quase sempre é quadrado mod 64: o filtro útil é o mod 63·65·11
+        if QR_MOD_45045[m % 45045]:
+            t = math.isqrt(m)
+            if t * t == m:
+                d = math.gcd(s - t, n)
+                if 1 < d < n:
+                    return _found(n, d, "hart", i, multiplier=multiplier)
+        if deadline is not None and deadline.tick():
+            return (None, None, {"status": "timeout", "method": "hart", "iters": i})
+
+    p, q, extra = lehman_attack(n, e, deadline=deadline)
+    extra.update(fallback="lehman", hart_iters=max_iter)
+    return (p, q, extra)
+
+
+def lehman_attack(n: int, e: int, max_k: int | None = None, deadline=None):
+    """
+    Método de Lehman, compatível com a interface do RSABenchmark.
+
+    - Para k = 1 .. n^(1/3), procura a em [sqrt(4kn), sqrt(4kn) + n^(1/6) / (4·sqrt(k))]
+      com a^2 - 4kn = b^2; então gcd(a + b, n) é um fator
+    - Paridade: k par -> a ímpar; k ímpar -> a ≡ k + n (mod 4)
+    - n de até 64 bits: os limites do intervalo vêm de sqrt(4k) tabelado (um a
+      a mais nas pontas só custa um teste de quadrado)
+    - A divisão por tentativa até n^(1/3), necessária para a garantia do
+      método, fica por último: chaves RSA quase nunca têm fator tão pequeno
+    - deadline: prazo cooperativo; estourado devolve status="timeout"
+    """
+    d = _trivial_factor(n)
+    if d:
+        return _found(n, d, "trivial", 0)
+
+    cbrt = icbrt(n) + 1
+    max_k = max_k or cbrt
+    use_float = n.bit_length() <= FLOAT_SAFE_BITS
+    sqrt_n = math.sqrt(n)
+    half_sixth_root = n ** (1 / 6) / 2  # x = n^(1/6) / (4·sqrt(k)) = half_sixth_root / sqrt(4k)
+    table = _sqrt_table(4, 1024)
+    four_n = 4 * n
+    four_kn = 0
+    iters = 0
+
+    for k in range(1, max_k + 1):
+        four_kn += four_n
+        if k >= len(table):
+            table = _sqrt_table(4, k + 1)
+        x = half_sixth_root / table[k]
+        if use_float:
+            root = table[k] * sqrt_n
+            a = int(root)
+            a_max = int(root + x) + 1
+        else:
+            root = math.isqrt(four_kn)
+            a = root if root * root == four_kn else root + 1
+            # a_max = floor(sqrt(4kn) + x), sem perder a parte fracionária de sqrt(4kn)
+            a_max = root + int(x)
+            if (a_max + 1) ** 2 - four_kn <= 2 * (a_max + 1) * x - x * x:
+                a_max += 1
+
+        if k & 1:
+            a += (k + n - a) & 3
+            a_step = 4
+        else:
+            a |= 1
+            a_step = 2
+
+        scanned = iters
+        while a <= a_max:
+            iters += 1
+            b2 = a * a - four_kn
+            if b2 >= 0 and QR_MOD_45045[b2 % 45045]:
+                b = math.isqrt(b2)
+                if b * b == b2:
+                    d = math.gcd(a + b, n)
+                    if 1 < d < n:
+                        return _found(n, d, "lehman", iters, k=k)
+            a += a_step
+
+        if deadline is not None and deadline.tick(iters - scanned + 1):
+            return (None, None, {"status": "timeout", "method": "lehman", "iters": iters, "k": k})
+
+    d = _trial_division(n, cbrt)
+    if d and d < n:
+        return _found(n, d, "trial_division", iters)
+    return (None, None, {"status": "no_factor", "method": "lehman", "iters": iters})
+
+
+def _squfof(n: int, k: int, max_iter: int, deadline):
+    """
+    Uma rodada do SQUFOF com multiplicador k.
+
+    Devolve (fator ou 0, iterações, estourou_prazo).
+    """
+    kn = k * n
+    p0 = math.isqrt(kn)
+    q = kn - p0 * p0
+    if q == 0:
+        d = math.gcd(n, p0)
+        return (d if 1 < d < n else 0, 0, False)
+
+    # forma direta: procura Q_i quadrado em um índice i par
+    p_prev, p, q_prev = p0, p0, 1
+    r = -1
+    i = 1
+    while i < max_iter:
+        b = (p0 + p) // q
+        p = b * q - p
+        q, q_prev = q_prev + b * (p_prev - p), q
+        p_prev = p
+        i += 1
+        if not i & 1 and (QR_MOD_64 >> (q & 63)) & 1:
+            r = square_root(q)
+            if r >= 0:
+                break
+        if deadline is not None and deadline.tick():
+            return (0, i, True)
+    if r <= 0:
+        return (0, i, False)
+
+    # forma reversa: a partir de sqrt(Q_i) até P estabilizar
+    b = (p0 - p) // r
+    p = b * r + p
+    q_prev = r
+    q = (kn - p * p) // q_prev
+    while True:
+        b = (p0 + p) // q
+        p_prev = p
+        p = b * q - p
+        q, q_prev = q_prev + b * (p_prev - p), q
+        i += 1
+        if p == p_prev:
+            break
+        if deadline is not None and deadline.tick():
+            return (0, i, True)
+
+    d = math.gcd(n, q_prev)
+    return (d if 1 < d < n else 0, i, False)
+
+
+def squfof_attack(
+    n: int,
+    e: int,
+    multipliers=SQUFOF_MULTIPLIERS,
+    max_iter: int | None = None,
+    deadline=None,
+):
+    """
+    SQUFOF de Shanks (fatoração por formas quadradas), compatível com a
+    interface do RSABenchmark.
+
+    - Tenta cada multiplicador k de `multipliers` até achar um fator
+    - max_iter por multiplicador: padrão 3·2·sqrt(2·sqrt(n)) (~ n^(1/4))
+    - Todos os valores ficam em ~sqrt(k·n): para n de 64 bits são inteiros
+      de uma palavra, então cada iteração custa microssegundos
+    - Se nenhum multiplicador resolve, divisão por tentativa até n^(1/3)
+    - deadline: prazo cooperativo; estourado devolve status="timeout"
+    """
+    d = _trivial_factor(n)
+    if d:
+        return _found(n, d, "trivial", 0)
+
+    max_iter = max_iter or 6 * math.isqrt(2 * math.isqrt(n)) + 16
+    total = 0
+    for k in multipliers:
+        d = math.gcd(n, k)
+        if 1 < d < n:
+            return _found(n, d, "trial_division", total)
+        d, iters, expired = _squfof(n, k, max_iter, deadline)
+        total += iters
+        if d:
+            return _found(n, d, "squfof", total, multiplier=k)
+        if expired:
+            return (None, None, {"status": "timeout", "method": "squfof", "iters": total})
+
+    d = _trial_division(n, icbrt(n) + 1)
+    if d and d < n:
+        return _found(n, d, "trial_division", total)
+    return (None, None, {"status": "no_factor", "method": "squfof", "iters": total})
+
+
+if __name__ == "__main__":
+    bench = RSABenchmark(
+        key_sizes_bits=(16, 20, 24, 28, 32, 40, 48, 56, 64),
+        seed=42,
+        keys_per_size=20,
+        quiet=True,
+    )
+
+    for attack in (hart_olf_attack, lehman_attack, squfof_attack):
+        print(f"\n=== {attack.__name__} ===")
+        results = bench.run(attack, repeats=3, warmup=1, timeout_seconds=30)
+        bench.print_final_report(results)
@@ -0,0 +1,348 @@
+from BaseAttack import RSABenchmark
+from intmath import square_root
+from lattice import lll_reduce
+from typing import Dict, Iterator, List, Tuple
+import math
+
+# Polinômio em x, y: {(grau_x, grau_y): coeficiente}
+Poly = Dict[Tuple[int, int], int]
+
+
+# ------------------------------
+#  Wiener (frações contínuas)
+# ------------------------------
+
+def continued_fraction(num: int, den: int) -> Iterator[int]:
+    """Quocientes parciais de num/den, gerados sob demanda."""
+    while den:
+        a = num // den
+        yield a
+        num, den = den, num - a * den
+
+
+def convergents(num: int, den: int) -> Iterator[Tuple[int, int]]:
+    """Convergentes h/k de num/den, em ordem, sem materializar a fração contínua."""
+    h_prev, h = 0, 1
+    k_prev, k = 1, 0
+    for a in continued_fraction(num, den):
+        h_prev, h = h, a * h + h_prev
+        k_prev, k = k, a * k + k_prev
+        yield h, k
+
+
+def _split_from_sum(n: int, s: int) -> Tuple[int, int] | None:
+    """(p, q) com p + q = s e p·q = n, se existirem: raízes de z^2 - s·z + n."""
+    t = square_root(s * s - 4 * n)
+    if t < 0 or (s + t) & 1:
+        return None
+    p, q = (s - t) // 2, (s + t) // 2
+    return (p, q) if p > 1 and p * q == n else None
+
+
+def wiener_attack(n: int, e: int, deadline=None):
+    """
+    Ataque de Wiener, compatível com a interface do RSABenchmark.
+
+    - Usa o expoente público: com d < n^(1/4) / 3, k/d aparece entre os
+      convergentes de e/n (e·d - k·phi = 1)
+    - Cada convergente k/d dá phi = (e·d - 1) / k e p + q = n - phi + 1; o teste
+      é o discriminante (p + q)^2 - 4n ser quadrado (filtros de resíduos + isqrt)
+    - Os convergentes vêm em streaming: para no primeiro que fatora
+    - deadline: prazo cooperativo; estourado devolve status="timeout"
+    """
+    tried = 0
+    for k, d in convergents(e, n):
+        tried += 1
+        if k and (e * d - 1) % k == 0:
+            factors = _split_from_sum(n, n - (e * d - 1) // k + 1)
+            if factors:
+                return (*factors, {"status": "factor_found", "method": "wiener",
+                                   "d": d, "k": k, "convergents": tried})
+        if deadline is not None and deadline.tick():
+            return (None, None, {"status": "timeout", "method": "wiener", "convergents": tried})
+
+    return (None, None, {"status": "no_factor", "method": "wiener", "convergents": tried})
+
+
+# ------------------------------
+#  Boneh-Durfee (reticulado + LLL)
+# ------------------------------
+
+def _poly_mul(a: Poly, b: Poly) -> Poly:
+    out: Poly = {}
+    for (i1, j1), c1 in a.items():
+        for (i2, j2), c2 in b.items():
+            key = (i1 + i2, j1 + j2)
+            out[key] = out.get(key, 0) + c1 * c2
+    return {k: c for k, c in out.items() if c}
+
+
+def _boneh_durfee_basis(n: int, e: int, m: int, t: int, X: int, Y: int) -> Tuple[List[List[int]], List[Tuple[int, int]]]:
+    """
+    Reticulado de Boneh-Durfee para f(x, y) = 1 + x·(A + y), A = (n + 1) / 2,
+    que tem a raiz (x0, y0) = (2k, -(p + q) / 2) mod e.
+
+    - x-shifts: x^i · f^k · e^(m-k), 0 <= k <= m, 0 <= i <= m - k
+    - y-shifts: y^j · f^k · e^(m-k), 1 <= j <= t, 0 <= k <= m
+
+    Cada polinômio introduz um monômio novo (x^(i+k)·y^k ou x^k·y^(k+j)),
+    então a base, na ordem em que é gerada, é triangular. Devolve as linhas
+    (coeficientes de g(x·X, y·Y)) e os monômios de cada coluna.
+    """
+    f: Poly = {(0, 0): 1, (1, 0): (n + 1) // 2, (1, 1): 1}
+    powers = [{(0, 0): 1}]
+    for _ in range(m):
+        powers.append(_poly_mul(powers[-1], f))
+
+    polys = []
+    monomials = []
+    for k in range(m + 1):
+        for i in range(m - k + 1):
+            polys.append({(a + i, b): c * e ** (m - k) for (a, b), c in powers[k].items()})
+            monomials.append((i + k, k))
+    for j in range(1, t + 1):
+        for k in range(m + 1):
+            polys.append({(a, b + j): c * e ** (m - k) for (a, b), c in powers[k].items()})
+            monomials.append((k, k + j))
+
+    column = {mono: idx for idx, mono in enumerate(monomials)}
+    rows = []
+    for poly in polys:
+        row = [0] * len(monomials)
+        for (a, b), c in poly.items():
+            row[column[(a, b)]] = c * X ** a * Y ** b
+        rows.append(row)
+    return rows, monomials
+
+
+# --- polinômios em uma variável: listas de inteiros, grau crescente ---
+
+def _upoly_trim(a: List[int]) -> List[int]:
+    while a and a[-1] == 0:
+        a.pop()
+    return a
+
+
+def _upoly_mul(a: List[int], b: List[int]) -> List[int]:
+    if not a or not b:
+        return []
+    out = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                out[i + j] += x * y
+    return _upoly_trim(out)
+
+
+def _upoly_sub(a: List[int], b: List[int]) -> List[int]:
+    out = [0] * max(len(a), len(b))
+    for i, x in enumerate(a):
+        out[i] += x
+    for i, y in enumerate(b):
+        out[i] -= y
+    return _upoly_trim(out)
+
+
+def _upoly_exact_div(a: List[int], b: List[int]) -> List[int]:
+    """a / b em Z[x] quando b divide a (divisões do algoritmo de Bareiss)."""
+    a = list(a)
+    out = [0] * max(len(a) - len(b) + 1, 0)
+    for i in range(len(out) - 1, -1, -1):
+        c = a[i + len(b) - 1] // b[-1]
+        out[i] = c
+        if c:
+            for j, y in enumerate(b):
+                a[i + j] -= c * y
+    return _upoly_trim(out)
+
+
+def _resultant_y(P: Poly, Q: Poly) -> List[int]:
+    """
+    Res_y(P, Q) em Z[x]: determinante da matriz de Sylvester (entradas em Z[x])
+    pelo algoritmo de Bareiss, sem frações.
+    """
+    def by_y(poly):
+        deg = max(b for _, b in poly)
+        coeffs = [[] for _ in range(deg + 1)]
+        for (a, b), c in poly.items():
+            row = coeffs[b]
+            row.extend([0] * (a + 1 - len(row)))
+            row[a] += c
+        return [_upoly_trim(c) for c in coeffs]
+
+    p, q = by_y(P), by_y(Q)
+    dp, dq = len(p) - 1, len(q) - 1
+    size = dp + dq
+    if size == 0:
+        return [1]
+    # linhas: dq deslocamentos de P e dp de Q (coeficientes do grau mais alto ao mais baixo)
+    M = []
+    for i in range(dq):
+        M.append([[] for _ in range(i)] + p[::-1] + [[] for _ in range(size - i - dp - 1)])
+    for i in range(dp):
+        M.append([[] for _ in range(i)] + q[::-1] + [[] for _ in range(size - i - dq - 1)])
+
+    sign = 1
+    prev = [1]
+    for k in range(size - 1):
+        if not M[k][k]:
+            for r in range(k + 1, size):
+                if M[r][k]:
+                    M[k], M[r] = M[r], M[k]
+                    sign = -sign
+                    break
+            else:
+                return []
+        for i in range(k + 1, size):
+            for j in range(k + 1, size):
+                M[i][j] = _upoly_exact_div(
+                    _upoly_sub(_upoly_mul(M[i][j], M[k][k]), _upoly_mul(M[i][k], M[k][j])), prev)
+            M[i][k] = []
+        prev = M[k][k]
+    return [sign * c for c in M[-1][-1]]
+
+
+def _integer_roots(poly: List[int], bound: int) -> List[int]:
+    """
+    Raízes inteiras r de poly com |r| < bound: raízes simples mod um primo l
+    (busca exaustiva), levantadas por Hensel/Newton até l^(2^i) > 2·bound.
+    """
+    poly = _upoly_trim(list(poly))
+    if len(poly) < 2:
+        return []
+    deriv = [i * c for i, c in enumerate(poly)][1:]
+
+    def value(r, mod=None):
+        acc = 0
+        for c in reversed(poly):
+            acc = acc * r + c
+            if mod:
+                acc %= mod
+        return acc
+
+    roots = set()
+    for ell in (10007, 10009, 10037):
+        if poly[-1] % ell == 0:
+            continue
+        small = [c % ell for c in poly]
+        small_d = [c % ell for c in deriv]
+        for r0 in range(ell):
+            acc = 0
+            for c in reversed(small):
+                acc = (acc * r0 + c) % ell
+            if acc:
+                continue
+            dv = 0
+            for c in reversed(small_d):
+                dv = (dv * r0 + c) % ell
+            if not dv:
+                continue  # raiz múltipla mod l: fica para o próximo primo
+            r, mod = r0, ell
+            while mod <= 2 * bound:
+                mod *= mod
+                fr = value(r, mod)
+                dr = 0
+                for c in reversed(deriv):
+                    dr = (dr * r + c) % mod
+                r = (r - fr * pow(dr, -1, mod)) % mod
+            r = r if r <= mod // 2 else r - mod
+            if abs(r) < bound and value(r) == 0:
+                roots.add(r)
+    return sorted(roots)
+
+
+def boneh_durfee_attack(
+    n: int,
+    e: int,
+    delta: float = 0.26,
+    m: int = 4,
+    t: int | None = None,
+    deadline=None,
+):
+    """
+    Variante de Boneh-Durfee (reticulado + LLL) para d maior que o limite de
+    Wiener, compatível com a interface do RSABenchmark.
+
+    - Procura a raiz pequena (x0, y0) = (2k, -(p + q)/2) de
+      f(x, y) = 1 + x·((n + 1)/2 + y) mod e, com |x0| < X = 2·n^delta, |y0| < Y = sqrt(2n)
+    - Monta o reticulado de Boneh-Durfee (m, t) e reduz com LLL inteiro;
+      dois vetores curtos viram polinômios com a raiz sobre Z, o resultante
+      em y dá x0 e a raiz em y dá p + q
+    - delta: expoente de d (d < n^delta). O limite teórico é 0.292; com
+      m e t pequenos o reticulado resolve na prática até ~0.26-0.27
+    - t padrão: (1 - 2·delta)·m
+    - O custo cresce rápido com m (dimensão (m+1)(m+2)/2 + t(m+1)): para
+      d < n^(1/4) / 3 o wiener_attack é instantâneo
+    - deadline: consultado entre as etapas (o LLL em si não é interrompido)
+    """
+    if t is None:
+        t = int((1 - 2 * delta) * m)
+    X = 2 << int(delta * n.bit_length())
+    Y = math.isqrt(2 * n)
+
+    def finish(status, p=None, q=None, **info):
+        return (p, q, {"status": status, "method": "boneh_durfee", "m": m, "t": t,
+                       "delta": delta, "dimension": len(monomials), **info})
+
+    rows, monomials = _boneh_durfee_basis(n, e, m, t, X, Y)
+    reduced = lll_reduce(rows)
+    if deadline is not None and deadline.expired():
+        return finish("timeout")
+
+    # Os vetores mais curtos nem sempre são os úteis (e^m e múltiplos de f
+    # também são curtos): tenta pares entre os primeiros, descartando os sem y
+    polys = []
+    for row in reduced[:8]:
+        poly = {}
+        for (a, b), c in zip(monomials, row):
+            if c:
+                poly[(a, b)] = c // (X ** a * Y ** b)
+        if any(b for _, b in poly):
+            polys.append(poly)
+
+    pairs = [(i, j) for j in range(len(polys)) for i in range(j)]
+    for i, j in pairs:
+        P, Q = polys[i], polys[j]
+        res = _resultant_y(P, Q)
+        if deadline is not None and deadline.expired():
+            return finish("timeout")
+        if len(res) < 2:
+            continue  # fator comum em P e Q (ou resultante constante): tenta outro par
+
+        for x0 in _integer_roots(res, X):
+            if x0 <= 0 or x0 & 1:
+                continue
+            in_y = {}
+            for (a, b), c in P.items():
+                in_y[b] = in_y.get(b, 0) + c * x0 ** a
+            in_y = [in_y.get(b, 0) for b in range(max(in_y) + 1)]
+            for y0 in _integer_roots(in_y, Y):
+                factors = _split_from_sum(n, -2 * y0)
+                if factors:
+                    k = x0 // 2
+                    phi = (factors[0] - 1) * (factors[1] - 1)
+                    return finish("factor_found", *factors, d=(1 + k * phi) // e, k=k, pair=(i, j))
+
+    return finish("no_factor")
+
+
+if __name__ == "__main__":
+    bench = RSABenchmark(
+        key_sizes_bits=(64, 128, 256, 512, 1024, 2048),
+        seed=42,
+        profile="small_d",   # d < n^(1/4) / 3: e grande, Wiener acha d nos convergentes
+    )
+
+    results = bench.run(wiener_attack, timeout_seconds=10)
+
+    print(f"{'Bits':4} {'Sucesso':8} {'Tempo (s)':10} Extra")
+    print("-" * 60)
+    for r in results:
+        print(
+            f"{r.key_bits:4} "
+            f"{str(r.success):8} "
+            f"{r.elapsed_seconds:10.6f} "
+            f"{r.extra}"
+        )
+
+    bench.print_final_report(results)
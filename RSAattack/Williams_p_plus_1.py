@@ -0,0 +1,273 @@
+from BaseAttack import RSABenchmark
+from sieve import prime_gaps, prime_power_chunks
+import math
+
+# Tamanho (em bits) de cada bloco do expoente do estágio 1 (mesmo do Pollard p-1)
+STAGE1_CHUNK_BITS = 512
+
+# Uma semente A só acha p quando (A^2 - 4 | p) = -1, daí tentar várias. As padrão
+# (2/7, sugerida por Montgomery, e inteiros pequenos) têm A^2 - 4 com partes livres
+# de quadrados distintas (-3, 5, 3, 21, 2, 77, 13, 165): sementes como 3 e 7
+# (A^2 - 4 = 5 e 45) decidiriam sempre igual
+DEFAULT_SEEDS = ((2, 7), 3, 4, 5, 6, 9, 11, 13)
+
+
+def lucas_v(v: int, k: int, n: int) -> int:
+    """
+    V_k mod n da sequência de Lucas V_0 = 2, V_1 = v, V_{i+1} = v·V_i - V_{i-1},
+    pela escada de Montgomery: guarda (V_j, V_{j+1}) e usa
+    V_{2j} = V_j^2 - 2 e V_{2j+1} = V_j·V_{j+1} - v.
+    """
+    if k == 0:
+        return 2
+    x, y = v, (v * v - 2) % n
+    for bit in bin(k)[3:]:
+        if bit == "1":
+            x, y = (x * y - v) % n, (y * y - 2) % n
+        else:
+            x, y = (x * x - 2) % n, (x * y - v) % n
+    return x
+
+
+def _seed_value(seed, n: int) -> int | None:
+    """Semente inteira ou fração (num, den) como elemento de Z/nZ; None se den não é invertível."""
+    if isinstance(seed, tuple):
+        num, den = seed
+        if math.gcd(den, n) != 1:
+            return None
+        return num * pow(den, -1, n) % n
+    return seed % n
+
+
+def williams_p_plus_1_attack(
+    n: int,
+    e: int,
+    B1: int = 10_000,
+    B2: int | None = None,
+    seeds=DEFAULT_SEEDS,
+    gcd_interval: int = 64,
+    progress_interval: int = 0,
+    deadline=None,
+    counters=None,
+):
+    """
+    Williams p+1, compatível com a interface do RSABenchmark.
+
+    - Estágio 1: V <- V_E(A) com E = produto das potências de primos <= B1,
+      aplicado em blocos pela escada de Lucas; gcd(V - 2, n) a cada `gcd_interval` blocos
+    - Cada semente de `seeds` (inteiro ou fração (num, den)) é tentada em ordem
+      até uma achar fator: com (A^2 - 4 | p) = +1 a semente cobre p-1 em vez de p+1
+    - Estágio 2 (B2 > B1): um primo extra q em (B1, B2], com q = m·D ± r e
+      acumulando V_{mD} - V_r; usa a mesma tabela de gaps do Pollard p-1
+    - B2 padrão = 100 * B1; B2 <= B1 desliga o estágio 2
+    - extra traz seeds_tried e bound_reached (último primo coberto)
+    - deadline: prazo cooperativo; estourado devolve status="timeout"
+    - counters: AttackCounters; iters, gcds, modmuls (2 por bit da escada de
+      Lucas) e o tempo de cada estágio ("stage1", "stage2")
+    """
+    if B2 is None:
+        B2 = 100 * B1
+    if n % 2 == 0:
+        return (2, n // 2, {"status": "factor_found", "stage": 0, "B1": B1, "B2": B2,
+                            "iters": 0, "gcd_calls": 0, "seeds_tried": 0, "bound_reached": 0})
+
+    chunks = prime_power_chunks(B1, STAGE1_CHUNK_BITS)
+    stats = {"iters": 0, "gcd_calls": 0, "modmuls": 0}
+    seeds_tried = 0
+    status = "no_factor"
+    bound_reached = 0
+    seed = None
+
+    def finish(p, q, status, stage, seed, bound):
+        if counters is not None:
+            counters.add(iters=stats["iters"], gcds=stats["gcd_calls"], modmuls=stats["modmuls"])
+            counters.phase(None)
+        return (p, q, {
+            "status": status,
+            "stage": stage,
+            "B1": B1,
+            "B2": B2,
+            "iters": stats["iters"],
+            "gcd_calls": stats["gcd_calls"],
+            "seed": seed,
+            "seeds_tried": seeds_tried,
+            "bound_reached": bound,
+        })
+
+    for seed in seeds:
+        v = _seed_value(seed, n)
+        if v is None:
+            d = math.gcd(seed[1], n)
+            if 1 < d < n:
+                return finish(d, n // d, "factor_found", 0, seed, 0)
+            continue
+        seeds_tried += 1
+
+        if counters is not None:
+            counters.phase("stage1")
+        d, v = _stage1(n, v, chunks, gcd_interval, progress_interval, deadline, stats)
+        if d == -1:
+            return finish(None, None, "timeout", 1, seed, B1)
+        if 1 < d < n:
+            return finish(d, n // d, "factor_found", 1, seed, B1)
+        if d == n:
+            status = "backtrack_failed"
+            continue  # V_E == 2 mod p e mod q: outra semente
+        bound_reached = max(bound_reached, B1)
+
+        if B2 > B1:
+            if counters is not None:
+                counters.phase("stage2")
+            d, bound = _stage2(n, v, B1, B2, gcd_interval, progress_interval, deadline, stats)
+            bound_reached = max(bound_reached, bound)
+            if d == -1:
+                return finish(None, None, "timeout", 2, seed, bound)
+            if 1 < d < n:
+                return finish(d, n // d, "factor_found", 2, seed, bound)
+            if d == n:
+                status = "backtrack_failed"
+
+    return finish(None, None, status, 2 if B2 > B1 else 1, seed, bound_reached)
+
+
+def _stage1(n, v, chunks, gcd_interval, progress_interval, deadline, stats):
+    """Estágio 1 para uma semente. Devolve (gcd ou -1 se estourou o prazo, V_E)."""
+    v_checkpoint = v
+    checkpoint_idx = 0
+    d = 1
+    for idx, (exponent, _) in enumerate(chunks):
+        v = lucas_v(v, exponent, n)
+        stats["iters"] += 1
+        stats["modmuls"] += 2 * exponent.bit_length()
+        if deadline is not None and deadline.expired():
+            return (-1, v)
+
+        if (idx + 1) % gcd_interval != 0 and idx + 1 != len(chunks):
+            continue
+
+        d = math.gcd(v - 2, n)
+        stats["gcd_calls"] += 1
+
+        if progress_interval and stats["iters"] % progress_interval == 0:
+            print(f"   [Williams p+1/estágio 1] blocos={idx + 1}/{len(chunks)}, gcd(V-2, n)={d}")
+
+        if d == n:
+            # Backtracking: refaz os blocos desde o último gcd == 1, uma potência de primo por vez
+            v = v_checkpoint
+            for _, parts in chunks[checkpoint_idx : idx + 1]:
+                for pk in parts:
+                    v = lucas_v(v, pk, n)
+                    stats["modmuls"] += 2 * pk.bit_length()
+                    d = math.gcd(v - 2, n)
+                    stats["gcd_calls"] += 1
+                    if d != 1:
+                        return (d, v)
+
+        if d != 1:
+            return (d, v)
+        v_checkpoint = v
+        checkpoint_idx = idx + 1
+    return (d, v)
+
+
+def _stage2(n, v, B1, B2, gcd_interval, progress_interval, deadline, stats):
+    """
+    Estágio 2: para cada primo q em (B1, B2], q = m·D ± r com 0 < r < D/2;
+    V_q(V) == 2 (mod p) <=> V_{mD} == V_r (mod p), então acumula V_{mD} - V_r.
+
+    Devolve (gcd ou -1 se estourou o prazo, último primo coberto).
+    """
+    q_first, gaps = prime_gaps(B1, B2)
+    if not q_first:
+        return (1, B1)
+
+    D = 2310 if B2 - B1 > 2310 * 64 else 210
+    # baby steps: V_r para r ímpar <= D/2 (V_{r+2} = V_r·V_2 - V_{r-2}, V_{-1} = V_1)
+    v2 = (v * v - 2) % n
+    baby = {1: v}
+    prev, cur = v, v
+    for r in range(3, D // 2 + 1, 2):
+        prev, cur = cur, (cur * v2 - prev) % n
+        baby[r] = cur
+
+    # giant steps: (V_{(m-1)D}, V_{mD}) com V_{(m+1)D} = V_{mD}·V_D - V_{(m-1)D}
+    vD = lucas_v(v, D, n)
+    m = (q_first + D // 2) // D
+    giant_prev, giant = lucas_v(v, abs(m - 1) * D, n), lucas_v(v, m * D, n)
+    stats["modmuls"] += D // 4 + 2 * (D.bit_length() + 2 * (m * D).bit_length())
+
+    acc = 1
+    q = q_first
+    primes_done = 0
+    saved = (q, 0, m, giant_prev, giant)  # estado do último gcd == 1, para backtracking
+
+    for gap_idx in range(len(gaps) + 1):
+        while q - m * D > D // 2:
+            giant_prev, giant = giant, (giant * vD - giant_prev) % n
+            m += 1
+            stats["modmuls"] += 1
+        acc = acc * (giant - baby[abs(q - m * D)]) % n
+        primes_done += 1
+        stats["iters"] += 1
+        stats["modmuls"] += 1
+
+        last = gap_idx == len(gaps)
+        if primes_done % (gcd_interval * 16) == 0 or last:
+            d = math.gcd(acc, n)
+            stats["gcd_calls"] += 1
+
+            if progress_interval and primes_done % (progress_interval * 16) == 0:
+                print(f"   [Williams p+1/estágio 2] q={q}, primos={primes_done}, gcd={d}")
+
+            if d == n:
+                # Backtracking: refaz o intervalo testando cada primo isoladamente
+                q, start_idx, m, giant_prev, giant = saved
+                for j in range(start_idx, gap_idx + 1):
+                    while q - m * D > D // 2:
+                        giant_prev, giant = giant, (giant * vD - giant_prev) % n
+                        m += 1
+                    d = math.gcd(giant - baby[abs(q - m * D)], n)
+                    stats["gcd_calls"] += 1
+                    if d != 1:
+                        return (d, q)
+                    q += gaps[j] if j < len(gaps) else 0
+                return (d, q)
+
+            if d != 1:
+                return (d, q)
+            saved = (q + (gaps[gap_idx] if not last else 0), gap_idx + 1, m, giant_prev, giant)
+
+            if deadline is not None and deadline.expired():
+                return (-1, q)
+
+        if not last:
+            q += gaps[gap_idx]
+
+    return (1, q)
+
+
+if __name__ == "__main__":
+    bench = RSABenchmark(
+        key_sizes_bits=(64, 128, 256, 512, 1024),
+        seed=42,
+        profile="p_plus_1_smooth",   # p + 1 B-smooth: sai no estágio 1
+        profile_params={"B": 100_000},
+    )
+
+    results = bench.run(
+        williams_p_plus_1_attack,
+        B1=100_000,
+        B2=10_000_000,
+    )
+
+    print(f"{'Bits':4} {'Sucesso':8} {'Tempo (s)':10} Extra")
+    print("-" * 60)
+    for r in results:
+        print(
+            f"{r.key_bits:4} "
+            f"{str(r.success):8} "
+            f"{r.elapsed_seconds:10.6f} "
+            f"{r.extra}"
+        )
+
+    bench.print_final_report(results)
@@ -1,51 +1,108 @@
 import math
-from typing import Optional, Tuple
+from typing import Sequence
 from BaseAttack import RSABenchmark
+from intmath import QR_MOD_64, QR_MOD_45045
 
-def fermat_factor(n: int, e: int = 0, max_iters: Optional[int] = None) -> Optional[Tuple[int,int]]:
-    
-    if n <= 1:
-        return None
+# Iterações por rodada: entre rodadas troca o multiplicador e consulta o prazo
+FERMAT_CHUNK = 1024
 
+
+def _fermat_run(n: int, a: int, b2: int, steps: int, stop_on_trivial: bool) -> tuple:
+    """
+    Até `steps` passos de Fermat sobre k·n, a partir de a e b2 = a^2 - k·n.
+
+    Devolve (gcd ou 0, a, b2, passos dados, isqrts). Com k = 1 o primeiro quadrado
+    já decide (gcd trivial: n é primo), então `stop_on_trivial` devolve o
+    gcd mesmo que seja 1; com k > 1 a busca continua.
+    """
+    inc = 2 * a + 1  # (a + 1)^2 - a^2
+    roots = 0
+    for i in range(steps):
+        # filtros de resíduos quadráticos: a maioria dos b2 nem chega ao isqrt
+        if (QR_MOD_64 >> (b2 & 63)) & 1 and QR_MOD_45045[b2 % 45045]:
+            b = math.isqrt(b2)
+            roots += 1
+            if b * b == b2:
+                d = math.gcd((inc - 1) // 2 - b, n)
+                if 1 < d < n or stop_on_trivial:
+                    return (d, (inc - 1) // 2, b2, i + 1, roots)
+        b2 += inc
+        inc += 2
+    return (0, (inc - 1) // 2, b2, steps, roots)
+
+
+def fermat_factor(
+    n: int,
+    e: int = 0,
+    max_iters: int | None = None,
+    deadline=None,
+    multipliers: Sequence[int] = (1,),
+    counters=None,
+):
+    """
+    Fatoração de Fermat, compatível com a interface do RSABenchmark.
+
+    - Procura a >= sqrt(k·n) com b2 = a^2 - k·n quadrado; então gcd(a - b, n)
+      é um fator
+    - b2 é atualizado somando 2a + 1 (sem a*a por passo) e passa pelos filtros
+      de resíduos mod 64 e mod 63·65·11 antes do isqrt
+    - multipliers: com mais de um k (ex.: (1, 2, 3, 6)), os k se revezam em
+      rodadas de FERMAT_CHUNK passos, como no método de Lehman; acha p/q
+      perto de uma razão u/v com k = u·v (k par usa 4k·n)
+    - max_iters: total de passos somando todos os multiplicadores
+    - deadline: prazo cooperativo; estourado devolve status="timeout"
+    - counters: AttackCounters; recebe iters, isqrts e gcds a cada rodada
+    - Sempre devolve (p, q, extra) com status e iters
+    """
+    if n <= 3:
+        return (None, None, {"status": "invalid_input", "iters": 0})
     if n % 2 == 0:
-        return 2, n // 2
+        return (2, n // 2, {"status": "factor_found", "iters": 0, "multiplier": 1})
 
-    a = math.isqrt(n)
-    if a * a < n:
-        a += 1
+    # estado por multiplicador: [k, a, b2]
+    states = []
+    for k in multipliers:
+        # k par: k·n = (u·q)(v·p) tem soma ímpar; 4k·n = (2u·q)(2v·p) volta a ter soma par
+        kn = k * n if k % 2 else 4 * k * n
+        a = math.isqrt(kn)
+        if a * a < kn:
+            a += 1
+        states.append([k, a, a * a - kn])
 
     it = 0
     while True:
-        b2 = a*a - n
-        if b2 < 0:
-            a += 1
-            it += 1
-            if max_iters and it > max_iters:
-                return None
-            continue
+        for state in states:
+            k, a, b2 = state
+            steps = FERMAT_CHUNK if max_iters is None else min(FERMAT_CHUNK, max_iters - it)
+            if steps <= 0:
+                return (None, None, {"status": "max_iter_reached", "iters": it})
 
-        b = math.isqrt(b2)
-        if b*b == b2:
-            p = a - b
-            q = a + b
-            if 1 < p < n and 1 < q < n:
-                return (p, q) if p <= q else (q, p)
-            return None
+            d, a, b2, done, roots = _fermat_run(n, a, b2, steps, k == 1)
+            it += done
+            if counters is not None:
+                counters.add(iters=done, isqrts=roots, gcds=1 if d else 0)
+            if d in (1, n):
+                return (None, None, {"status": "no_factor", "iters": it})
+            if d:
+                p, q = min(d, n // d), max(d, n // d)
+                return (p, q, {"status": "factor_found", "iters": it, "multiplier": k, "a": a})
+            state[1], state[2] = a, b2
 
-        a += 1
-        it += 1
-        if max_iters and it > max_iters:
-            return None
+            # sem max_iters o laço não tem fim para primos distantes: o prazo é a saída
+            if deadline is not None and deadline.tick(done):
+                return (None, None, {"status": "timeout", "iters": it})
 
 
 if __name__ == "__main__":
     bench = RSABenchmark(
         key_sizes_bits=(32, 64, 128, 256, 512, 1024, 2048),
         seed=42,
+        profile="close",      # |p - q| < 2^(bits/4): o caso em que Fermat ganha
     )
 
     results = bench.run(
         fermat_factor,
+        timeout_seconds=10,   # com profile="balanced" Fermat não termina sem prazo
     )
 
     print(f"{'Bits':4} {'Sucesso':8} {'Tempo (s)':10} Extra")
@@ -0,0 +1,76 @@
+import math
+
+
+def _square_residues(m: int) -> int:
+    """Bitmask com o bit r ligado se r é um quadrado mod m."""
+    mask = 0
+    for x in range(m):
+        mask |= 1 << (x * x % m)
+    return mask
+
+
+# Resíduos quadráticos mod 64, 63, 65 e 11 (12/64, 16/63, 21/65 e 6/11 dos restos)
+QR_MOD_64 = _square_residues(64)
+QR_MOD_63 = _square_residues(63)
+QR_MOD_65 = _square_residues(65)
+QR_MOD_11 = _square_residues(11)
+
+# Tabela combinada: QR_MOD_45045[r] == 1 se r é quadrado mod 63, 65 e 11 (~4.5% dos restos)
+QR_MOD_45045 = bytes(
+    (QR_MOD_63 >> (r % 63)) & (QR_MOD_65 >> (r % 65)) & (QR_MOD_11 >> (r % 11)) & 1
+    for r in range(45045)
+)
+
+
+def square_root(n: int) -> int:
+    """
+    Raiz exata de n se n é quadrado perfeito, senão -1.
+
+    Os filtros de resíduos quadráticos (um resto mod 64 e um mod 63·65·11)
+    descartam mais de 99% dos não-quadrados antes do isqrt.
+    """
+    if n < 0 or not (QR_MOD_64 >> (n & 63)) & 1:
+        return -1
+    if not QR_MOD_45045[n % 45045]:  # 45045 = 63 * 65 * 11
+        return -1
+    s = math.isqrt(n)
+    return s if s * s == n else -1
+
+
+def is_square(n: int) -> bool:
+    return square_root(n) >= 0
+
+
+def icbrt(n: int) -> int:
+    """Maior inteiro x com x^3 <= n (Newton em inteiros)."""
+    if n < 0:
+        raise ValueError("n deve ser >= 0")
+    if n < 8:
+        return 1 if n else 0
+    x = 1 << ((n.bit_length() + 2) // 3)  # x^3 >= n
+    while True:
+        y = (2 * x + n // (x * x)) // 3
+        if y >= x:
+            return x
+        x = y
+
+
+def iroot(n: int, k: int) -> int:
+    """Maior inteiro x com x^k <= n (Newton em inteiros)."""
+    if n < 0 or k < 1:
+        raise ValueError("exige n >= 0 e k >= 1")
+    if n < 2 or k == 1:
+        return n
+    x = 1 << -(-n.bit_length() // k)  # x^k > n
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def pow_modmuls(exponent: int) -> int:
+    """Multiplicações modulares de pow(a, exponent, n) pelo método binário (quadrados + produtos)."""
+    if exponent <= 1:
+        return 0
+    return exponent.bit_length() - 1 + exponent.bit_count() - 1
@@ -0,0 +1,317 @@
+import bisect
+import hashlib
+import math
+import mmap
+import os
+import random
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import BaseAttack  # noqa: F401 (põe a raiz do repositório no sys.path para o pacote primality)
+from primality import is_prime
+from sieve import default_cache_dir, primes_up_to
+
+# Primos pequenos usados para peneirar os candidatos antes do teste de primalidade
+SMALL_PRIME_BOUND = 2048
+SMALL_PRIMES = primes_up_to(SMALL_PRIME_BOUND)
+
+# Formato do arquivo: cabeçalho, índice (bits, len(p), len(q), len(d), offset) e os inteiros em
+# little-endian; len(d) == 0 quando o perfil não fixa o expoente privado. VERSION também entra na
+# identidade do corpus: muda quando o gerador passa a produzir outras chaves para o mesmo seed
+# (v3: Baillie-PSW não consome o rng, que no Miller-Rabin sorteava as bases)
+MAGIC = b"RSAK"
+VERSION = 3
+_HEADER = struct.Struct("<4sHI")
+_ENTRY = struct.Struct("<IHHHQ")
+
+
+# ------------------------------
+#  Primos aleatórios
+# ------------------------------
+
+def random_prime(bits: int, rng: random.Random | None = None) -> int:
+    """
+    Primo aleatório com exatamente `bits` bits.
+
+    Sorteia um ímpar x e peneira a janela x, x+2, ..., x+2(W-1) pelos primos
+    pequenos; só os sobreviventes (~10% dos ímpares) passam pelo Baillie-PSW.
+    """
+    rng = rng or random
+    if bits < 2:
+        raise ValueError("bits deve ser >= 2")
+    if bits == 2:
+        return rng.choice((2, 3))
+
+    top = 1 << bits
+    window = max(64, 4 * bits)
+    while True:
+        x = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        width = min(window, (top - x + 1) // 2)
+        alive = bytearray([1]) * width  # alive[i] <-> x + 2i
+
+        for p in SMALL_PRIMES[1:]:
+            if p * p > x + 2 * (width - 1):
+                break
+            # primeiro múltiplo ímpar de p na janela (sem marcar o próprio p)
+            start = max(p * p, -(-x // p) * p)
+            if start % 2 == 0:
+                start += p
+            if start > x + 2 * (width - 1):
+                continue
+            first = (start - x) // 2
+            alive[first::p] = bytes(len(range(first, width, p)))
+
+        for i in range(width):
+            if alive[i] and is_prime(x + 2 * i):
+                return x + 2 * i
+
+
+def _smooth_prime(bits: int, rng: random.Random, B: int, sign: int) -> int:
+    """
+    Primo p de `bits` bits com p - sign B-smooth: p = m + sign, com m = 2 * (primos
+    <= B), sem deixar nenhuma potência de primo de m passar de B (assim p - sign
+    divide o expoente do estágio 1 com B1 = B).
+    """
+    factors = primes_up_to(B)[1:]
+    if not factors:
+        raise ValueError("B deve ser >= 3")
+    # maior m possível: 2 * produto das maiores potências <= B de cada primo ímpar
+    capacity = 1 + sum(math.log2(B) // math.log2(f) * math.log2(f) for f in factors)
+    if capacity < 2 * bits:
+        raise ValueError(f"B = {B} pequeno demais para um primo {B}-smooth de {bits} bits")
+    low, high = 1 << (bits - 1), (1 << bits) - 1
+
+    while True:
+        m = 2
+        powers: Dict[int, int] = {}
+        # cresce m até que um único fator <= B consiga fechar os `bits` bits
+        while m * factors[-1] + sign < low:
+            cap = bisect.bisect_right(factors, high // (3 * m))  # deixa espaço para o último fator
+            f = factors[rng.randrange(cap)]
+            if powers.get(f, 1) * f <= B:
+                powers[f] = powers.get(f, 1) * f
+                m *= f
+
+        lo = max(-(-(low - sign) // m), 3)
+        hi = (high - sign) // m
+        last = [f for f in factors[bisect.bisect_left(factors, lo) : bisect.bisect_right(factors, hi)]
+                if powers.get(f, 1) * f <= B]
+        if not last:
+            continue
+        p = m * rng.choice(last) + sign
+        if is_prime(p):
+            return p
+
+
+def _balanced_pair(bits: int, rng: random.Random) -> Tuple[int, int, int | None]:
+    half = bits // 2
+    p = random_prime(half, rng)
+    q = random_prime(bits - half, rng)
+    while q == p:
+        q = random_prime(bits - half, rng)
+    return (p, q, None)
+
+
+def _close_pair(bits: int, rng: random.Random, gap_bits: int | None = None) -> Tuple[int, int, int | None]:
+    """|p - q| < 2^gap_bits (padrão bits // 4): Fermat acha em poucas iterações."""
+    half = bits // 2
+    gap_bits = gap_bits if gap_bits is not None else max(bits // 4, 2)
+    while True:
+        p = random_prime(bits - half, rng)
+        q = p + 2 * rng.randrange(1, max(2, 1 << (gap_bits - 1)) // 2 + 1)
+        while not is_prime(q):
+            q += 2
+        if q - p < (1 << gap_bits) and (p * q).bit_length() == bits:
+            return (p, q, None)
+
+
+def _p_minus_1_smooth_pair(bits: int, rng: random.Random, B: int = 10_000) -> Tuple[int, int, int | None]:
+    """p - 1 B-smooth (potências de primos <= B): Pollard p-1 com B1 >= B acha p no estágio 1."""
+    half = bits // 2
+    p = _smooth_prime(half, rng, B, +1)
+    q = random_prime(bits - half, rng)
+    return (p, q, None)
+
+
+def _p_plus_1_smooth_pair(bits: int, rng: random.Random, B: int = 10_000) -> Tuple[int, int, int | None]:
+    """p + 1 B-smooth: alvo do Williams p+1."""
+    half = bits // 2
+    p = _smooth_prime(half, rng, B, -1)
+    q = random_prime(bits - half, rng)
+    return (p, q, None)
+
+
+def _small_d_pair(bits: int, rng: random.Random, d_bits: int | None = None) -> Tuple[int, int, int | None]:
+    """
+    Expoente privado pequeno: d com d_bits bits (padrão bits // 4 - 2, abaixo do
+    limite de Wiener n^(1/4) / 3); e = d^-1 mod phi sai grande.
+    """
+    d_bits = d_bits if d_bits is not None else max(bits // 4 - 2, 2)
+    while True:
+        p, q, _ = _balanced_pair(bits, rng)
+        phi = (p - 1) * (q - 1)
+        # com d_bits pequeno pode não haver d coprimo com este phi: troca o par
+        for _ in range(64):
+            d = rng.getrandbits(d_bits) | (1 << (d_bits - 1)) | 1
+            if math.gcd(d, phi) == 1:
+                return (p, q, d)
+
+
+# Perfis de chave: (bits, rng, **parâmetros) -> (p, q, d ou None)
+KEY_PROFILES = {
+    "balanced": _balanced_pair,
+    "close": _close_pair,
+    "p_minus_1_smooth": _p_minus_1_smooth_pair,
+    "p_plus_1_smooth": _p_plus_1_smooth_pair,
+    "small_d": _small_d_pair,
+}
+
+
+def _pair_task(task: tuple) -> Tuple[int, int, int, int | None]:
+    """Uma chave de `bits` bits no perfil pedido; o RNG depende só de (seed, bits, índice)."""
+    seed, bits, index, profile, params = task
+    rng = random.Random(f"{seed}:{bits}:{index}") if seed is not None else random.Random()
+    p, q, d = KEY_PROFILES[profile](bits, rng, **dict(params))
+    return (bits, p, q, d)
+
+
+def generate_pairs(
+    sizes: Sequence[int],
+    keys_per_size: int = 1,
+    seed: int | None = None,
+    processes: int | None = None,
+    profile: str = "balanced",
+    profile_params: dict | None = None,
+) -> List[Tuple[int, int, int, int | None]]:
+    """
+    Gera (bits, p, q, d) para cada tamanho, `keys_per_size` vezes, na ordem de `sizes`.
+
+    - d só vem preenchido nos perfis que fixam o expoente privado (small_d)
+    - Cada chave tem o seu próprio RNG derivado de (seed, bits, índice), então
+      o resultado é o mesmo com ou sem pool de processos (processes=N)
+    """
+    if profile not in KEY_PROFILES:
+        raise ValueError(f"perfil desconhecido: {profile!r} (use {', '.join(KEY_PROFILES)})")
+    params = tuple(sorted((profile_params or {}).items()))
+    tasks = [(seed, bits, i, profile, params) for bits in sizes for i in range(keys_per_size)]
+    if processes is None or processes <= 1 or len(tasks) < 2:
+        return [_pair_task(t) for t in tasks]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(_pair_task, tasks, chunksize=max(1, len(tasks) // (4 * processes))))
+
+
+# ------------------------------
+#  Cache em disco
+# ------------------------------
+
+def corpus_path(
+    sizes: Sequence[int],
+    seed: int,
+    e: int,
+    keys_per_size: int,
+    cache_dir: str | None = None,
+    profile: str = "balanced",
+    profile_params: dict | None = None,
+) -> str:
+    """Arquivo do corpus identificado por (tamanhos, seed, e, chaves por tamanho, perfil)."""
+    params = tuple(sorted((profile_params or {}).items()))
+    ident = repr((tuple(sizes), seed, e, keys_per_size, profile, params, VERSION)).encode()
+    digest = hashlib.sha1(ident).hexdigest()[:16]
+    return os.path.join(cache_dir or default_cache_dir(), "keys", f"corpus_{digest}.bin")
+
+
+def save_corpus(path: str, pairs: Sequence[Tuple[int, int, int, int | None]]) -> None:
+    """Grava o corpus (escrita atômica: outro processo nunca lê um arquivo pela metade)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    offset = _HEADER.size + _ENTRY.size * len(pairs)
+    index = bytearray()
+    data = bytearray()
+    for bits, p, q, d in pairs:
+        pb = p.to_bytes((p.bit_length() + 7) // 8, "little")
+        qb = q.to_bytes((q.bit_length() + 7) // 8, "little")
+        db = d.to_bytes((d.bit_length() + 7) // 8, "little") if d else b""
+        index += _ENTRY.pack(bits, len(pb), len(qb), len(db), offset + len(data))
+        data += pb + qb + db
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, VERSION, len(pairs)))
+        fh.write(index)
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+class CorpusFile:
+    """Corpus lido por memory-map: cada (bits, p, q, d) só é decodificado quando acessado."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"arquivo de corpus inválido: {path}")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> Tuple[int, int, int, int | None]:
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        bits, plen, qlen, dlen, offset = _ENTRY.unpack_from(self._map, _HEADER.size + i * _ENTRY.size)
+        p = int.from_bytes(self._map[offset : offset + plen], "little")
+        offset += plen
+        q = int.from_bytes(self._map[offset : offset + qlen], "little")
+        offset += qlen
+        d = int.from_bytes(self._map[offset : offset + dlen], "little") if dlen else None
+        return (bits, p, q, d)
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int, int | None]]:
+        return (self[i] for i in range(self._count))
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_or_generate(
+    sizes: Sequence[int],
+    keys_per_size: int = 1,
+    seed: int | None = None,
+    e: int = 65537,
+    processes: int | None = None,
+    cache_dir: str | None = None,
+    use_cache: bool = True,
+    profile: str = "balanced",
+    profile_params: dict | None = None,
+) -> Tuple[List[Tuple[int, int, int, int | None]], bool]:
+    """
+    Devolve ([(bits, p, q, d), ...], veio_do_cache).
+
+    Só corpora com seed são cacheados (sem seed as chaves não se repetem).
+    Se o cache não puder ser lido ou gravado, as chaves são geradas normalmente.
+    """
+    path = None
+    if use_cache and seed is not None:
+        path = corpus_path(sizes, seed, e, keys_per_size, cache_dir, profile, profile_params)
+        try:
+            with CorpusFile(path) as corpus:
+                if len(corpus) == len(sizes) * keys_per_size:
+                    return list(corpus), True
+        except (OSError, ValueError, struct.error):
+            pass
+
+    pairs = generate_pairs(sizes, keys_per_size, seed, processes, profile, profile_params)
+    if path is not None:
+        try:
+            save_corpus(path, pairs)
+        except OSError:
+            pass
+    return pairs, False
@@ -0,0 +1,75 @@
+from fractions import Fraction
+from typing import List
+
+
+def lll_reduce(basis: List[List[int]], delta: Fraction = Fraction(99, 100)) -> List[List[int]]:
+    """
+    Redução LLL inteira (Cohen, algoritmo 2.6.7): sem frações nem floats.
+
+    Guarda d_i = det da Gram das i primeiras linhas e lambda_ij = d_j·mu_ij,
+    que são sempre inteiros, então funciona com entradas de milhares de bits
+    (o caso das redes de Coppersmith). As linhas de `basis` devem ser
+    linearmente independentes. Devolve uma nova lista, a primeira linha é a
+    mais curta.
+    """
+    b = [list(row) for row in basis]
+    n = len(b)
+    if n <= 1:
+        return b
+    num, den = delta.numerator, delta.denominator
+
+    def dot(u, v):
+        return sum(x * y for x, y in zip(u, v))
+
+    d = [1] + [0] * n              # d[0] = 1, d[i] para a linha i-1 (1-indexado)
+    lam = [[0] * n for _ in range(n)]  # lam[k][j], j < k (0-indexado)
+
+    def red(k, l):
+        if 2 * abs(lam[k][l]) > d[l + 1]:
+            q = (2 * lam[k][l] + d[l + 1]) // (2 * d[l + 1])  # inteiro mais próximo
+            b[k] = [x - q * y for x, y in zip(b[k], b[l])]
+            lam[k][l] -= q * d[l + 1]
+            for i in range(l):
+                lam[k][i] -= q * lam[l][i]
+
+    def swap(k):
+        b[k], b[k - 1] = b[k - 1], b[k]
+        for j in range(k - 1):
+            lam[k][j], lam[k - 1][j] = lam[k - 1][j], lam[k][j]
+        lk = lam[k][k - 1]
+        B = (d[k - 1] * d[k + 1] + lk * lk) // d[k]
+        for i in range(k + 1, k_max + 1):
+            t = lam[i][k]
+            lam[i][k] = (d[k + 1] * lam[i][k - 1] - lk * t) // d[k]
+            lam[i][k - 1] = (B * t + lk * lam[i][k]) // d[k + 1]
+        d[k] = B
+
+    # Gram-Schmidt incremental da linha k
+    def incorporate(k):
+        for j in range(k + 1):
+            u = dot(b[k], b[j])
+            for i in range(j):
+                u = (d[i + 1] * u - lam[k][i] * lam[j][i]) // d[i]
+            if j < k:
+                lam[k][j] = u
+            else:
+                if u == 0:
+                    raise ValueError("base linearmente dependente")
+                d[k + 1] = u
+
+    incorporate(0)
+    k, k_max = 1, 0
+    while k < n:
+        if k > k_max:
+            k_max = k
+            incorporate(k)
+        red(k, k - 1)
+        # condição de Lovász: d_k·d_{k-2} >= delta·d_{k-1}^2 - lambda_{k,k-1}^2
+        if den * d[k + 1] * d[k - 1] < num * d[k] * d[k] - den * lam[k][k - 1] ** 2:
+            swap(k)
+            k = max(1, k - 1)
+        else:
+            for l in range(k - 2, -1, -1):
+                red(k, l)
+            k += 1
+    return b
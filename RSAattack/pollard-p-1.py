@@ -1,5 +1,10 @@
 from BaseAttack import RSABenchmark
+from intmath import pow_modmuls
+from montgomery import MontgomeryLanes, lanes_supported
+from sieve import prime_gaps, prime_power_chunks
+from typing import Dict, Iterable, Tuple
 import math
+import numpy as np
 
 def pollard_p_minus_1_attack(
     n: int,
@@ -7,14 +12,59 @@ def pollard_p_minus_1_attack(
     a_start: int = 2,
     max_iter: int = 1000000000,
     progress_interval: int = 1000,
+    B1: int | None = None,
+    B2: int | None = None,
+    gcd_interval: int = 64,
+    deadline=None,
+    checkpoint=None,
+    counters=None,
 ):
+    """
+    Pollard p-1, compatível com a interface do RSABenchmark.
+
+    - Sem B1: versão clássica, a <- a^i (mod n) para i = 2, 3, ... com gcd a cada passo
+    - Com B1: estágio 1 com o expoente E = produto das potências de primos <= B1,
+      aplicado em blocos, com gcd a cada `gcd_interval` blocos; depois estágio 2
+      (baby-step/giant-step) cobrindo um primo extra em (B1, B2]
+    - B2 padrão = 100 * B1; B2 <= B1 desliga o estágio 2
+    - checkpoint (RSABenchmark.run com checkpoint_dir/resume): salva o estado
+      periodicamente e retoma de onde parou
+    - deadline: prazo cooperativo; estourado devolve status="timeout"
+    - counters: AttackCounters; iters, gcds, modmuls (custo binário de cada
+      pow) e o tempo de cada estágio ("stage1", "stage2")
+    """
+    if B1 is not None:
+        if B2 is None:
+            B2 = 100 * B1
+        return _pollard_p_minus_1_bounds(n, a_start, B1, B2, gcd_interval, progress_interval, deadline, checkpoint, counters)
+
     a = a_start
     i = 2
     iters = 0
+    modmuls = 0
+
+    state = checkpoint.load("p-1/classic") if checkpoint else None
+    if state:
+        a, i, iters = state["a"], state["i"], state["iters"]
+    flushed = iters
+
+    def finish(p, q, status, i_final):
+        if counters is not None:
+            counters.add(iters=iters - flushed, gcds=iters - flushed, modmuls=modmuls)
+        return (p, q, {
+            "iters": iters,
+            "i_final": i_final,
+            "a_final": a,
+            "status": status,
+        })
 
     while iters < max_iter:
+        if checkpoint is not None and checkpoint.due():
+            checkpoint.save("p-1/classic", a=a, i=i, iters=iters)
+
         # a <- a^i (mod n)
         a = pow(a, i, n)
+        modmuls += pow_modmuls(i)
 
         # d = gcd(a-1, n)
         d = math.gcd(a - 1, n)
@@ -27,35 +77,286 @@ def pollard_p_minus_1_attack(
 
         # se achou fator não trivial
         if 1 < d < n:
-            p = d
-            q = n // d
-            return (p, q, {
-                "iters": iters,
-                "i_final": i,
-                "a_final": a,
-                "status": "factor_found",
-            })
+            return finish(d, n // d, "factor_found", i)
+
+        if deadline is not None and deadline.tick():
+            return finish(None, None, "timeout", i)
 
         i += 1
 
-    return (None, None, {
-        "iters": iters,
-        "i_final": i - 1,
-        "a_final": a,
-        "status": "max_iter_reached",
-    })
+    return finish(None, None, "max_iter_reached", i - 1)
+
+
+# Tamanho (em bits) de cada bloco do expoente do estágio 1
+STAGE1_CHUNK_BITS = 512
+
+
+def _stage1_chunks(B1: int) -> tuple:
+    """E = prod(p^k <= B1) em blocos de ~STAGE1_CHUNK_BITS bits (ver sieve.prime_power_chunks)."""
+    return prime_power_chunks(B1, STAGE1_CHUNK_BITS)
+
+
+def _pollard_p_minus_1_bounds(
+    n: int,
+    a_start: int,
+    B1: int,
+    B2: int,
+    gcd_interval: int,
+    progress_interval: int,
+    deadline=None,
+    checkpoint=None,
+    counters=None,
+):
+    gcd_calls = 0
+    iters = 0
+    modmuls = 0
+
+    state = checkpoint.load("p-1/bounds") if checkpoint else None
+    if state and (state["B1"], state["B2"], state["a_start"]) != (B1, B2, a_start):
+        state = None  # checkpoint de outra configuração
+    if state:
+        iters, gcd_calls = state["iters"], state["gcd_calls"]
+    flushed = (iters, gcd_calls)  # já contados na execução anterior ao checkpoint
+
+    def save(**stage_state):
+        if checkpoint is not None and checkpoint.due():
+            checkpoint.save("p-1/bounds", B1=B1, B2=B2, a_start=a_start,
+                            iters=iters, gcd_calls=gcd_calls, **stage_state)
+
+    def finish(p, q, status, stage, a):
+        if counters is not None:
+            counters.add(iters=iters - flushed[0], gcds=gcd_calls - flushed[1], modmuls=modmuls)
+            counters.phase(None)
+        return (p, q, {
+            "status": status,
+            "stage": stage,
+            "B1": B1,
+            "B2": B2,
+            "iters": iters,
+            "gcd_calls": gcd_calls,
+            "a_final": a,
+        })
+
+    # ---------------- Estágio 1 ----------------
+    if counters is not None:
+        counters.phase("stage1")
+    chunks = _stage1_chunks(B1)
+    a = a_start
+    a_checkpoint = a
+    checkpoint_idx = 0
+    if state:
+        a = a_checkpoint = state["a"]
+        checkpoint_idx = state["chunk_idx"]
+
+    for idx, (exponent, _) in enumerate(chunks):
+        if idx < checkpoint_idx:
+            continue  # já aplicado antes do checkpoint
+        a = pow(a, exponent, n)
+        modmuls += pow_modmuls(exponent)
+        iters += 1
+        if deadline is not None and deadline.expired():
+            return finish(None, None, "timeout", 1, a)
+
+        if (idx + 1) % gcd_interval != 0 and idx + 1 != len(chunks):
+            continue
+
+        d = math.gcd(a - 1, n)
+        gcd_calls += 1
+
+        if progress_interval and iters % progress_interval == 0:
+            print(f"   [Pollard p-1/estágio 1] blocos={iters}/{len(chunks)}, gcd(a-1, n)={d}")
+
+        if d == n:
+            # Backtracking: refaz os blocos desde o último checkpoint, uma potência de primo por vez
+            a = a_checkpoint
+            for _, parts in chunks[checkpoint_idx : idx + 1]:
+                for pk in parts:
+                    a = pow(a, pk, n)
+                    modmuls += pow_modmuls(pk)
+                    d = math.gcd(a - 1, n)
+                    gcd_calls += 1
+                    if d != 1:
+                        break
+                if d != 1:
+                    break
+            if d == n:
+                return finish(None, None, "backtrack_failed", 1, a)
+
+        if 1 < d < n:
+            return finish(d, n // d, "factor_found", 1, a)
+
+        a_checkpoint = a
+        checkpoint_idx = idx + 1
+        save(stage=1, a=a, chunk_idx=checkpoint_idx)
+
+    if B2 <= B1:
+        return finish(None, None, "no_factor", 1, a)
+
+    # ---------------- Estágio 2 (baby-step / giant-step) ----------------
+    # Todo primo q em (B1, B2] é escrito como q = m*D - r, com 0 < r < D e gcd(r, D) = 1.
+    # a^q == 1 (mod p)  <=>  a^(m*D) == a^r (mod p), então acumulamos (a^(m*D) - a^r).
+    if counters is not None:
+        counters.phase("stage2")
+    D = 2310 if B2 - B1 > 2310 * 64 else 210
+
+    # Os primos que dividem D (2..11) não têm resto m*D - q em baby: com B1 < 11 eles entram
+    # direto no expoente e o estágio 2 começa depois de 11. O checkpoint guarda o `a` do
+    # estágio 1 (a1), então a retomada refaz essa dobra uma única vez
+    a1 = a
+    for q in (2, 3, 5, 7, 11):
+        if B1 < q <= B2:
+            a = pow(a, q, n)
+            modmuls += pow_modmuls(q)
+    q_first, gaps = prime_gaps(max(B1, 11), B2)
+    if not q_first:
+        d = math.gcd(a - 1, n)
+        gcd_calls += 1
+        if 1 < d < n:
+            return finish(d, n // d, "factor_found", 2, a)
+        return finish(None, None, "no_factor", 2, a)
+
+    a2 = a * a % n
+    baby = {1: a}
+    power = a
+    for r in range(3, D, 2):
+        power = power * a2 % n
+        if math.gcd(r, D) == 1:
+            baby[r] = power
+
+    aD = pow(a, D, n)
+    m = -(-q_first // D)
+    giant = pow(a, m * D, n)
+    modmuls += D // 2 + pow_modmuls(D) + pow_modmuls(m * D)
+    acc = 1
+    q = q_first
+    primes_done = 0
+
+    # estado do último gcd == 1, para backtracking
+    saved = (q, 0, m, giant, acc)
+    if state and state["stage"] == 2:
+        saved = (state["q"], state["gap_idx"], state["m"], state["giant"], state["acc"])
+        q, _, m, giant, acc = saved
+        primes_done = state["primes_done"]
+
+    for gap_idx in range(saved[1], len(gaps) + 1):
+        while q > m * D:
+            giant = giant * aD % n
+            m += 1
+            modmuls += 1
+        acc = acc * (giant - baby[m * D - q]) % n
+        primes_done += 1
+        iters += 1
+        modmuls += 1
+
+        last = gap_idx == len(gaps)
+        if primes_done % (gcd_interval * 16) == 0 or last:
+            d = math.gcd(acc, n)
+            gcd_calls += 1
+
+            if progress_interval and primes_done % (progress_interval * 16) == 0:
+                print(f"   [Pollard p-1/estágio 2] q={q}, primos={primes_done}, gcd={d}")
+
+            if d == n:
+                # Backtracking: refaz o intervalo testando cada primo isoladamente
+                q, start_idx, m, giant, _ = saved
+                for j in range(start_idx, gap_idx + 1):
+                    while q > m * D:
+                        giant = giant * aD % n
+                        m += 1
+                    d = math.gcd(giant - baby[m * D - q], n)
+                    gcd_calls += 1
+                    if d != 1:
+                        break
+                    q += gaps[j] if j < len(gaps) else 0
+                if d == n:
+                    return finish(None, None, "backtrack_failed", 2, a)
+
+            if 1 < d < n:
+                return finish(d, n // d, "factor_found", 2, a)
+
+            saved = (q + (gaps[gap_idx] if not last else 0), gap_idx + 1, m, giant, acc)
+            if not last:
+                save(stage=2, a=a1, chunk_idx=len(chunks), q=saved[0], gap_idx=saved[1], m=m, giant=giant, acc=acc,
+                     primes_done=primes_done)
+
+            if deadline is not None and deadline.expired():
+                return finish(None, None, "timeout", 2, a)
+
+        if not last:
+            q += gaps[gap_idx]
+
+    return finish(None, None, "no_factor", 2, a)
+
+
+def pollard_p_minus_1_corpus_attack(
+    moduli: Iterable[int],
+    B1: int = 10_000,
+    a_start: int = 2,
+    lanes: int = 4096,
+) -> Dict[int, Tuple[int, int, dict]]:
+    """
+    Estágio 1 do Pollard p-1 para muitos módulos pequenos de uma vez (ataque
+    de corpus, RSABenchmark.run_corpus).
+
+    - Os módulos andam em lotes de `lanes`, uma lane por módulo em
+      MontgomeryLanes; cada bloco do expoente (os mesmos de _stage1_chunks)
+      é um pow com o mesmo expoente em todas as lanes
+    - gcd(a - 1, n) vetorizado depois de cada bloco: a lane que acha fator
+      sai com o bloco em que achou; gcd == n (p-1 e q-1 suaves no mesmo
+      bloco) não é refeito aqui (use pollard_p_minus_1_attack com backtracking)
+    - Módulos >= 2^64 ficam de fora
+    - Devolve {n: (p, q, extra)} para os módulos fatorados
+    """
+    chunks = _stage1_chunks(B1)
+    found: Dict[int, Tuple[int, int, dict]] = {}
+    todo = []
+    for n in sorted(set(moduli)):
+        if n % 2 == 0:
+            if n > 2:
+                found[n] = (2, n // 2, {"status": "factor_found", "method": "p-1/lanes", "stage": 0, "B1": B1})
+        elif lanes_supported(n) and a_start % n > 1:
+            todo.append(n)
+
+    for start in range(0, len(todo), lanes):
+        batch = todo[start : start + lanes]
+        ctx = MontgomeryLanes(batch)
+        a = ctx.to_mont([a_start % n for n in batch])
+        pending = np.ones(len(batch), dtype=bool)
+        for idx, (exponent, _) in enumerate(chunks):
+            a = ctx.pow(a, exponent)
+            x = ctx.from_mont(a)
+            g = np.gcd(np.where(x == 0, ctx.n - np.uint64(1), x - np.uint64(1)), ctx.n)
+            hits = pending & (g > 1)
+            for lane in np.flatnonzero(hits & (g < ctx.n)):
+                n, d = batch[lane], int(g[lane])
+                found[n] = (min(d, n // d), max(d, n // d), {
+                    "status": "factor_found",
+                    "method": "p-1/lanes",
+                    "stage": 1,
+                    "B1": B1,
+                    "chunk": idx + 1,
+                    "engine": ctx.engine,
+                })
+            pending &= ~hits
+            if not pending.any():
+                break
+
+    return found
 
 
 if __name__ == "__main__":
     bench = RSABenchmark(
         key_sizes_bits=(64, 128, 256, 512, 1024),
         seed=42,
+        profile="p_minus_1_smooth",   # p - 1 B-smooth: sai no estágio 1
+        profile_params={"B": 100_000},
     )
 
     results = bench.run(
         pollard_p_minus_1_attack,
         a_start=2,
-        max_iter=1000000000,
+        B1=100_000,            # sem B1/B2: versão clássica (max_iter)
+        B2=10_000_000,
         progress_interval=1000,
     )
 
@@ -0,0 +1,183 @@
+import abc
+import json
+import os
+from typing import Any, Dict, Iterator, List
+
+from BaseAttack import AttackResult
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet é opcional: sem pyarrow só o JSONL funciona
+    pa = pq = None
+
+
+def result_to_row(result: AttackResult, label: str | None = None, attack: str | None = None) -> Dict[str, Any]:
+    """Uma linha do arquivo de resultados (ordem fixa das colunas)."""
+    return {
+        "label": label,
+        "attack": attack,
+        "key_bits": result.key_bits,
+        "n": result.n,
+        "success": result.success,
+        "p": result.p,
+        "q": result.q,
+        "elapsed_seconds": result.elapsed_seconds,
+        "extra": result.extra,
+    }
+
+
+def row_to_result(row: Dict[str, Any]) -> AttackResult:
+    def as_int(value):
+        return int(value) if value is not None else None
+
+    extra = row["extra"]
+    if isinstance(extra, str):
+        extra = json.loads(extra)
+    return AttackResult(
+        row["key_bits"],
+        int(row["n"]),
+        bool(row["success"]),
+        as_int(row["p"]),
+        as_int(row["q"]),
+        row["elapsed_seconds"],
+        extra,
+    )
+
+
+class ResultSink(abc.ABC):
+    """
+    Destino de resultados em streaming para RSABenchmark.run(sink=...).
+
+    Cada AttackResult entra em `write` assim que a chave termina; as linhas
+    são acumuladas e gravadas em grupos de `row_group_size` (e no `close`),
+    então a memória não cresce com o tamanho da varredura e uma queda perde
+    no máximo o grupo em andamento.
+    """
+
+    def __init__(self, path: str, row_group_size: int = 100):
+        self.path = path
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self._buffer: List[Dict[str, Any]] = []
+
+    def write(self, result: AttackResult, label: str | None = None, attack: str | None = None) -> None:
+        self._buffer.append(result_to_row(result, label, attack))
+        if len(self._buffer) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._write_rows(self._buffer)
+            self.rows_written += len(self._buffer)
+            self._buffer = []
+
+    def close(self) -> None:
+        self.flush()
+
+    @abc.abstractmethod
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Grava um grupo de linhas no destino."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonlSink(ResultSink):
+    """Um JSON por linha, em modo append: varreduras seguintes somam ao mesmo arquivo."""
+
+    def __init__(self, path: str, row_group_size: int = 100):
+        super().__init__(path, row_group_size)
+        self._fh = open(path, "a", encoding="utf-8")
+
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        self._fh.write("".join(json.dumps(row, default=str) + "\n" for row in rows))
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        super().close()
+        self._fh.close()
+
+
+class ParquetSink(ResultSink):
+    """
+    Parquet com um row group por `row_group_size` resultados (requer pyarrow).
+
+    n, p e q passam de 64 bits, então são gravados como texto; extra vira
+    uma coluna JSON. Um arquivo Parquet não aceita append: cada sink cria
+    (ou sobrescreve) o seu arquivo.
+    """
+
+    def __init__(self, path: str, row_group_size: int = 1000):
+        if pq is None:
+            raise ImportError("ParquetSink requer pyarrow (pip install pyarrow); use JsonlSink")
+        super().__init__(path, row_group_size)
+        self._schema = pa.schema([
+            ("label", pa.string()),
+            ("attack", pa.string()),
+            ("key_bits", pa.int64()),
+            ("n", pa.string()),
+            ("success", pa.bool_()),
+            ("p", pa.string()),
+            ("q", pa.string()),
+            ("elapsed_seconds", pa.float64()),
+            ("extra", pa.string()),
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        columns = {name: [] for name in self._schema.names}
+        for row in rows:
+            for name in ("n", "p", "q"):
+                row[name] = str(row[name]) if row[name] is not None else None
+            row["extra"] = json.dumps(row["extra"], default=str)
+            for name in columns:
+                columns[name].append(row[name])
+        self._writer.write_table(pa.table(columns, schema=self._schema))
+
+    def close(self) -> None:
+        super().close()
+        self._writer.close()
+
+
+def open_sink(path: str, **kwargs) -> ResultSink:
+    """Escolhe o formato pela extensão: .parquet -> ParquetSink, senão JSONL."""
+    if path.endswith(".parquet"):
+        return ParquetSink(path, **kwargs)
+    return JsonlSink(path, **kwargs)
+
+
+def iter_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """Lê as linhas de um arquivo de resultados sem carregá-lo inteiro."""
+    if path.endswith(".parquet"):
+        if pq is None:
+            raise ImportError("ler .parquet requer pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches():
+            yield from batch.to_pylist()
+        return
+
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue  # última linha cortada por uma queda
+
+
+def read_results(path: str) -> Dict[str, List[AttackResult]]:
+    """
+    Reconstrói {rótulo: [AttackResult, ...]} a partir do arquivo, no formato
+    esperado por print_final_report / export_all_results_to_excel.
+    """
+    grouped: Dict[str, List[AttackResult]] = {}
+    for row in iter_rows(path):
+        label = row.get("label") or row.get("attack") or "resultados"
+        grouped.setdefault(label, []).append(row_to_result(row))
+    return grouped
@@ -0,0 +1,253 @@
+import math
+import os
+from functools import lru_cache
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava de arquivo
+    fcntl = None
+
+# Ímpares por segmento do crivo segmentado (cada segmento cobre 2^21 inteiros)
+SEGMENT_ODDS = 1 << 20
+SEGMENT_BYTES = SEGMENT_ODDS // 8
+
+
+@lru_cache(maxsize=8)
+def _sieve(limit: int) -> bytes:
+    """Crivo de Eratóstenes clássico: byte i == 1 se i é primo (0 <= i <= limit)."""
+    flags = bytearray([1]) * (limit + 1)
+    flags[0] = flags[1] = 0
+    for p in range(2, math.isqrt(limit) + 1):
+        if flags[p]:
+            flags[p * p :: p] = bytes(len(range(p * p, limit + 1, p)))
+    return bytes(flags)
+
+
+def primes_up_to(limit: int) -> List[int]:
+    """Lista de todos os primos p <= limit."""
+    if limit < 2:
+        return []
+    flags = _sieve(limit)
+    return [i for i in range(2, limit + 1) if flags[i]]
+
+
+def primes_between(low: int, high: int) -> List[int]:
+    """Lista dos primos p com low < p <= high (do PrimeCache compartilhado)."""
+    return _shared_cache().primes_array(low, high).tolist()
+
+
+@lru_cache(maxsize=16)
+def prime_gaps(low: int, high: int) -> Tuple[int, bytes]:
+    """
+    Tabela de gaps entre primos consecutivos em (low, high].
+
+    Retorna (primeiro_primo, gaps), onde gaps[i] é a distância entre o
+    i-ésimo e o (i+1)-ésimo primo do intervalo. Todo gap abaixo de
+    ~4·10^8 é < 256, então cabem em bytes. Retorna (0, b"") se o
+    intervalo não tem primos. Os primos vêm dos segmentos do PrimeCache
+    em disco: o estágio 2 do p-1, do p+1 e do ECM não peneira de novo o
+    que outra execução (ou a divisão por tentativa) já peneirou.
+    """
+    primes = _shared_cache().primes_array(low, high)
+    if not len(primes):
+        return (0, b"")
+    gaps = np.diff(primes)
+    if len(gaps) and gaps.max() > 255:
+        raise ValueError("gap entre primos >= 256: intervalo grande demais para a tabela em bytes")
+    return (int(primes[0]), gaps.astype(np.uint8).tobytes())
+
+
+@lru_cache(maxsize=8)
+def prime_power_chunks(bound: int, chunk_bits: int = 512) -> Tuple[Tuple[int, Tuple[int, ...]], ...]:
+    """
+    Divide E = prod(p^k <= bound) em blocos de ~chunk_bits bits.
+
+    Cada bloco é (expoente, (potências de primos que o compõem)), para
+    permitir refazer um bloco potência por potência no backtracking.
+    Compartilhado pelos estágios 1 do Pollard p-1 e do Williams p+1.
+    """
+    chunks = []
+    exponent = 1
+    parts = []
+    for p in primes_up_to(bound):
+        pk = p
+        while pk * p <= bound:
+            pk *= p
+        exponent *= pk
+        parts.append(pk)
+        if exponent.bit_length() >= chunk_bits:
+            chunks.append((exponent, tuple(parts)))
+            exponent = 1
+            parts = []
+    if parts:
+        chunks.append((exponent, tuple(parts)))
+    return tuple(chunks)
+
+
+# ------------------------------
+#  Crivo segmentado com cache em disco
+# ------------------------------
+
+def default_cache_dir() -> str:
+    """Diretório do cache de primos (RSAATTACK_CACHE_DIR ou RSAattack/.cache)."""
+    return os.environ.get(
+        "RSAATTACK_CACHE_DIR",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"),
+    )
+
+
+def _sieve_segment(index: int) -> np.ndarray:
+    """
+    Peneira o segmento `index` (só ímpares) e devolve os bits empacotados:
+    bit i (ordem little) do segmento == 1 se lo + 2*i é primo,
+    com lo = 2 * index * SEGMENT_ODDS + 1.
+    """
+    lo = 2 * index * SEGMENT_ODDS + 1
+    hi = lo + 2 * SEGMENT_ODDS  # exclusivo
+    flags = np.ones(SEGMENT_ODDS, dtype=bool)
+    if index == 0:
+        flags[0] = False  # 1 não é primo
+
+    for p in primes_up_to(math.isqrt(hi - 1))[1:]:
+        start = max(p * p, -(-lo // p) * p)
+        if start % 2 == 0:
+            start += p
+        flags[(start - lo) // 2 :: p] = False
+
+    return np.packbits(flags, bitorder="little")
+
+
+class PrimeCache:
+    """
+    Crivo de Eratóstenes segmentado, só ímpares, empacotado em bits.
+
+    Os segmentos já peneirados ficam em um arquivo (um bit por ímpar) que é
+    lido por memory-map; execuções seguintes (e outros ataques) reaproveitam
+    o arquivo e só peneiram o que ainda não está lá. Com persist=False (ou se
+    o diretório não puder ser criado) os segmentos ficam só em memória.
+    """
+
+    FILENAME = "primes_odd.bin"
+
+    def __init__(self, cache_dir: str | None = None, persist: bool = True):
+        self.path = None
+        self._memory: List[np.ndarray] = []
+        self._map = None
+        self._mapped_segments = 0
+
+        if persist:
+            cache_dir = cache_dir or default_cache_dir()
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                self.path = os.path.join(cache_dir, self.FILENAME)
+                if not os.path.exists(self.path):
+                    open(self.path, "ab").close()
+            except OSError:
+                self.path = None
+
+    def _segments_on_disk(self) -> int:
+        return os.path.getsize(self.path) // SEGMENT_BYTES
+
+    @property
+    def segments(self) -> int:
+        return self._segments_on_disk() if self.path else len(self._memory)
+
+    @property
+    def bound(self) -> int:
+        """Todos os inteiros < bound já estão peneirados."""
+        return 2 * self.segments * SEGMENT_ODDS
+
+    def ensure(self, limit: int) -> None:
+        """Garante que o cache cobre todos os inteiros <= limit."""
+        needed = limit // (2 * SEGMENT_ODDS) + 1
+        if self.path is None:
+            while len(self._memory) < needed:
+                self._memory.append(_sieve_segment(len(self._memory)))
+            return
+
+        if self._segments_on_disk() >= needed:
+            return
+
+        with open(self.path, "ab") as fh:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                # outro processo pode ter estendido o arquivo enquanto esperávamos
+                have = self._segments_on_disk()
+                fh.truncate(have * SEGMENT_BYTES)  # descarta segmento parcial
+                for index in range(have, needed):
+                    fh.write(_sieve_segment(index).tobytes())
+                fh.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def segment(self, index: int) -> np.ndarray:
+        """Bits empacotados do segmento `index` (peneira se ainda não existir)."""
+        self.ensure(2 * (index + 1) * SEGMENT_ODDS - 1)
+        if self.path is None:
+            return self._memory[index]
+
+        if index >= self._mapped_segments:
+            self._mapped_segments = self._segments_on_disk()
+            self._map = np.memmap(self.path, dtype=np.uint8, mode="r",
+                                  shape=(self._mapped_segments * SEGMENT_BYTES,))
+        return self._map[index * SEGMENT_BYTES : (index + 1) * SEGMENT_BYTES]
+
+    def primes_array(self, low: int, high: int) -> np.ndarray:
+        """Primos p com low < p <= high em um array int64 (sem laço em Python por primo)."""
+        if high < 2 or high <= low:
+            return np.zeros(0, dtype=np.int64)
+        low = max(low, 0)
+        self.ensure(high)
+        parts = [np.array([2], dtype=np.int64)] if low < 2 else []
+        for index in range(low // (2 * SEGMENT_ODDS), (high - 1) // (2 * SEGMENT_ODDS) + 1):
+            lo = 2 * index * SEGMENT_ODDS + 1
+            bits = np.unpackbits(self.segment(index), bitorder="little")
+            primes = np.flatnonzero(bits).astype(np.int64) * 2 + lo
+            parts.append(primes[(primes > low) & (primes <= high)])
+        return np.concatenate(parts)
+
+    def iter_primes(self, limit: int | None = None, start: int = 2) -> Iterator[int]:
+        """
+        Gera, em ordem e sob demanda, os primos p com start <= p <= limit
+        (sem limit: gerador infinito).
+        """
+        if start <= 2 and (limit is None or limit >= 2):
+            yield 2
+
+        index = max(start - 1, 0) // (2 * SEGMENT_ODDS)
+        while True:
+            lo = 2 * index * SEGMENT_ODDS + 1
+            if limit is not None and lo > limit:
+                return
+            bits = np.unpackbits(self.segment(index), bitorder="little")
+            primes = np.flatnonzero(bits).astype(np.int64) * 2 + lo
+            for p in primes.tolist():
+                if p < start:
+                    continue
+                if limit is not None and p > limit:
+                    return
+                yield p
+            index += 1
+
+
+_default_cache: PrimeCache | None = None
+
+
+def _shared_cache() -> PrimeCache:
+    """PrimeCache do processo, no diretório padrão (o mesmo arquivo para todos os ataques)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = PrimeCache()
+    return _default_cache
+
+
+def iter_primes(limit: int | None = None, start: int = 2, cache_dir: str | None = None) -> Iterator[int]:
+    """Primos em [start, limit] a partir do cache compartilhado em disco."""
+    if cache_dir is not None:
+        return PrimeCache(cache_dir).iter_primes(limit, start)
+    return _shared_cache().iter_primes(limit, start)
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Os módulos do RSAattack são planos (sem pacote): os testes importam direto da pasta.
+# A raiz do repositório vem junto para o pacote primality compartilhado
+_here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_here, "..", ".."))
+sys.path.insert(0, os.path.join(_here, ".."))
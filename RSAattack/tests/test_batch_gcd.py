@@ -0,0 +1,37 @@
+import math
+
+from BaseAttack import RSABenchmark
+from BatchGCD import batch_gcd, batch_gcd_attack, load_moduli
+
+P = (1000003, 1000033, 1000037, 1000039, 1000081, 1000099, 1000117)
+
+
+def _naive(moduli):
+    return [math.gcd(n, math.prod(moduli[:i] + moduli[i + 1:])) for i, n in enumerate(moduli)]
+
+
+def test_batch_gcd_matches_pairwise_products():
+    moduli = [P[0] * P[1], P[2] * P[3], P[0] * P[4], P[5] * P[6], P[3] * P[5]]
+    assert batch_gcd(moduli) == _naive(moduli)
+    assert batch_gcd([P[0] * P[1]]) == [1]
+
+
+def test_attack_splits_moduli_with_both_primes_shared():
+    # P[0]·P[1] divide o produto dos outros (gcd == n): sai dos gcds par a par
+    moduli = [P[0] * P[1], P[0] * P[2], P[1] * P[3], P[4] * P[5]]
+    found = batch_gcd_attack(moduli)
+    assert set(found) == set(moduli[:3])
+    for n, (p, q, extra) in found.items():
+        assert p * q == n and p in P and q in P
+
+
+def test_run_corpus_with_shared_primes(tmp_path):
+    bench = RSABenchmark(key_sizes_bits=(64,), keys_per_size=12, shared_primes=4, seed=23, quiet=True, key_cache=False)
+    results = bench.run_corpus(batch_gcd_attack)
+    assert sum(r.success for r in results) >= 4
+    assert all(r.p * r.q == r.n for r in results if r.success)
+
+    path = tmp_path / "moduli.txt"
+    path.write_text("# corpus\n" + "\n".join(hex(key["n"]) for key in bench.keys) + "\n\n")
+    assert load_moduli(str(path)) == [key["n"] for key in bench.keys]
+    assert set(batch_gcd_attack(str(path))) == {r.n for r in results if r.success}
@@ -0,0 +1,41 @@
+import os
+import time
+
+from BaseAttack import RSABenchmark
+from fermat import fermat_factor
+
+
+def _bench():
+    return RSABenchmark(key_sizes_bits=(16, 20, 24), keys_per_size=3, seed=11, quiet=True, key_cache=False)
+
+
+def _pid_attack(n, e):
+    # devolve o pid do processo que atacou, para conferir que cada chave rodou fora do harness
+    p, q, extra = fermat_factor(n, e)
+    extra["pid"] = os.getpid()
+    return (p, q, extra)
+
+
+def _stubborn_attack(n, e):
+    time.sleep(600)  # não aceita deadline: só o hard kill do harness para este ataque
+    return (None, None, {})
+
+
+def test_parallel_matches_sequential_in_key_order():
+    bench = _bench()
+    sequential = bench.run(fermat_factor)
+    parallel = bench.run(_pid_attack, workers=3)
+
+    assert [r.n for r in parallel] == [key["n"] for key in bench.keys]
+    assert [(r.p, r.q, r.success) for r in parallel] == [(r.p, r.q, r.success) for r in sequential]
+    assert all(r.success for r in parallel)
+    assert os.getpid() not in {r.extra["pid"] for r in parallel}
+
+
+def test_parallel_kills_attack_past_deadline():
+    bench = RSABenchmark(key_sizes_bits=(16,), keys_per_size=2, seed=11, quiet=True, key_cache=False)
+    start = time.perf_counter()
+    results = bench.run(_stubborn_attack, workers=2, timeout_seconds=0.2)
+    assert time.perf_counter() - start < 30
+    assert [r.extra.get("status") for r in results] == ["timeout", "timeout"]
+    assert all(r.extra.get("killed") for r in results)
@@ -0,0 +1,50 @@
+import hashlib
+import os
+
+from BaseAttack import Checkpoint, RSABenchmark
+
+
+def test_save_load_kind_and_clear(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "state.json"), interval_seconds=3600)
+    assert checkpoint.load("rho/floyd") is None
+    assert not checkpoint.due()
+
+    checkpoint.save("rho/floyd", x=1 << 100, iters=7)
+    assert checkpoint.load("rho/floyd") == {"x": 1 << 100, "iters": 7, "kind": "rho/floyd"}
+    assert checkpoint.load("p-1/bounds") is None  # estado de outro ataque nunca é reaproveitado
+    assert not os.path.exists(checkpoint.path + ".tmp")
+
+    checkpoint.clear()
+    checkpoint.clear()
+    assert checkpoint.load("rho/floyd") is None
+
+
+def _resumable(n, e, checkpoint):
+    """Conta quantas vezes rodou; quebra a chave na segunda execução."""
+    state = checkpoint.load("test") or {"runs": 0}
+    checkpoint.save("test", runs=state["runs"] + 1)
+    if state["runs"] == 0:
+        return (None, None, {"status": "timeout"})
+    p = next(d for d in range(3, n, 2) if n % d == 0)
+    return (p, n // p, {"status": "factor_found", "resumed_from": state["runs"]})
+
+
+def test_run_resumes_from_checkpoint_per_key_and_repeat(tmp_path):
+    bench = RSABenchmark(key_sizes_bits=(16,), keys_per_size=2, seed=29, quiet=True, key_cache=False)
+    directory = str(tmp_path)
+
+    first = bench.run(_resumable, checkpoint_dir=directory, repeats=2)
+    assert not any(r.success for r in first)
+    expected = {
+        f"_resumable_{hashlib.sha1(str(key['n']).encode()).hexdigest()}_r{rep}.json"
+        for key in bench.keys for rep in range(2)
+    }
+    assert set(os.listdir(directory)) == expected
+
+    second = bench.run(_resumable, checkpoint_dir=directory, repeats=2, resume=True)
+    assert all(r.success and r.extra["resumed_from"] == 1 for r in second)
+    assert os.listdir(directory) == []  # chave quebrada: checkpoint apagado
+
+    # sem resume o estado anterior é descartado
+    bench.run(_resumable, checkpoint_dir=directory)
+    assert not any(r.success for r in bench.run(_resumable, checkpoint_dir=directory))
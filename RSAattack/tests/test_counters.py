@@ -0,0 +1,42 @@
+import importlib
+import time
+
+from BaseAttack import AttackCounters, AttackResult, RSABenchmark, throughput_of
+
+pollard_p_minus_1 = importlib.import_module("pollard-p-1")
+
+
+def test_counters_phases_and_reset():
+    counters = AttackCounters()
+    assert not counters.recorded()
+    counters.phase("stage1")
+    counters.add(iters=10, modmuls=40)
+    time.sleep(0.01)
+    counters.phase("stage2")
+    counters.add(iters=5, gcds=2)
+    counters.phase("stage1")  # fase repetida soma o tempo
+    out = counters.as_dict()
+    assert (out["iters"], out["gcds"], out["modmuls"], out["isqrts"]) == (15, 2, 40, 0)
+    assert set(out["phases"]) == {"stage1", "stage2"} and out["phases"]["stage1"] >= 0.01
+
+    counters.reset()
+    assert not counters.recorded() and counters.as_dict() == dict.fromkeys(AttackCounters.FIELDS, 0)
+
+
+def test_harness_injects_counters():
+    bench = RSABenchmark(key_sizes_bits=(40,), keys_per_size=2, seed=41, quiet=True, key_cache=False,
+                         profile="p_minus_1_smooth", profile_params={"B": 500})
+    results = bench.run(pollard_p_minus_1.pollard_p_minus_1_attack, B1=500)
+    for r in results:
+        counted = r.extra["counters"]
+        assert r.success and counted["modmuls"] > 0 and counted["gcds"] > 0
+        assert "stage1" in counted["phases"]
+        rates = throughput_of(r)
+        assert rates["modmuls_per_s"] == counted["modmuls"] / r.elapsed_seconds
+
+
+def test_throughput_without_counters():
+    result = AttackResult(32, 15, True, 3, 5, 0.5, {"iters": 100})
+    assert throughput_of(result) == {"iters_per_s": 200.0, "modmuls_per_s": None}
+    result = AttackResult(32, 15, False, None, None, 0.0, {"iters": 100})
+    assert throughput_of(result) == {"iters_per_s": None, "modmuls_per_s": None}
@@ -0,0 +1,39 @@
+import time
+
+from BaseAttack import Deadline, RSABenchmark
+from DivisaoPorTentativa import TimeoutFlag
+from fermat import fermat_factor
+
+
+def test_deadline_without_timeout_never_expires():
+    deadline = Deadline(None)
+    assert deadline.remaining() is None
+    assert not deadline.expired()
+    assert not any(deadline.tick() for _ in range(5000))
+
+
+def test_tick_reads_the_clock_every_check_every_calls():
+    deadline = Deadline(0.0, check_every=4)
+    time.sleep(0.001)
+    assert [deadline.tick() for _ in range(4)] == [False, False, False, True]
+    assert deadline.expired() and deadline.remaining() == 0.0
+    assert deadline.tick(100)  # um bloco de passos de uma vez
+
+    deadline.reset()
+    assert not deadline.timeout_flag
+
+
+def test_timeout_flag_is_a_deadline():
+    flag = TimeoutFlag()
+    assert isinstance(flag, Deadline) and flag.timeout_seconds == 10
+
+
+def test_run_passes_a_fresh_deadline_per_key():
+    # p e q aleatórios de 48 bits: o Fermat levaria ~|p - q|^2 / sqrt(n) passos, só o prazo o para
+    bench = RSABenchmark(key_sizes_bits=(96,), keys_per_size=2, seed=31, quiet=True, key_cache=False,
+                         profile="balanced")
+    start = time.perf_counter()
+    results = bench.run(fermat_factor, timeout_seconds=0.2)
+    assert time.perf_counter() - start < 10
+    assert [r.extra["status"] for r in results] == ["timeout", "timeout"]
+    assert all(0.2 <= r.elapsed_seconds < 5 for r in results)
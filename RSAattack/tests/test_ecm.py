@@ -0,0 +1,35 @@
+import contextlib
+import io
+import math
+
+from BaseAttack import RSABenchmark
+from ECM import _ecm_one_curve, ecm_attack, ecm_corpus_attack
+
+
+def _keys(bits, count=10):
+    with contextlib.redirect_stdout(io.StringIO()):
+        bench = RSABenchmark(key_sizes_bits=bits, keys_per_size=count, seed=3, quiet=True, key_cache=False)
+    return [key["n"] for key in bench.keys]
+
+
+def test_ecm_small_moduli_with_default_bounds():
+    # com B1 = 50000 as duas ordens ficam lisas ao mesmo tempo (gcd == n) sem backtracking
+    for n in _keys((20, 24, 28, 32)):
+        p, q, extra = ecm_attack(n, 65537, curves=50, seed=1, progress_interval=0)
+        assert p is not None and p * q == n, extra
+        r = math.isqrt(n)
+        assert extra["B1"] <= r + 2 * math.isqrt(r) + 2  # limite de Hasse do menor primo
+
+
+def test_ecm_corpus_attack_32_bits():
+    moduli = _keys((32,))
+    found = ecm_corpus_attack(moduli, seed=1)
+    assert set(found) == set(moduli)
+    assert all(p * q == n for n, (p, q, _) in found.items())
+
+
+def test_stage2_covers_primes_below_half_d():
+    # ponto de ordem 83 (10007), 41 (10009) e 71 (10061) depois do estágio 1 com B1 = 20;
+    # B2 = 100 < D/2: o plano de passos gigantes fica vazio e só a dobra acha o primo
+    for p, sigma in ((10007, 12), (10009, 19), (10061, 12)):
+        assert _ecm_one_curve(p * 1000000007, sigma, 20, 100) == (p, 2)
@@ -0,0 +1,38 @@
+import pytest
+
+from Factorize import FactorCache, factorize, factorize_attack
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3])
+def test_attack_invalid_input(n):
+    assert factorize_attack(n, 65537, cache={}) == (None, None, {"status": "invalid_input", "method": "factorize"})
+
+
+def test_attack_prime_and_composite():
+    assert factorize_attack(1000003, 65537, cache={})[2]["status"] == "prime"
+    p, q, extra = factorize_attack(2 ** 3 * 1000003 ** 2, 65537, cache={})
+    assert (p, q) == (2, 4 * 1000003 ** 2)
+    assert extra["factors"] == [[2, 3], [1000003, 2]]
+
+
+def test_factorize():
+    assert factorize(1, cache={}) == {}
+    n = 4294967311 * 8589934609 * 3 ** 5
+    assert factorize(n, cache={}) == {3: 5, 4294967311: 1, 8589934609: 1}
+
+
+def test_factorize_balanced_cofactor():
+    # 2 * 3 * (p * q) com p, q de 50 bits: o ECM curto não separa, o SIQS sim
+    p, q = 1094651655346339, 1125899906842679
+    assert factorize(6 * p * q, cache={}) == {2: 1, 3: 1, p: 1, q: 1}
+
+
+def test_factor_cache_is_bounded_lru():
+    cache = FactorCache(maxsize=2)
+    cache[10] = {2: 1, 5: 1}
+    cache[21] = {3: 1, 7: 1}
+    assert cache.get(10) == {2: 1, 5: 1}  # 10 passa a ser o mais recente
+    cache[22] = {2: 1, 11: 1}
+    assert list(cache) == [10, 22]
+    factorize(2 * 3 * 5 * 7 * 11 * 13, cache=cache)
+    assert len(cache) == 2
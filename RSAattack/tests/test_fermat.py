@@ -0,0 +1,47 @@
+import math
+
+from BaseAttack import AttackCounters
+from fermat import fermat_factor
+from intmath import square_root
+from primality import is_prime
+
+
+def _next_prime(m):
+    while not is_prime(m):
+        m += 1
+    return m
+
+
+def test_square_root_filters_keep_every_square():
+    for m in range(100_000):
+        s = math.isqrt(m)
+        assert square_root(m) == (s if s * s == m else -1)
+    big = (1 << 200) + 12345
+    assert square_root(big * big) == big and square_root(big * big + 1) == -1
+    assert square_root(-4) == -1
+
+
+def test_close_factors_and_residue_filters():
+    p = _next_prime(1 << 40)
+    q = _next_prime(p + (1 << 28))
+    counters = AttackCounters()
+    f, g, extra = fermat_factor(p * q, counters=counters)
+    assert (f, g) == (p, q) and extra["status"] == "factor_found"
+    # os filtros mod 64 e mod 45045 barram quase todos os b2 antes do isqrt
+    assert counters.iters == extra["iters"] > 1000
+    assert counters.isqrts * 20 < counters.iters
+
+
+def test_multipliers_find_unbalanced_ratio():
+    p = _next_prime(1 << 30)
+    q = _next_prime(3 * p)
+    n = p * q
+    assert fermat_factor(n, max_iters=20_000)[2]["status"] == "max_iter_reached"
+    f, g, extra = fermat_factor(n, max_iters=20_000, multipliers=(1, 2, 3, 6))
+    assert (f, g) == (p, q) and extra["multiplier"] == 3
+
+
+def test_prime_and_trivial_inputs():
+    assert fermat_factor(1_000_003)[2]["status"] == "no_factor"
+    assert fermat_factor(3)[2]["status"] == "invalid_input"
+    assert fermat_factor(2 * 1_000_003)[:2] == (2, 1_000_003)
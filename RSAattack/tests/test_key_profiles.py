@@ -0,0 +1,51 @@
+import importlib
+
+from BaseAttack import RSABenchmark
+from fermat import fermat_factor
+from keycorpus import generate_pairs
+from Wiener import wiener_attack
+from Williams_p_plus_1 import williams_p_plus_1_attack
+
+pollard_p_minus_1 = importlib.import_module("pollard-p-1")
+
+
+def _is_smooth(m, B):
+    for f in range(2, B + 1):
+        while m % f == 0:
+            m //= f
+    return m == 1
+
+
+def _pairs(profile, **params):
+    return generate_pairs([64], keys_per_size=3, seed=23, profile=profile, profile_params=params)
+
+
+def test_close_pairs_fall_to_fermat():
+    for bits, p, q, _ in _pairs("close"):
+        assert (p * q).bit_length() == bits and 0 < q - p < 1 << (bits // 4)
+        f, g, extra = fermat_factor(p * q, max_iters=10)
+        assert {f, g} == {p, q} and extra["iters"] <= 1
+
+
+def test_p_minus_1_smooth_pairs_fall_to_stage_one():
+    for _, p, q, _ in _pairs("p_minus_1_smooth", B=500):
+        assert _is_smooth(p - 1, 500)
+        f, g, _ = pollard_p_minus_1.pollard_p_minus_1_attack(p * q, 65537, B1=500, B2=500)
+        assert {f, g} == {p, q}
+
+
+def test_p_plus_1_smooth_pairs_fall_to_williams():
+    for _, p, q, _ in _pairs("p_plus_1_smooth", B=500):
+        assert _is_smooth(p + 1, 500)
+        f, g, _ = williams_p_plus_1_attack(p * q, 65537, B1=500, B2=500)
+        assert {f, g} == {p, q}
+
+
+def test_small_d_keys_fall_to_wiener():
+    bench = RSABenchmark(key_sizes_bits=(128,), keys_per_size=3, seed=23, quiet=True, key_cache=False,
+                         profile="small_d")
+    for key in bench.keys:
+        assert key["d"].bit_length() == 128 // 4 - 2
+        assert key["e"] * key["d"] % key["phi"] == 1
+        p, q, _ = wiener_attack(key["n"], key["e"])
+        assert {p, q} == {key["p"], key["q"]}
@@ -0,0 +1,47 @@
+import pytest
+
+from keycorpus import CorpusFile, corpus_path, generate_pairs, load_or_generate, save_corpus
+
+
+def test_generate_pairs_is_deterministic():
+    serial = generate_pairs([32, 48], keys_per_size=3, seed=11)
+    assert generate_pairs([32, 48], keys_per_size=3, seed=11, processes=2) == serial
+    assert [bits for bits, *_ in serial] == [32, 32, 32, 48, 48, 48]
+    assert all((p * q).bit_length() in (bits - 1, bits) and p != q and d is None for bits, p, q, d in serial)
+    assert generate_pairs([32, 48], keys_per_size=3, seed=12) != serial
+
+    with pytest.raises(ValueError):
+        generate_pairs([32], profile="nope")
+
+
+def test_disk_cache_round_trip(tmp_path):
+    pairs, cached = load_or_generate([40], keys_per_size=2, seed=5, cache_dir=str(tmp_path))
+    assert not cached
+    again, cached = load_or_generate([40], keys_per_size=2, seed=5, cache_dir=str(tmp_path))
+    assert cached and again == pairs
+
+    # sem seed não há cache
+    _, cached = load_or_generate([40], keys_per_size=2, seed=None, cache_dir=str(tmp_path))
+    assert not cached
+
+
+def test_corpus_file_keeps_d_and_rejects_garbage(tmp_path):
+    path = str(tmp_path / "keys" / "c.bin")
+    pairs = [(16, 251, 241, None), (16, 239, 233, 12345)]
+    save_corpus(path, pairs)
+    with CorpusFile(path) as corpus:
+        assert len(corpus) == 2 and list(corpus) == pairs
+        with pytest.raises(IndexError):
+            corpus[2]
+
+    with open(path, "wb") as fh:
+        fh.write(b"\0" * 64)
+    with pytest.raises(ValueError):
+        CorpusFile(path)
+    # corpus corrompido: gera de novo em vez de falhar
+    bad = corpus_path([16], 1, 65537, 1, str(tmp_path))
+    save_corpus(bad, [])
+    with open(bad, "r+b") as fh:
+        fh.write(b"XXXX")
+    pairs, cached = load_or_generate([16], keys_per_size=1, seed=1, cache_dir=str(tmp_path))
+    assert not cached and len(pairs) == 1
@@ -0,0 +1,51 @@
+import random
+
+import numpy as np
+import pytest
+
+from montgomery import MontgomeryLanes, lanes_supported
+
+U32 = [3, 65537, 4294967291, 2147483647]
+# inclui n >= 2^63, onde add e a REDC precisam detectar o carry
+U64 = [4294967311, 18446744073709551557, 9223372036854775837, (1 << 63) + 1, 1000000007 * 998244353]
+
+
+@pytest.mark.parametrize("moduli, engine", [(U32, "u32"), (U64, "u64")])
+def test_lanes_match_python_modmul(moduli, engine):
+    rng = random.Random(7)
+    lanes = MontgomeryLanes(moduli)
+    assert lanes.engine == engine
+    for _ in range(50):
+        a = [rng.randrange(n) for n in moduli]
+        b = [rng.randrange(n) for n in moduli]
+        c = [rng.randrange(n) for n in moduli]
+        ma, mb, mc = lanes.to_mont(a), lanes.to_mont(b), lanes.to_mont(c)
+        assert [int(x) for x in lanes.from_mont(ma)] == a
+        assert [int(x) for x in lanes.from_mont(lanes.mul(ma, mb))] == [x * y % n for x, y, n in zip(a, b, moduli)]
+        assert [int(x) for x in lanes.from_mont(lanes.add(ma, mb))] == [(x + y) % n for x, y, n in zip(a, b, moduli)]
+        assert [int(x) for x in lanes.from_mont(lanes.sub(ma, mb))] == [(x - y) % n for x, y, n in zip(a, b, moduli)]
+        assert [int(x) for x in lanes.from_mont(lanes.sqr_add(ma, mc))] == [
+            (x * x + y) % n for x, y, n in zip(a, c, moduli)
+        ]
+        e = rng.randrange(1 << 40)
+        assert [int(x) for x in lanes.from_mont(lanes.pow(ma, e))] == [pow(x, e, n) for x, n in zip(a, moduli)]
+
+
+def test_lane_subsets_and_replace():
+    lanes = MontgomeryLanes(U64)
+    sub = np.array([1, 3])
+    a = lanes.to_mont([5, 7], sub)
+    assert [int(x) for x in lanes.from_mont(lanes.mul(a, a, sub), sub)] == [25, 49]
+
+    lanes.replace([0], [1000003])
+    x = lanes.to_mont([999999, 2, 3, 4, 5])
+    assert int(lanes.from_mont(lanes.sqr(x))[0]) == 999999 ** 2 % 1000003
+
+
+def test_invalid_moduli():
+    for moduli in ([], [4], [1], [1 << 64 | 1]):
+        with pytest.raises(ValueError):
+            MontgomeryLanes(moduli)
+    with pytest.raises(ValueError):
+        MontgomeryLanes(U32).replace([0], [4294967311])  # não cabe na engine u32
+    assert lanes_supported(3) and not lanes_supported(1 << 64 | 1) and not lanes_supported(10)
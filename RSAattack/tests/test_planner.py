@@ -0,0 +1,71 @@
+import pytest
+
+from BaseAttack import AttackResult
+from Planner import P_MINUS_1_B1, learn_stage_budgets, p_minus_1_bound, planned_attack
+from keycorpus import generate_pairs
+from results_sink import JsonlSink
+
+
+# orçamento 0 pula Fermat e p-1: o último estágio é quem fatora
+SKIP = {0: {"fermat": 0, "p_minus_1": 0}}
+
+
+def _pair(bits, profile, **params):
+    _, p, q, _ = generate_pairs([bits], seed=29, profile=profile, profile_params=params)[0]
+    return p, q
+
+
+@pytest.mark.parametrize("bits, profile, params, skip, method", [
+    (96, "balanced", {}, None, None),  # trocado abaixo por um fator pequeno
+    (128, "close", {}, None, "fermat"),
+    (128, "p_minus_1_smooth", {"B": 2_000}, None, "p_minus_1"),
+    (56, "balanced", {}, SKIP, "rho"),
+])
+def test_each_stage_factors_its_keys(bits, profile, params, skip, method):
+    p, q = _pair(bits, profile, **params)
+    if method is None:
+        p, method = 65521, "trial_division"
+    f, g, extra = planned_attack(p * q, 65537, budget_seconds=30, stage_budgets=skip)
+    assert {f, g} == {p, q} and extra["method"] == method
+    assert extra["stages"][-1]["stage"] == method and extra["stages"][-1]["status"] == "factor_found"
+
+
+def test_ecm_above_rho_range_and_budget():
+    p, q = 1000000007, (1 << 89) - 1  # fator de 30 bits em n de 119 bits
+    f, g, extra = planned_attack(p * q, 65537, budget_seconds=60, stage_budgets=SKIP)
+    assert (f, g) == (p, q) and extra["method"] == "ecm"
+
+    p, q = _pair(160, "balanced")
+    f, g, extra = planned_attack(p * q, 65537, budget_seconds=0.5)
+    assert f is None and extra["status"] == "timeout"
+    assert sum(stage["seconds"] for stage in extra["stages"]) < 2
+
+    assert planned_attack((1 << 61) - 1, 65537)[2]["status"] == "prime"
+
+
+def test_p_minus_1_bound():
+    assert p_minus_1_bound(1 << 127 | 1, None) == P_MINUS_1_B1
+    n = (1 << 255) + 95
+    bounds = [p_minus_1_bound(n, s) for s in (0.01, 0.1, 1.0)]
+    assert bounds == sorted(bounds) and bounds[0] < bounds[-1]
+    for B1 in bounds:
+        top = 1 << (B1.bit_length() - 1)
+        assert B1 in (top, top * 3 // 2)
+
+
+def test_learned_budgets(tmp_path):
+    path = str(tmp_path / "hist.jsonl")
+    with JsonlSink(path) as sink:
+        for i in range(5):
+            ok = i < 2
+            sink.write(AttackResult(64, 15, ok, 3 if ok else None, 5 if ok else None, 0.001 if ok else 0.5, {}),
+                       label="h", attack="fermat_factor")
+            sink.write(AttackResult(64, 15, True, 3, 5, 0.01, {}), label="h", attack="pollard_p_minus_1_attack")
+            sink.write(AttackResult(64, 15, True, 3, 5, 2.0, {}), label="h", attack="pollard_rho_attack")
+    learned = learn_stage_budgets(path)
+    assert set(learned) == {64}
+    assert learned[64]["fermat"] == 0.001 and learned[64]["p_minus_1"] == 0.01
+
+    _, _, extra = planned_attack(65521 * 65537 * 3, 65537, stage_budgets={80: {"fermat": 0}}, trial_bound=2)
+    assert extra["learned_budgets"] == {"fermat": 0}
+    assert [stage["stage"] for stage in extra["stages"]][:2] == ["trial_division", "p_minus_1"]
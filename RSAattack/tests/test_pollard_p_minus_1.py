@@ -0,0 +1,50 @@
+import importlib
+
+import pytest
+
+from BaseAttack import Checkpoint
+
+pollard_p_minus_1 = importlib.import_module("pollard-p-1")
+
+# p - 1 = 2 * 3 * 5 * 7 * 13: sai com qualquer B1 pequeno desde que B2 >= 13,
+# inclusive quando os primos que dividem D (2, 3, 5, 7) caem no estágio 2
+P = 2731
+Q = 1000003  # q - 1 = 2 * 3 * 166667
+
+
+@pytest.mark.parametrize("B1", [2, 3, 5, 7, 11, 12, 13])
+def test_small_b1_stage2(B1):
+    p, q, extra = pollard_p_minus_1.pollard_p_minus_1_attack(P * Q, 65537, B1=B1, B2=100, progress_interval=0)
+    assert (p, q) == (P, Q), extra
+
+
+def test_b2_below_eleven():
+    # estágio 2 só com os primos <= 11 dobrados no expoente
+    p, q, extra = pollard_p_minus_1.pollard_p_minus_1_attack(31 * 1000003, 65537, B1=2, B2=5, progress_interval=0)
+    assert (p, q) == (31, 1000003), extra
+
+
+class _ExpiresAfter:
+    """Prazo que estoura na chamada número `calls` de expired()."""
+
+    def __init__(self, calls: int):
+        self.calls = calls
+
+    def expired(self) -> bool:
+        self.calls -= 1
+        return self.calls <= 0
+
+
+def test_stage2_resume_with_small_b1(tmp_path):
+    # p - 1 = 2 * 3 * 5 * 1009: 5 é dobrado no expoente antes do estágio 2 e 1009 sai no estágio 2
+    p, q = 30271, 1000003
+    checkpoint = Checkpoint(str(tmp_path / "p-1.json"), interval_seconds=0)
+    kwargs = dict(B1=3, B2=2000, gcd_interval=1, progress_interval=0, checkpoint=checkpoint)
+
+    # 1 chamada no estágio 1, a segunda logo depois do primeiro checkpoint do estágio 2
+    _, _, extra = pollard_p_minus_1.pollard_p_minus_1_attack(p * q, 65537, deadline=_ExpiresAfter(2), **kwargs)
+    assert extra["status"] == "timeout" and extra["stage"] == 2
+    assert checkpoint.load("p-1/bounds")["stage"] == 2
+
+    found = pollard_p_minus_1.pollard_p_minus_1_attack(p * q, 65537, **kwargs)
+    assert found[:2] == (p, q), found[2]
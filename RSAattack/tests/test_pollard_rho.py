@@ -0,0 +1,43 @@
+import pytest
+
+from BaseAttack import RSABenchmark
+from Pollard_Rho import pollard_rho_attack, pollard_rho_corpus_attack
+
+
+def _keys(bits, count=4):
+    bench = RSABenchmark(key_sizes_bits=bits, keys_per_size=count, seed=5, quiet=True, key_cache=False)
+    return [key["n"] for key in bench.keys]
+
+
+@pytest.mark.parametrize("variant", ["floyd", "brent"])
+def test_rho_variants_factor_small_keys(variant):
+    for n in _keys((20, 28, 36)):
+        p, q, extra = pollard_rho_attack(n, 65537, c_start=1, variant=variant, progress_interval=1 << 62)
+        assert p is not None and p * q == n, (n, extra)
+
+
+def test_brent_batches_gcds():
+    # batch enorme: um gcd por bloco de Brent (quando o produto acumulado pega os dois
+    # primos e o gcd dá n, o bloco é refeito passo a passo)
+    for n in _keys((20, 24)):
+        p, q, extra = pollard_rho_attack(n, 65537, c_start=1, variant="brent", batch=1 << 16, progress_interval=1 << 62)
+        assert p is not None and p * q == n, (n, extra)
+        assert extra["gcd_calls"] < extra["iters"]
+
+
+@pytest.mark.parametrize("bits", [24, 40, 56])
+def test_lanes_variant(bits):
+    for n in _keys((bits,), count=2):
+        p, q, extra = pollard_rho_attack(n, 65537, variant="lanes", lanes=32, progress_interval=1 << 62)
+        assert p is not None and p * q == n, (n, extra)
+        assert extra["variant"] == "lanes"
+
+
+@pytest.mark.parametrize("min_wide_lanes", [0, 768])
+def test_corpus_attack(min_wide_lanes):
+    # min_wide_lanes=0 força a engine u64 (2 limbs) para os módulos >= 2^32; 768 os manda ao Brent escalar
+    moduli = _keys((20, 28, 40, 52), count=3)
+    found = pollard_rho_corpus_attack(moduli, lanes=64, seed=1, min_wide_lanes=min_wide_lanes)
+    assert set(found) == set(moduli)
+    for n, (p, q, extra) in found.items():
+        assert p * q == n and 1 < p < n, (n, extra)
@@ -0,0 +1,79 @@
+import multiprocessing
+import os
+import signal
+import time
+
+import pytest
+
+from Portfolio import portfolio_attack
+from fermat import fermat_factor
+
+
+def _sleeper(n, e, pid_dir):
+    open(os.path.join(pid_dir, str(os.getpid())), "w").close()
+    time.sleep(600)
+    return (None, None, {"status": "no_factor"})
+
+
+def _slow(n, e):
+    time.sleep(600)
+    return (None, None, {"status": "no_factor"})
+
+
+def _wrong(n, e):
+    return (3, 5, {"status": "factor_found"})  # "fator" falso: não pode vencer
+
+
+def test_first_valid_factor_wins_and_others_are_cancelled():
+    n = 1000003 * 1000033
+    start = time.perf_counter()
+    p, q, extra = portfolio_attack(n, 65537, attacks={"slow": _slow, "wrong": _wrong, "fermat": fermat_factor})
+    assert time.perf_counter() - start < 30
+    assert (p, q) == (1000003, 1000033)
+    assert extra["status"] == "factor_found"
+    assert extra["winner"] == "fermat"
+    assert extra["method_status"]["fermat"] == "won"
+    assert extra["method_status"]["slow"] == "cancelled"
+    # "wrong" termina antes ou é cancelado junto, conforme a ordem de chegada
+    assert extra["method_status"]["wrong"] in ("failed", "cancelled")
+    assert set(extra["method_times"]) == {"slow", "wrong", "fermat"}
+
+
+def test_race_timeout():
+    p, q, extra = portfolio_attack(1000003 * 1000033, 65537, attacks={"a": _slow, "b": _slow}, timeout_seconds=0.3)
+    assert (p, q) == (None, None)
+    assert extra["status"] == "timeout"
+    assert extra["winner"] is None
+    assert extra["method_status"] == {"a": "timeout", "b": "timeout"}
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGTERM") or os.name != "posix", reason="precisa de SIGTERM (POSIX)")
+def test_terminate_kills_racing_children(tmp_path):
+    attacks = {"a": _sleeper, "b": _sleeper}
+    kwargs = {name: {"pid_dir": str(tmp_path)} for name in attacks}
+    proc = multiprocessing.Process(target=portfolio_attack, args=(15, 3, attacks, kwargs))
+    proc.start()
+
+    limit = time.monotonic() + 30
+    while len(os.listdir(tmp_path)) < 2 and time.monotonic() < limit:
+        time.sleep(0.05)
+    children = [int(name) for name in os.listdir(tmp_path)]
+    assert len(children) == 2
+
+    # o que o harness faz com um ataque que estourou o prazo
+    proc.terminate()
+    proc.join(10)
+    assert not proc.is_alive()
+
+    limit = time.monotonic() + 10
+    while any(_alive(pid) for pid in children) and time.monotonic() < limit:
+        time.sleep(0.05)
+    assert not any(_alive(pid) for pid in children)
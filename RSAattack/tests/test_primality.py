@@ -0,0 +1,51 @@
+import importlib.util
+import os
+
+import pytest
+
+from primality import (
+    is_prime,
+    is_prime_deterministic,
+    is_strong_lucas_probable_prime,
+    is_strong_probable_prime,
+)
+from sieve import primes_up_to
+
+M61, M89, M127 = (1 << 61) - 1, (1 << 89) - 1, (1 << 127) - 1
+
+
+def test_matches_sieve():
+    primes = set(primes_up_to(200_000))
+    for n in range(-5, 200_000):
+        assert is_prime(n) == (n in primes)
+        if n >= 0:
+            assert is_prime_deterministic(n) == (n in primes)
+
+
+def test_pseudoprimes_are_rejected():
+    # 1093^2: pseudoprimo forte na base 2 (primo de Wieferich) que passa pela divisão; o teste de quadrado o barra
+    assert is_strong_probable_prime(1093 ** 2, 2) and not is_prime(1093 ** 2)
+    # 5777 = 53 * 109: pseudoprimo forte de Lucas, mas não na base 2
+    assert is_strong_lucas_probable_prime(5777) and not is_strong_probable_prime(5777, 2)
+    assert not is_prime(5777)
+    # 3825123056546413051: pseudoprimo forte nas bases 2 a 23
+    psp = 3825123056546413051
+    assert all(is_strong_probable_prime(psp, a) for a in (2, 3, 5, 7, 11, 13, 17, 19, 23))
+    assert not is_prime(psp) and not is_prime_deterministic(psp)
+
+
+def test_large_numbers():
+    assert is_prime(M61) and is_prime(M89) and is_prime(M127)
+    assert not is_prime(M61 * M89) and not is_prime(M127 * M127)
+    assert is_prime_deterministic(M61)
+    with pytest.raises(ValueError):
+        is_prime_deterministic(M89)
+
+
+def test_math_utils_uses_shared_package():
+    path = os.path.join(os.path.dirname(__file__), "..", "..", "grupo-op-comp-quantica", "math_utils.py")
+    spec = importlib.util.spec_from_file_location("math_utils", path)
+    math_utils = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(math_utils)
+    assert math_utils.is_prime is is_prime
+    assert math_utils.eh_primo(M127) and not math_utils.eh_primo(M61 * M89)
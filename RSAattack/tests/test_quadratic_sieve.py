@@ -0,0 +1,33 @@
+from BaseAttack import Deadline, RSABenchmark
+from QuadraticSieve import _sqrt_mod_prime, siqs_attack
+
+
+def test_sqrt_mod_prime():
+    # p ≡ 1 (mod 8) exercita o Tonelli-Shanks completo
+    for p in (7, 13, 17, 41, 1000033):
+        for a in range(1, 60):
+            if pow(a, (p - 1) // 2, p) == 1:
+                r = _sqrt_mod_prime(a, p)
+                assert r * r % p == a % p
+
+
+def test_siqs_factors_balanced_keys():
+    bench = RSABenchmark(key_sizes_bits=(64, 80, 100), keys_per_size=2, seed=13, quiet=True, key_cache=False)
+    for key in bench.keys:
+        n = key["n"]
+        p, q, extra = siqs_attack(n, 65537, seed=1, progress_interval=0)
+        assert p is not None and p * q == n and 1 < p < n, (n, extra)
+        assert extra["status"] == "factor_found" and extra["relations"] > 0  # saiu da peneira
+
+
+def test_siqs_small_factor_and_square():
+    assert siqs_attack(101 * 1000000000039, 3, progress_interval=0)[:2] == (101, 1000000000039)
+    assert siqs_attack(1000003 ** 2, 3, progress_interval=0)[:2] == (1000003, 1000003)
+
+
+def test_siqs_deadline():
+    # 150 bits: minutos de peneira; com o prazo zerado sai depois do primeiro polinômio
+    n = 1208925819614629174706189 * 1180591620717411303449
+    p, q, extra = siqs_attack(n, 3, progress_interval=0, deadline=Deadline(0.0))
+    assert (p, q) == (None, None)
+    assert extra["status"] == "timeout" and extra["polynomials"] == 1
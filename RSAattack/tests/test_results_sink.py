@@ -0,0 +1,48 @@
+import pytest
+
+from BaseAttack import AttackResult
+from results_sink import JsonlSink, ParquetSink, ResultSink, open_sink, read_results
+
+BIG = (1 << 127) - 1  # n, p e q passam de 64 bits
+
+RESULTS = [
+    AttackResult(16, 143, True, 11, 13, 0.001, {"status": "factor_found", "iters": 3}),
+    AttackResult(256, BIG * 3, False, None, None, 1.5, {"status": "timeout", "stages": [{"stage": "ecm"}]}),
+    AttackResult(256, BIG * 5, True, 5, BIG, 0.25, {}),
+]
+
+
+def _write(sink, label):
+    with sink:
+        for result in RESULTS:
+            sink.write(result, label=label, attack="fermat_factor")
+
+
+def test_result_sink_is_abstract():
+    with pytest.raises(TypeError):
+        ResultSink("x")
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".parquet"])
+def test_round_trip(tmp_path, suffix):
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"results{suffix}")
+    _write(open_sink(path, row_group_size=2), "varredura")
+    assert read_results(path) == {"varredura": RESULTS}
+
+
+def test_jsonl_appends_and_skips_truncated_line(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    _write(JsonlSink(path), "a")
+    _write(JsonlSink(path), "b")
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write('{"label": "a", "n": ')  # queda no meio da escrita
+    assert read_results(path) == {"a": RESULTS, "b": RESULTS}
+
+
+def test_parquet_writes_one_row_group_per_flush(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "results.parquet")
+    _write(ParquetSink(path, row_group_size=2), "x")
+    assert pq.ParquetFile(path).num_row_groups == 2
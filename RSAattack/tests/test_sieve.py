@@ -0,0 +1,36 @@
+import os
+
+import sieve
+from sieve import SEGMENT_BYTES, SEGMENT_ODDS, PrimeCache
+
+
+def _naive(low, high):
+    flags = sieve._sieve(high)
+    return [i for i in range(max(low + 1, 2), high + 1) if flags[i]]
+
+
+def test_prime_gaps_come_from_the_disk_cache(tmp_path, monkeypatch):
+    cache = PrimeCache(str(tmp_path))
+    monkeypatch.setattr(sieve, "_default_cache", cache)
+    sieve.prime_gaps.cache_clear()
+
+    # intervalo que atravessa a fronteira entre o primeiro e o segundo segmento
+    low, high = 2 * SEGMENT_ODDS - 5000, 2 * SEGMENT_ODDS + 5000
+    q, gaps = sieve.prime_gaps(low, high)
+    primes = _naive(low, high)
+    assert q == primes[0]
+    assert list(gaps) == [b - a for a, b in zip(primes, primes[1:])]
+    assert os.path.getsize(cache.path) == 2 * SEGMENT_BYTES
+
+    # outro processo (ou ataque) lê o mesmo arquivo sem peneirar de novo
+    other = PrimeCache(str(tmp_path))
+    assert other.segments == 2
+    assert other.primes_array(low, high).tolist() == primes
+    sieve.prime_gaps.cache_clear()
+
+
+def test_primes_between_edges(tmp_path, monkeypatch):
+    monkeypatch.setattr(sieve, "_default_cache", PrimeCache(str(tmp_path), persist=False))
+    for low, high in ((0, 1), (0, 2), (1, 2), (2, 3), (3, 3), (10, 11), (0, 100)):
+        assert sieve.primes_between(low, high) == _naive(low, high)
+    assert sieve.prime_gaps(3, 3) == (0, b"")
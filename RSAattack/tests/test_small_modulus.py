@@ -0,0 +1,36 @@
+import contextlib
+import io
+
+import pytest
+
+from BaseAttack import RSABenchmark
+from SmallModulus import hart_olf_attack, lehman_attack, squfof_attack
+
+ATTACKS = (hart_olf_attack, lehman_attack, squfof_attack)
+
+
+def _keys():
+    with contextlib.redirect_stdout(io.StringIO()):
+        bench = RSABenchmark(key_sizes_bits=(16, 24, 32, 40, 48), keys_per_size=5, seed=7, quiet=True, key_cache=False)
+    return [key["n"] for key in bench.keys]
+
+
+@pytest.mark.parametrize("attack", ATTACKS)
+def test_factors_small_keys(attack):
+    for n in _keys():
+        p, q, extra = attack(n, 65537)
+        assert p is not None and p * q == n and 1 < p <= q, (n, extra)
+
+
+@pytest.mark.parametrize("attack", ATTACKS)
+def test_even_square_and_prime(attack):
+    assert attack(2 * 1000003, 3)[:2] == (2, 1000003)
+    assert attack(1000003 ** 2, 3)[:2] == (1000003, 1000003)
+    assert attack(1000003, 3)[:2] == (None, None)
+
+
+def test_hart_falls_back_to_lehman():
+    # p e q muito próximos: o OLF com M = 480 não acha quadrado em n^(1/3) iterações
+    p, q, extra = hart_olf_attack(1002351210881, 3)
+    assert (p, q) == (1000763, 1001587)
+    assert extra["fallback"] == "lehman"
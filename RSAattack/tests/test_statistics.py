@@ -0,0 +1,37 @@
+import math
+
+from BaseAttack import RSABenchmark, sample_stats
+from fermat import fermat_factor
+
+CALLS = []
+
+
+def _counted_fermat(n, e):
+    CALLS.append(n)
+    return fermat_factor(n, e)
+
+
+def test_sample_stats():
+    stats = sample_stats([5.0, 1.0, 3.0, 2.0, 4.0])
+    assert stats["n"] == 5 and stats["mean"] == 3.0 and stats["median"] == 3.0
+    assert stats["std"] == math.sqrt(2.5)
+    assert 1.0 <= stats["ci_low"] <= stats["median"] <= stats["ci_high"] <= 5.0
+    assert sample_stats([5.0, 1.0, 3.0, 2.0, 4.0]) == stats  # gerador próprio com seed fixa
+
+    assert sample_stats([2.0]) == {"n": 1, "mean": 2.0, "median": 2.0, "p90": 2.0, "std": 0.0,
+                                   "ci_low": 2.0, "ci_high": 2.0}
+    assert sample_stats([])["n"] == 0 and math.isnan(sample_stats([])["median"])
+
+
+def test_repeats_and_warmup(capsys):
+    bench = RSABenchmark(key_sizes_bits=(16, 20), keys_per_size=2, seed=37, quiet=True, key_cache=False)
+    CALLS.clear()
+    results = bench.run(_counted_fermat, repeats=3, warmup=1)
+
+    # 4 chaves x 3 repetições, em ordem; 1 aquecimento por tamanho de chave
+    assert len(results) == 12
+    assert [(r.n, r.extra["repeat"]) for r in results] == [(key["n"], rep) for key in bench.keys for rep in range(3)]
+    assert len(CALLS) == 12 + 2
+
+    bench.print_final_report(results)
+    assert "RELATÓRIO FINAL" in capsys.readouterr().out
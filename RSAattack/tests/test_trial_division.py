@@ -0,0 +1,20 @@
+from BaseAttack import Checkpoint
+from DivisaoPorTentativa import WHEEL30_OFFSETS, trial_division_batch
+
+
+def test_batch_multi_limb_finds_factor_just_above_2_32(tmp_path):
+    p, q = 4294967311, 8589934609  # p logo acima de 2^32
+    n = p * q
+    # retoma perto do fim da parte vetorizada para não varrer os ~10^9 candidatos abaixo de 2^32
+    rows = (1 << 16) // len(WHEEL30_OFFSETS)
+    checkpoint = Checkpoint(str(tmp_path / "batch.json"))
+    checkpoint.save("batch_numpy", k=((1 << 32) - 1) // 30 - 3 * rows, steps=0, blocks=0)
+
+    found_p, found_q, extra = trial_division_batch(n, 65537, checkpoint=checkpoint)
+
+    assert extra["engine"] == "multi_limb"
+    assert (found_p, found_q) == (p, q)
+
+
+def test_batch_uint64_small_modulus():
+    assert trial_division_batch(1000003 * 1000033, 65537)[:2] == (1000003, 1000033)
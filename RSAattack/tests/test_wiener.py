@@ -0,0 +1,38 @@
+from fractions import Fraction
+
+from BaseAttack import RSABenchmark
+from Wiener import boneh_durfee_attack, convergents, wiener_attack
+
+
+def _keys(bits, d_bits, count):
+    bench = RSABenchmark(key_sizes_bits=(bits,), keys_per_size=count, seed=19, quiet=True, key_cache=False,
+                         profile="small_d", profile_params={"d_bits": d_bits})
+    return bench.keys
+
+
+def test_convergents():
+    # 649/200 = [3; 4, 12, 4]
+    assert list(convergents(649, 200)) == [(3, 1), (13, 4), (159, 49), (649, 200)]
+    # cada convergente aproxima e/n com erro < 1/d^2
+    for k, d in convergents(17993, 90581):
+        assert abs(Fraction(17993, 90581) - Fraction(k, d)) < Fraction(1, d * d)
+
+
+def test_wiener_small_d():
+    for key in _keys(256, 56, 4):  # d < n^(1/4) / 3
+        p, q, extra = wiener_attack(key["n"], key["e"])
+        assert p * q == key["n"], extra
+        assert extra["d"] == key["d"]
+
+
+def test_wiener_balanced_key():
+    bench = RSABenchmark(key_sizes_bits=(128,), keys_per_size=2, seed=19, quiet=True, key_cache=False)
+    for key in bench.keys:
+        assert wiener_attack(key["n"], key["e"])[2]["status"] == "no_factor"
+
+
+def test_boneh_durfee_beyond_wiener_bound():
+    key = _keys(128, 33, 1)[0]  # d ~ n^0.258: acima do limite de Wiener
+    assert wiener_attack(key["n"], key["e"])[2]["status"] == "no_factor"
+    p, q, extra = boneh_durfee_attack(key["n"], key["e"])
+    assert p is not None and p * q == key["n"], extra
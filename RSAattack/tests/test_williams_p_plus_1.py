@@ -0,0 +1,35 @@
+from BaseAttack import Deadline, RSABenchmark
+from Williams_p_plus_1 import lucas_v, williams_p_plus_1_attack
+
+
+def test_lucas_v_matches_recurrence():
+    n = 1000003
+    for v in (3, 4, 123456):
+        seq = [2, v]
+        for _ in range(200):
+            seq.append((v * seq[-1] - seq[-2]) % n)
+        assert [lucas_v(v, k, n) for k in range(len(seq))] == seq
+
+
+def test_p_plus_1_smooth_keys():
+    bench = RSABenchmark(key_sizes_bits=(48, 64), keys_per_size=3, seed=17, quiet=True, key_cache=False,
+                         profile="p_plus_1_smooth", profile_params={"B": 2_000})
+    for key in bench.keys:
+        n = key["n"]
+        p, q, extra = williams_p_plus_1_attack(n, 65537, B1=2_000)
+        assert p is not None and p * q == n, (n, extra)
+
+
+def test_stage2_finds_one_large_prime():
+    # p + 1 = 2·3·5·7·11·3001 e p - 1 com fator 1733077: B1 = 100 só alcança com o estágio 2
+    p, q = 6932309, 1000003
+    assert williams_p_plus_1_attack(p * q, 3, B1=100, B2=100)[2]["status"] == "no_factor"
+    found = williams_p_plus_1_attack(p * q, 3, B1=100, B2=10_000)
+    assert found[:2] == (p, q)
+    assert found[2]["stage"] == 2
+
+
+def test_deadline():
+    n = 1208925819614629174706189 * 1180591620717411303449
+    p, q, extra = williams_p_plus_1_attack(n, 3, B1=10 ** 6, deadline=Deadline(0.0))
+    assert (p, q, extra["status"]) == (None, None, "timeout")
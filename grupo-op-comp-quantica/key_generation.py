@@ -6,10 +6,8 @@ def gerar_primo(bits=8):
     maximo = 2 ** bits - 1
     
     while True:
-        candidato = random.randint(minimo, maximo)
-        if candidato % 2 == 0:
-            candidato += 1
-            
+        candidato = random.randint(minimo, maximo) | 1  # ímpar, sem sair de [minimo, maximo]
+
         if eh_primo(candidato):
             return candidato
 
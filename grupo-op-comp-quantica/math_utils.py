@@ -1,5 +1,14 @@
 import math
-import random
+import os
+import sys
+
+# Pacote primality compartilhado com o RSAattack, na raiz do repositório: entra na frente
+# do sys.path para que um "primality" instalado no ambiente não o oculte
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from primality import is_prime
 
 def mdc(a, b):
     """
@@ -31,34 +40,15 @@ def inverso_multiplicativo(e, phi_n):
 
     return t
 
-def eh_primo(n, k=40):
+def eh_primo(n):
     """
-    Entrada: n (int), k (int) - número de testes
-    Saída: bool (True se provavelmente primo, False se composto)
-    Usa o teste de Miller-Rabin.
+    Entrada: n (int)
+    Saída: bool (True se primo, False se composto)
+    Usa o teste Baillie-PSW (divisão pelos primos pequenos, Miller-Rabin na
+    base 2 e teste forte de Lucas) do pacote primality, na raiz do repositório:
+    determinístico e mais barato que rodadas aleatórias de Miller-Rabin.
     """
-    if n <= 1: return False
-    if n <= 3: return True
-    if n % 2 == 0: return False
-
-    # Escreve n-1 como 2^r * d
-    r, d = 0, n - 1
-    while d % 2 == 0:
-        r += 1
-        d //= 2
-
-    for _ in range(k):
-        a = random.randint(2, n - 2)
-        x = pow(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        for _ in range(r - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
+    return is_prime(n)
 
 if __name__ =="__main__":
     print(eh_primo(9999995))
@@ -0,0 +1,18 @@
+"""
+Primalidade compartilhada pelos pacotes RSA do repositório.
+
+A raiz do repositório entra na frente do sys.path em RSAattack/BaseAttack.py e
+em grupo-op-comp-quantica/math_utils.py, então os dois importam este pacote
+(e não outro "primality" instalado no ambiente).
+"""
+from primality.bpsw import (
+    MR_DETERMINISTIC_BASES,
+    SMALL_PRIME_BOUND,
+    SMALL_PRIMES,
+    is_prime,
+    is_prime_deterministic,
+    is_square,
+    is_strong_lucas_probable_prime,
+    is_strong_probable_prime,
+    jacobi,
+)
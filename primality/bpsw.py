@@ -0,0 +1,174 @@
+# Primalidade compartilhada pelos dois pacotes RSA (RSAattack e grupo-op-comp-quantica):
+# Baillie-PSW com uma divisão inicial por gcd e Miller-Rabin determinístico para n < 2^64.
+import math
+
+# Divisão inicial pelos primos < SMALL_PRIME_BOUND: um gcd com o produto deles
+# descarta ~85% dos ímpares antes de qualquer pow
+SMALL_PRIME_BOUND = 1024
+
+
+def _small_primes(bound: int) -> tuple:
+    """Primos < bound (crivo simples; o pacote não depende do sieve do RSAattack)."""
+    alive = bytearray([1]) * bound
+    alive[:2] = b"\x00\x00"
+    for p in range(2, math.isqrt(bound - 1) + 1):
+        if alive[p]:
+            alive[p * p :: p] = bytes(len(range(p * p, bound, p)))
+    return tuple(i for i in range(bound) if alive[i])
+
+
+SMALL_PRIMES = _small_primes(SMALL_PRIME_BOUND)
+SMALL_PRIMES_PRODUCT = math.prod(SMALL_PRIMES)
+
+# Bases do Miller-Rabin determinístico: (limite, bases), todo composto n < limite falha em
+# alguma base (Pomerance-Selfridge-Wagstaff, Jaeschke; as 12 primeiras cobrem n < 3.3·10^24)
+MR_DETERMINISTIC_BASES = (
+    (2_047, (2,)),
+    (1_373_653, (2, 3)),
+    (25_326_001, (2, 3, 5)),
+    (3_215_031_751, (2, 3, 5, 7)),
+    (2_152_302_898_747, (2, 3, 5, 7, 11)),
+    (3_474_749_660_383, (2, 3, 5, 7, 11, 13)),
+    (341_550_071_728_321, (2, 3, 5, 7, 11, 13, 17)),
+    (3_825_123_056_546_413_051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (318_665_857_834_031_151_167_461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+)
+
+
+def is_square(n: int) -> bool:
+    return n >= 0 and math.isqrt(n) ** 2 == n
+
+
+def jacobi(a: int, n: int) -> int:
+    """Símbolo de Jacobi (a/n) para n ímpar positivo."""
+    if n <= 0 or n % 2 == 0:
+        raise ValueError("o símbolo de Jacobi exige n ímpar positivo")
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def is_strong_probable_prime(n: int, base: int) -> bool:
+    """Teste forte (Miller-Rabin) de n ímpar > 2 na base `base`."""
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    x = pow(base, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+
+def _selfridge_parameters(n: int):
+    """
+    Método A de Selfridge: primeiro D em 5, -7, 9, -11, ... com (D/n) = -1;
+    P = 1, Q = (1 - D) / 4. Devolve None se achar um D com fator comum com n
+    (n composto). n não pode ser quadrado perfeito (o laço não terminaria).
+    """
+    D = 5
+    while True:
+        j = jacobi(D, n)
+        if j == -1:
+            return D, 1, (1 - D) // 4
+        if j == 0 and abs(D) != n:
+            return None
+        D = -D - 2 if D > 0 else -D + 2
+
+
+def is_strong_lucas_probable_prime(n: int) -> bool:
+    """
+    Teste forte de Lucas com os parâmetros de Selfridge, para n ímpar > 2 que
+    não seja quadrado perfeito.
+
+    Com n + 1 = d·2^s (d ímpar), n passa se U_d == 0 ou V_(d·2^r) == 0 (mod n)
+    para algum 0 <= r < s. U_k e V_k saem juntos pela escada binária de d.
+    """
+    params = _selfridge_parameters(n)
+    if params is None:
+        return False
+    D, P, Q = params
+
+    d = n + 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    def half(x: int) -> int:
+        # x / 2 mod n (n ímpar)
+        return (x if x % 2 == 0 else x + n) // 2 % n
+
+    U, V, Qk = 1, P, Q % n  # índice 1
+    for bit in bin(d)[3:]:
+        U = U * V % n
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = half(P * U + V), half(D * U + P * V)
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if V == 0:
+            return True
+    return False
+
+
+def _trial_gcd(n: int) -> bool | None:
+    """Divisão inicial: True/False se ela já decide (n pequeno ou com fator pequeno), senão None."""
+    if n < 2:
+        return False
+    if math.gcd(n, SMALL_PRIMES_PRODUCT) != 1:
+        return n < SMALL_PRIME_BOUND and n in SMALL_PRIMES
+    if n < SMALL_PRIME_BOUND * SMALL_PRIME_BOUND:
+        return True
+    return None
+
+
+def is_prime_deterministic(n: int) -> bool:
+    """
+    Miller-Rabin determinístico para n < 2^64, com o menor conjunto de bases
+    de MR_DETERMINISTIC_BASES que cobre n. Resposta exata, sem aleatoriedade.
+    """
+    if n >= 1 << 64:
+        raise ValueError("o Miller-Rabin determinístico só cobre n < 2^64 (use is_prime)")
+    decided = _trial_gcd(n)
+    if decided is not None:
+        return decided
+    bases = next(bases for limit, bases in MR_DETERMINISTIC_BASES if n < limit)
+    return all(is_strong_probable_prime(n, a) for a in bases)
+
+
+def is_prime(n: int) -> bool:
+    """
+    Teste de primalidade Baillie-PSW: divisão pelos primos < SMALL_PRIME_BOUND
+    (um gcd), teste forte na base 2 e teste forte de Lucas. Não há composto
+    conhecido que passe pelos dois (e não existe nenhum abaixo de 2^64).
+    """
+    decided = _trial_gcd(n)
+    if decided is not None:
+        return decided
+    if not is_strong_probable_prime(n, 2):
+        return False
+    if is_square(n):
+        return False
+    return is_strong_lucas_probable_prime(n)
+